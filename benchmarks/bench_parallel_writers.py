@@ -0,0 +1,123 @@
+"""Throughput of the batched Neo4j writes against the number of writers.
+
+Needs a live Neo4j (NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD). The
+benchmark writes to the ``benchnode`` label only and deletes it after
+each measurement. Relationships are measured between random nodes and
+towards a few shared end nodes (like commits to their branch), where
+concurrent writers contend for the same locks.
+
+    PYTHONPATH=src python -m benchmarks.bench_parallel_writers --writers 1,2,4,8
+"""
+
+import argparse  # noqa: I001
+import random  # noqa: I001
+import time  # noqa: I001
+
+from src.sink.parallel_writer import ParallelWriter  # noqa: I001
+from src.sink.sink_neo4j import SinkNeo4j  # noqa: I001
+
+LABEL = "BenchNode"
+
+
+def make_nodes(count: int) -> list[dict]:
+    """Synthetic node rows shaped like a projected Commit."""
+    return [
+        {
+            "id": f"{i:040x}",
+            "repository": f"org/repo-{i % 20}",
+            "message": "x" * random.randint(20, 200),  # noqa: S311
+            "additions": random.randint(0, 500),  # noqa: S311
+        }
+        for i in range(count)
+    ]
+
+
+def make_relationships(count: int, nodes: int) -> list[dict]:
+    """Random relationships between the synthetic nodes."""
+    return [
+        {
+            "start": f"{random.randrange(nodes):040x}",  # noqa: S311
+            "end": f"{random.randrange(nodes):040x}",  # noqa: S311
+        }
+        for _ in range(count)
+    ]
+
+
+def make_shared_relationships(count: int, nodes: int, ends: int) -> list[dict]:
+    """Relationships from random nodes to a few shared end nodes."""
+    return [
+        {
+            "start": f"{random.randrange(nodes):040x}",  # noqa: S311
+            "end": f"{random.randrange(ends):040x}",  # noqa: S311
+        }
+        for _ in range(count)
+    ]
+
+
+def clean(sink: SinkNeo4j) -> None:
+    """Delete the benchmark nodes."""
+    sink.graph.run(
+        f"MATCH (n:`{LABEL.lower()}`) "
+        "CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print a throughput table."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--relationships", type=int, default=100_000)
+    parser.add_argument("--writers", default="1,2,4,8")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--shared-ends", type=int, default=20, help="End nodes of the shared case."
+    )
+    args = parser.parse_args()
+
+    random.seed(42)
+    nodes = make_nodes(args.nodes)
+    relationships = make_relationships(args.relationships, args.nodes)
+    shared = make_shared_relationships(
+        args.relationships, args.nodes, args.shared_ends
+    )
+
+    sink = SinkNeo4j()
+    sink.graph.run(
+        f"CREATE INDEX bench_node_id IF NOT EXISTS FOR (n:`{LABEL.lower()}`) ON (n.id)"
+    )
+
+    print(f"{'writers':>7} | {'nodes/s':>10} | {'rels/s':>10} | {'shared/s':>10}")
+    print(f"{'-' * 7}-+-{'-' * 10}-+-{'-' * 10}-+-{'-' * 10}")
+    for writers in (int(w) for w in args.writers.split(",")):
+        clean(sink)
+        sink.writer = ParallelWriter(
+            sink.graph, writers=writers, batch_size=args.batch_size
+        )
+        sink.relationship_writers = writers
+
+        started = time.perf_counter()
+        sink.save_nodes(LABEL, "id", nodes)
+        node_rate = len(nodes) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        sink.save_relationships(
+            "bench_link", (LABEL, "id"), (LABEL, "id"), relationships
+        )
+        rel_rate = len(relationships) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        try:
+            sink.save_relationships(
+                "bench_shared", (LABEL, "id"), (LABEL, "id"), shared
+            )
+            shared_rate = f"{len(shared) / (time.perf_counter() - started):>10.0f}"
+        except Exception as e:  # Deadlocks beyond NEO4J_MAX_RETRIES
+            shared_rate = f"{'failed':>10}"
+            print(f"Shared relationships failed with {writers} writers: {e}")
+
+        print(f"{writers:>7} | {node_rate:>10.0f} | {rel_rate:>10.0f} | {shared_rate}")
+    clean(sink)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Memory of 100k loaded records: py2neo Node vs NodeRecord.
+
+Builds the same synthetic Issue-like records with the previous
+representation (user decoded into ``SimpleNamespace``, properties in a
+py2neo ``Node`` with its own ``created_node_at`` string) and with
+``NodeRecord`` (plain decoded dicts, interned names and repeated values),
+and reports the memory held per 100k records. No database is needed.
+
+    PYTHONPATH=src python -m benchmarks.bench_record_memory --records 100000
+"""
+
+import argparse  # noqa: I001
+import gc  # noqa: I001
+import json  # noqa: I001
+import tracemalloc  # noqa: I001
+from collections.abc import Callable  # noqa: I001
+from datetime import datetime  # noqa: I001
+from types import SimpleNamespace  # noqa: I001
+from typing import Any  # noqa: I001
+
+from py2neo import Node  # noqa: I001
+
+from src.sink.records import intern_properties, make_record  # noqa: I001
+
+
+def make_rows(count: int) -> list[dict[str, Any]]:
+    """Synthetic flattened rows shaped like a projected Issue.
+
+    Values are rebuilt for every row, like the decoded DataFrame cells.
+    """
+    return [
+        {
+            "id": 10_000_000 + i,
+            "number": i,
+            "title": f"Issue {i}",
+            "state": "closed" if i % 3 else "open",
+            "repository": f"org-{i % 3}/repo-{i % 40}",
+            "author_association": "MEMBER",
+            "user.login": f"user-{i % 500}",
+            "comments": i % 17,
+            "created_at": f"2025-{1 + i % 12:02d}-01T00:00:00Z",
+            "user": json.dumps({"login": f"user-{i % 500}", "type": "User"}),
+        }
+        for i in range(count)
+    ]
+
+
+def as_node(row: dict[str, Any]) -> Any:
+    """Previous representation."""
+    data = dict(row)
+    data["user"] = json.loads(data["user"], object_hook=lambda d: SimpleNamespace(**d))
+    node = Node("Issue", **{k: v for k, v in data.items() if k != "user"})
+    node["created_node_at"] = datetime.now().isoformat()
+    return node, data["user"]
+
+
+def as_record(row: dict[str, Any]) -> Any:
+    """Build a record in the current representation."""
+    data = dict(row)
+    user = json.loads(data.pop("user"), object_hook=intern_properties)
+    data["created_node_at"] = datetime.now().isoformat()
+    return make_record("Issue", "id", data), user
+
+
+def measure(build: Callable[[dict[str, Any]], Any], rows: list[dict]) -> int:
+    """Bytes still allocated after building one object per row."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main() -> None:
+    """Run the benchmark and print the memory per 100k records."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.records)
+    scale = 100_000 / args.records
+    print(f"{'representation':<24}{'MiB / 100k records':>20}")
+    for name, build in (("py2neo Node", as_node), ("NodeRecord", as_record)):
+        size = measure(build, rows) * scale
+        print(f"{name:<24}{size / 2**20:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
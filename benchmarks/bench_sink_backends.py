@@ -0,0 +1,92 @@
+"""Write throughput of the py2neo and neo4j-async sink backends.
+
+Needs a live Neo4j (NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD). Both
+backends run the same workload: single node and relationship writes, as
+the per-record loaders do, then batched node and relationship writes.
+The benchmark writes to the ``benchnode`` label only and deletes it after
+each backend.
+
+    PYTHONPATH=src python -m benchmarks.bench_sink_backends --writers 4
+"""
+
+import argparse  # noqa: I001
+import os  # noqa: I001
+import random  # noqa: I001
+import time  # noqa: I001
+
+from benchmarks.bench_parallel_writers import LABEL, make_nodes, make_relationships  # noqa: I001
+from sink.factory import BACKEND_ASYNC, BACKEND_PY2NEO, create_sink  # noqa: I001
+from src.sink.records import make_record  # noqa: I001
+
+
+def clean(sink) -> None:  # noqa: ANN001
+    """Delete the benchmark nodes."""
+    sink.run(
+        f"MATCH (n:`{LABEL.lower()}`) "
+        "CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+    )
+
+
+def measure(backend: str, args: argparse.Namespace) -> dict[str, float]:
+    """Run the workload on one backend and return its rates per second."""
+    random.seed(42)
+    singles = make_nodes(args.single)
+    nodes = make_nodes(args.nodes)
+    relationships = make_relationships(args.relationships, args.nodes)
+
+    sink = create_sink(backend)
+    sink.run(
+        f"CREATE INDEX bench_node_id IF NOT EXISTS FOR (n:`{LABEL.lower()}`) ON (n.id)"
+    )
+    clean(sink)
+    rates = {}
+
+    started = time.perf_counter()
+    records = []
+    for row in singles:
+        record = make_record(LABEL, "id", row)
+        sink.save_node(record, LABEL, "id")
+        records.append(record)
+    rates["node"] = len(records) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for start, end in zip(records[:-1], records[1:], strict=True):
+        sink.save_relationship_between(start, "bench_link", end)
+    rates["relationship"] = (len(records) - 1) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    sink.save_nodes(LABEL, "id", nodes)
+    rates["nodes"] = len(nodes) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    sink.save_relationships("bench_link", (LABEL, "id"), (LABEL, "id"), relationships)
+    rates["relationships"] = len(relationships) / (time.perf_counter() - started)
+
+    clean(sink)
+    if hasattr(sink, "close"):
+        sink.close()
+    return rates
+
+
+def main() -> None:
+    """Run the benchmark and print a throughput table."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--single", type=int, default=2_000)
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--relationships", type=int, default=100_000)
+    parser.add_argument("--writers", default="4")
+    parser.add_argument("--batch-size", default="1000")
+    args = parser.parse_args()
+    os.environ["NEO4J_WRITERS"] = args.writers
+    os.environ["NEO4J_BATCH_SIZE"] = args.batch_size
+
+    columns = ("node", "relationship", "nodes", "relationships")
+    print(f"{'backend':>11} | " + " | ".join(f"{c + '/s':>15}" for c in columns))
+    print(f"{'-' * 11}-+-" + "-+-".join("-" * 15 for _ in columns))
+    for backend in (BACKEND_PY2NEO, BACKEND_ASYNC):
+        rates = measure(backend, args)
+        print(f"{backend:>11} | " + " | ".join(f"{rates[c]:>15.0f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
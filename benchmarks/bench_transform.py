@@ -0,0 +1,274 @@
+"""Throughput of the per-record transform functions, with regression gating.
+
+Times ``ExtractBase.transform``, ``data_clean``, ``flatten_nested_dict``,
+``safe_nan_to_none``, ``ExtractCMPO.flatten_dict`` and
+``parse_json_from_db`` on synthetic commits (nested ``commit.author``),
+issues (labels, assignees) and pull requests (requested reviewers), at
+several record widths (extra scalar and nested fields per record). No
+database is needed.
+
+    PYTHONPATH=src python -m benchmarks.bench_transform            # print
+    PYTHONPATH=src python -m benchmarks.bench_transform --save     # baseline
+    PYTHONPATH=src python -m benchmarks.bench_transform --check    # gate
+
+The baseline (records per second per case) is stored in
+``benchmarks/baselines/transform.json``. Throughput depends on the
+machine: record the baseline on the machine that runs ``--check`` (e.g.,
+the CI runner), and record it again after an intended change. ``--check``
+exits with status 1 when a case is slower than its baseline by more than
+the tolerance.
+"""
+
+import argparse  # noqa: I001
+import json  # noqa: I001
+import math  # noqa: I001
+import os  # noqa: I001
+import platform  # noqa: I001
+import sys  # noqa: I001
+import timeit  # noqa: I001
+from collections import namedtuple  # noqa: I001
+from collections.abc import Callable  # noqa: I001
+from datetime import UTC, datetime  # noqa: I001
+from typing import Any  # noqa: I001
+
+from src.extract.extract_cmpo import ExtractCMPO  # noqa: I001
+from src.extract.projection import Projector  # noqa: I001
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "transform.json")
+WIDTHS = (0, 20, 80)
+
+
+def user(i: int) -> dict[str, Any]:
+    """Build a GitHub user object, as nested in every stream."""
+    return {
+        "login": f"user-{i % 500}",
+        "id": 1000 + i % 500,
+        "node_id": f"MDQ6VXNlcj{i % 500:06d}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{1000 + i % 500}",
+        "html_url": f"https://github.com/user-{i % 500}",
+        "type": "User",
+        "site_admin": False,
+    }
+
+
+def extra_fields(i: int, width: int) -> dict[str, Any]:
+    """``width`` extra fields: mostly scalars, one nested dict in five."""
+    fields: dict[str, Any] = {}
+    for n in range(width):
+        if n % 5 == 4:
+            fields[f"extra_{n}"] = {"name": f"v{i}", "count": n, "flag": None}
+        elif n % 5 == 3:
+            fields[f"extra_{n}"] = math.nan
+        else:
+            fields[f"extra_{n}"] = f"value-{i}-{n}"
+    return fields
+
+
+def airbyte_fields(i: int) -> dict[str, Any]:
+    """Metadata columns of the Airbyte cache, dropped by ``transform``."""
+    return {
+        "_airbyte_raw_id": f"{i:032x}",
+        "_airbyte_extracted_at": "2025-01-01T00:00:00Z",
+        "_airbyte_meta": {"changes": []},
+    }
+
+
+def commit(i: int, width: int) -> dict[str, Any]:
+    """Build a commits stream record."""
+    sha = f"{i:040x}"
+    signature = {"name": f"User {i % 500}", "email": f"u{i % 500}@example.com"}
+    return {
+        **airbyte_fields(i),
+        "sha": sha,
+        "repository": f"org/repo-{i % 40}",
+        "branch": "main",
+        "created_at": "2025-01-01T00:00:00Z",
+        "commit": {
+            "author": {**signature, "date": "2025-01-01T00:00:00Z"},
+            "committer": {**signature, "date": "2025-01-01T00:00:00Z"},
+            "message": f"Fix issue #{i}\n\n" + "details " * 20,
+            "tree": {"sha": f"{i + 1:040x}", "url": "https://api.github.com/..."},
+            "comment_count": i % 3,
+            "verification": {"verified": False, "reason": "unsigned"},
+        },
+        "author": user(i),
+        "committer": user(i + 1),
+        "parents": [{"sha": f"{i - 1:040x}", "url": "https://api.github.com/..."}],
+        "url": f"https://api.github.com/repos/org/repo/commits/{sha}",
+        **extra_fields(i, width),
+    }
+
+
+def issue(i: int, width: int) -> dict[str, Any]:
+    """Build an issues stream record."""
+    return {
+        **airbyte_fields(i),
+        "id": 10_000_000 + i,
+        "number": i,
+        "title": f"Issue {i}",
+        "body": "Steps to reproduce " * 10,
+        "state": "closed" if i % 3 else "open",
+        "repository": f"org/repo-{i % 40}",
+        "user": user(i),
+        "labels": [
+            {"id": 500 + n, "name": f"label-{n}", "color": "ededed"}
+            for n in range(i % 4)
+        ],
+        "assignee": user(i + 2),
+        "assignees": [user(i + 2), user(i + 3)],
+        "milestone": None if i % 2 else {"id": 70 + i % 5, "title": "v1"},
+        "comments": i % 17,
+        "created_at": "2025-01-01T00:00:00Z",
+        "closed_at": math.nan,
+        **extra_fields(i, width),
+    }
+
+
+def pull_request(i: int, width: int) -> dict[str, Any]:
+    """Build a pull_requests stream record."""
+    return {
+        **issue(i, width),
+        "merge_commit_sha": f"{i:040x}",
+        "requested_reviewers": [user(i + 4), user(i + 5)],
+        "head": {"ref": f"feature-{i}", "sha": f"{i:040x}", "repo": {"id": 1}},
+        "base": {"ref": "main", "sha": f"{i + 1:040x}", "repo": {"id": 1}},
+    }
+
+
+def as_rows(records: list[dict[str, Any]]) -> list[Any]:
+    """Convert records to the row tuples ``DataFrame.itertuples`` yields."""
+    row_type = namedtuple("Pandas", list(records[0]), rename=True)  # noqa: PYI024
+    return [row_type(*record.values()) for record in records]
+
+
+def make_extractor() -> ExtractCMPO:
+    """Build an extractor without source, sink or checkpoint (methods only)."""
+    extractor = ExtractCMPO.__new__(ExtractCMPO)
+    extractor.projector = Projector.from_env()
+    return extractor
+
+
+def cases(count: int, width: int) -> dict[str, tuple[Callable[[Any], Any], list[Any]]]:
+    """Benchmark cases: function and inputs, one call per input."""
+    extractor = make_extractor()
+    commits = [commit(i, width) for i in range(count)]
+    issues = [issue(i, width) for i in range(count)]
+    pull_requests = [pull_request(i, width) for i in range(count)]
+    values = [v for record in issues for v in record.values()]
+    return {
+        "transform.commit": (extractor.transform, as_rows(commits)),
+        "transform.issue": (
+            lambda row: extractor.transform(row, "Issue"),
+            as_rows(issues),
+        ),
+        "transform.pull_request": (
+            lambda row: extractor.transform(row, "PullRequest"),
+            as_rows(pull_requests),
+        ),
+        "data_clean.pull_request": (extractor.data_clean, pull_requests),
+        "flatten_nested_dict.commit": (extractor.flatten_nested_dict, commits),
+        "safe_nan_to_none.issue_values": (extractor.safe_nan_to_none, values),
+        "flatten_dict.commit": (
+            lambda record: extractor.flatten_dict(record["commit"], ""),
+            commits,
+        ),
+        "parse_json_from_db.parents": (
+            extractor.parse_json_from_db,
+            [json.dumps(record["parents"]) for record in commits],
+        ),
+    }
+
+
+def measure(function: Callable[[Any], Any], inputs: list[Any], repeat: int) -> float:
+    """Best throughput (calls per second) over ``repeat`` timed passes."""
+
+    def run() -> None:
+        for value in inputs:
+            function(value)
+
+    run()  # Warm up caches and lazy imports
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return len(inputs) / best
+
+
+def run_suite(count: int, repeat: int) -> dict[str, float]:
+    """Throughput of every case at every width."""
+    results = {}
+    for width in WIDTHS:
+        for name, (function, inputs) in cases(count, width).items():
+            results[f"{name}@{width}"] = measure(function, inputs, repeat)
+    return results
+
+
+def check(results: dict[str, float], tolerance: float) -> int | None:
+    """Compare with the baseline; return the number of regressions.
+
+    Returns None when there is no baseline to compare with.
+    """
+    if not os.path.exists(BASELINE):
+        print(f"No baseline at {BASELINE}: record one with --save.")
+        return None
+    with open(BASELINE, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = 0
+    print(f"\n{'case':<40} | {'baseline/s':>12} | {'now/s':>12} | change")
+    for name, rate in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<40} | {'-':>12} | {rate:>12.0f} | new")
+            continue
+        change = rate / reference - 1
+        regressed = change < -tolerance
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:<40} | {reference:>12.0f} | {rate:>12.0f} | {change:+.1%}{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    """Run the suite, then print, save or check the results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help="Write the baseline.")
+    parser.add_argument("--check", action="store_true", help="Gate on the baseline.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=float(os.getenv("BENCH_TOLERANCE", "0.15")),
+        help="Allowed throughput loss before failing (fraction).",
+    )
+    args = parser.parse_args()
+
+    results = run_suite(args.records, args.repeat)
+    print(f"{'case':<40} | {'records/s':>12}")
+    print(f"{'-' * 40}-+-{'-' * 12}")
+    for name, rate in results.items():
+        print(f"{name:<40} | {rate:>12.0f}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(BASELINE), exist_ok=True)
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "recorded_at": datetime.now(UTC).isoformat(),
+                    "python": platform.python_version(),
+                    "machine": platform.platform(),
+                    "records": args.records,
+                    "results": {k: round(v, 1) for k, v in results.items()},
+                },
+                f,
+                indent=2,
+            )
+        print(f"Baseline written to {BASELINE}")
+    if args.check:
+        regressions = check(results, args.tolerance)
+        if regressions is None or regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
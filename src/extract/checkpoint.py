@@ -0,0 +1,115 @@
+import json  # noqa: I001
+import os  # noqa: I001
+import uuid  # noqa: I001
+from datetime import UTC, datetime  # noqa: I001
+from typing import Any  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("extractor")
+
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+
+
+class CheckpointStore:
+    """Durable progress of an extractor run, stored in a local JSON file.
+
+    The file records which stages of the run are complete and, for the
+    stage in progress, the offset and key of the last committed batch. It
+    is removed when the run finishes, so a file left on disk means the
+    previous run died and should be resumed.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Load the checkpoint file, or start a new run if there is none.
+
+        Args:
+        ----
+            path (str): Location of the JSON state file.
+
+        """
+        self.path = path
+        self.state: dict[str, Any] = self._read()
+        if self.state:
+            logger.info(
+                f"Resuming run {self.state['run_id']} from checkpoint {self.path}"
+            )
+        else:
+            self.state = {
+                "run_id": uuid.uuid4().hex,
+                "started_at": self._now(),
+                "stages": {},
+            }
+
+    @classmethod
+    def for_extractor(cls, extractor: str, organization_id: str) -> "CheckpointStore":
+        """Return the checkpoint store of an extractor for an organization."""
+        state_dir = os.getenv("STATE_DIR", "state")
+        os.makedirs(state_dir, exist_ok=True)
+        name = f"{extractor}_{organization_id or 'default'}.json"
+        return cls(os.path.join(state_dir, name))
+
+    @property
+    def run_id(self) -> str:
+        """Identifier of the run this checkpoint belongs to."""
+        return str(self.state["run_id"])
+
+    def is_done(self, stage: str) -> bool:
+        """Whether a stage already completed in this run."""
+        return self._stage(stage).get("status") == STATUS_DONE
+
+    def offset(self, stage: str) -> int:
+        """Number of records of a stage committed so far."""  # noqa: D401
+        return int(self._stage(stage).get("offset", 0))
+
+    def commit(self, stage: str, offset: int, key: Any = None) -> None:
+        """Record that the first ``offset`` records of a stage are persisted."""
+        entry = self.state["stages"].setdefault(stage, {})
+        entry.update(
+            status=STATUS_RUNNING,
+            offset=offset,
+            key=None if key is None else str(key),
+            updated_at=self._now(),
+        )
+        self._write()
+
+    def complete(self, stage: str) -> None:
+        """Mark a stage as complete."""
+        entry = self.state["stages"].setdefault(stage, {})
+        entry.update(status=STATUS_DONE, updated_at=self._now())
+        self._write()
+        logger.info(f"Checkpoint: stage '{stage}' completed.")
+
+    def finish(self) -> None:
+        """Discard the checkpoint once the whole run has completed."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        logger.info(f"Checkpoint: run {self.run_id} finished.")
+
+    def _stage(self, stage: str) -> dict[str, Any]:
+        return dict(self.state["stages"].get(stage, {}))
+
+    def _read(self) -> dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return dict(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return {}
+
+    def _write(self) -> None:
+        # Write to a temporary file first so a crash never leaves a torn file.
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(UTC).isoformat()
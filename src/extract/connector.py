@@ -0,0 +1,165 @@
+import hashlib  # noqa: I001
+import json  # noqa: I001
+import os  # noqa: I001
+import threading  # noqa: I001
+import time  # noqa: I001
+from pathlib import Path  # noqa: I001
+from typing import Any  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("extractor")
+
+CONNECTOR_NAME = "source-github"
+
+# Sources already resolved in this process, keyed by (name, version).
+_sources: dict[tuple[str, str | None], Any] = {}
+_lock = threading.Lock()
+
+
+def connector_version() -> str | None:
+    """Pinned connector version (``AIRBYTE_SOURCE_GITHUB_VERSION``)."""
+    return os.getenv("AIRBYTE_SOURCE_GITHUB_VERSION") or None
+
+
+def install_root() -> Path | None:
+    """Return the directory holding the connector virtualenv, if configured."""
+    root = os.getenv("AIRBYTE_INSTALL_ROOT")
+    if not root:
+        return None
+    path = Path(root)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def config_hash(config: dict[str, Any]) -> str:
+    """Stable hash of a connector config (the token is never stored)."""
+    payload = json.dumps(
+        {"config": config, "version": connector_version()}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CheckCache:
+    """Successful ``check()`` results keyed by config hash, with a TTL."""
+
+    def __init__(self, path: str, ttl: int) -> None:
+        """Initialize the cache.
+
+        Args:
+        ----
+            path (str): Location of the JSON cache file.
+            ttl (int): Seconds a successful check stays valid.
+
+        """
+        self.path = path
+        self.ttl = ttl
+
+    @classmethod
+    def from_env(cls) -> "CheckCache":
+        """Build the cache from ``STATE_DIR`` and ``AIRBYTE_CHECK_TTL``."""
+        state_dir = os.getenv("STATE_DIR", "state")
+        os.makedirs(state_dir, exist_ok=True)
+        return cls(
+            os.path.join(state_dir, "connector_checks.json"),
+            int(os.getenv("AIRBYTE_CHECK_TTL", "86400")),
+        )
+
+    def is_fresh(self, key: str) -> bool:
+        """Whether the config passed a check less than ``ttl`` seconds ago."""
+        checked_at = self._read().get(key)
+        return checked_at is not None and time.time() - checked_at < self.ttl
+
+    def record(self, key: str) -> None:
+        """Record a successful check for a config."""
+        with _lock:  # Concurrent extractors (e.g., several organizations)
+            entries = self._read()
+            now = time.time()
+            entries = {k: v for k, v in entries.items() if now - v < self.ttl}
+            entries[key] = now
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+
+    def _read(self) -> dict[str, float]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return dict(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+
+def get_source(config: dict[str, Any] | None = None, shared: bool = True) -> Any:
+    """Return the GitHub source, reusing the installed connector.
+
+    The connector is installed once into ``AIRBYTE_INSTALL_ROOT`` at the
+    pinned version and the resolved source is reused by every extractor
+    of the process; only its config is replaced.
+
+    Args:
+    ----
+        config (dict): Source configuration (optional when pre-warming).
+        shared (bool): Reuse the process-wide source. Pass False to get a
+            source of its own (over the same installed connector) for reads
+            running concurrently with other extractors.
+
+    Returns:
+    -------
+        Source: The Airbyte source.
+
+    """
+    import airbyte as ab  # Heavy import: only paid when a source is needed
+
+    version = connector_version()
+    started = time.perf_counter()
+    with _lock:
+        source = _sources.get((CONNECTOR_NAME, version))
+        if source is None:
+            source = ab.get_source(
+                CONNECTOR_NAME,
+                version=version,
+                install_if_missing=True,
+                install_root=install_root(),
+            )
+            _sources[(CONNECTOR_NAME, version)] = source
+            logger.info(
+                f"Connector {CONNECTOR_NAME} ({version or 'latest'}) resolved "
+                f"in {time.perf_counter() - started:.2f}s."
+            )
+        elif shared:
+            logger.info(f"Reusing connector {CONNECTOR_NAME} already resolved.")
+    if not shared:  # The connector is installed by now: no install check
+        source = ab.get_source(
+            CONNECTOR_NAME,
+            version=version,
+            install_if_missing=False,
+            install_root=install_root(),
+        )
+        logger.info(f"Private {CONNECTOR_NAME} source created.")
+    if config is not None:
+        source.set_config(config)
+    return source
+
+
+def check_source(source: Any, config: dict[str, Any]) -> None:
+    """Run ``source.check()`` unless the same config passed recently."""
+    cache = CheckCache.from_env()
+    key = config_hash(config)
+    if cache.is_fresh(key):
+        logger.info("Airbyte source check skipped (cached result still valid).")
+        return
+    started = time.perf_counter()
+    source.check()
+    cache.record(key)
+    logger.info(
+        f"Airbyte source check passed in {time.perf_counter() - started:.2f}s."
+    )
+
+
+if __name__ == "__main__":
+    # Pre-warm the connector install, e.g. while building the image.
+    get_source()
@@ -1,5 +1,5 @@
 import os  # noqa: I001
-from sink.sink_neo4j import SinkNeo4j  # noqa: I001
+from sink.factory import create_sink  # noqa: I001
 from datetime import datetime , timezone #  noqa: I001
 from py2neo import Node  # noqa: I001
 from typing import Any  # noqa: I001
@@ -18,7 +18,7 @@ class CreateConfig:
         and loads the organization node into the graph.
         """
         # Initialize the Neo4j sink
-        self.sink = SinkNeo4j()
+        self.sink = create_sink()
 
     def run(self) -> None:
         """Load retrieve date."""  # noqa: D401
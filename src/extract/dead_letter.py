@@ -0,0 +1,110 @@
+import json  # noqa: I001
+import math  # noqa: I001
+import os  # noqa: I001
+import traceback  # noqa: I001
+from collections import namedtuple  # noqa: I001
+from datetime import UTC, datetime  # noqa: I001
+from typing import Any  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("extractor")
+
+POLICY_DEAD_LETTER = "dead_letter"
+POLICY_RAISE = "raise"
+
+
+def _to_json(value: Any) -> Any:
+    """Convert values found in Airbyte rows (numpy, pandas) to JSON types."""
+    if hasattr(value, "tolist"):  # numpy arrays and scalars
+        return value.tolist()
+    if hasattr(value, "isoformat"):  # datetime and pandas Timestamp
+        return value.isoformat()
+    return str(value)
+
+
+def _clean_nan(value: Any) -> Any:
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, list):
+        return [_clean_nan(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _clean_nan(v) for k, v in value.items()}
+    return value
+
+
+class DeadLetterStore:
+    """Local JSONL store of records that failed to load.
+
+    Each line holds the record, the extractor stage and handler that
+    failed, and the exception, so the record can be replayed later.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the store.
+
+        Args:
+        ----
+            path (str): Location of the JSONL file.
+
+        """
+        self.path = path
+        self.count = 0
+
+    @classmethod
+    def for_extractor(cls, extractor: str) -> "DeadLetterStore":
+        """Return the dead-letter store of an extractor."""
+        directory = os.getenv("DEAD_LETTER_DIR", "dead_letter")
+        os.makedirs(directory, exist_ok=True)
+        return cls(os.path.join(directory, f"{extractor}.jsonl"))
+
+    def add(
+        self, stage: str, handler: str, record: Any, error: Exception, run_id: str
+    ) -> None:
+        """Append a failed record to the store.
+
+        Args:
+        ----
+            stage (str): Stage the record belongs to.
+            handler (str): Name of the extractor method that processes it.
+            record (Any): The row tuple that failed.
+            error (Exception): The exception raised while processing it.
+            run_id (str): Run in which the failure happened.
+
+        """
+        entry = {
+            "stage": stage,
+            "handler": handler,
+            "run_id": run_id,
+            "failed_at": datetime.now(UTC).isoformat(),
+            "error_type": type(error).__name__,
+            "error": str(error),
+            "traceback": traceback.format_exception(error),
+            "record": _clean_nan(record._asdict()),
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=_to_json) + "\n")
+        self.count += 1
+
+    def read(self) -> list[dict[str, Any]]:
+        """Return all dead-lettered entries."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def replace(self, entries: list[dict[str, Any]]) -> None:
+        """Rewrite the store with the given entries."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, default=_to_json) + "\n")
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def to_record(entry: dict[str, Any]) -> Any:
+        """Rebuild a row tuple from a dead-lettered entry."""
+        fields = entry["record"]
+        row_type = namedtuple("Record", list(fields), rename=True)  # type: ignore[misc]
+        return row_type(*fields.values())
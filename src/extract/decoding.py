@@ -0,0 +1,119 @@
+import math  # noqa: I001
+from collections.abc import Iterable  # noqa: I001
+from typing import Any  # noqa: I001
+
+import orjson  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("extractor")
+
+# Nested (struct/list) columns of each Airbyte stream. Depending on the
+# cache they come back as dicts/lists or as JSON text; they are decoded
+# once per batch so the loaders always see dicts and lists.
+JSON_COLUMNS: dict[str, tuple[str, ...]] = {
+    "issues": (
+        "user",
+        "assignee",
+        "assignees",
+        "labels",
+        "milestone",
+        "pull_request",
+    ),
+    "pull_requests": (
+        "user",
+        "assignee",
+        "assignees",
+        "labels",
+        "milestone",
+        "requested_reviewers",
+    ),
+    "commits": ("commit", "author", "committer", "parents"),
+}
+
+
+def loads(value: Any) -> Any:
+    """Decode one nested value.
+
+    Dicts and lists are returned as they are, JSON text (``str`` or
+    ``bytes``) is decoded with orjson, and missing values (None, NaN) or
+    undecodable text become None.
+    """
+    if value is None or isinstance(value, (dict, list)):
+        return value
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (str, bytes)):
+        if not value.strip():
+            return None
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON value ignored: {e}")
+            return None
+    if hasattr(value, "tolist"):  # numpy arrays from list columns
+        return value.tolist()
+    return value
+
+
+def decode_columns(frame: Any, columns: Iterable[str]) -> Any:
+    """Decode the nested columns of a DataFrame in place.
+
+    Args:
+    ----
+        frame (DataFrame): Stream records (may be None).
+        columns (Iterable[str]): Nested columns; missing ones are skipped.
+
+    Returns:
+    -------
+        DataFrame: The same frame (a spilled frame decodes per partition).
+
+    """
+    if frame is None:
+        return frame
+    if hasattr(frame, "map_partitions"):
+        return frame.map_partitions(lambda part: decode_columns(part, columns))
+    for column in columns:
+        if column in frame.columns:
+            frame[column] = [loads(v) for v in frame[column]]
+    return frame
+
+
+def explode(
+    frame: Any, column: str, key: str, fields: Iterable[str]
+) -> Any:
+    """Explode a nested list column into a flat table.
+
+    Every element of ``frame[column]`` becomes one row holding the parent
+    ``key`` and the requested fields of the element, named
+    ``<column>.<field>``. Elements missing a field get None; rows without
+    elements produce nothing.
+
+    Args:
+    ----
+        frame (DataFrame): Stream records, with decoded nested columns.
+        column (str): List column (e.g., "labels").
+        key (str): Parent column kept on every row (e.g., "id").
+        fields (Iterable[str]): Fields of the elements (e.g., ["id", "name"]).
+
+    Returns:
+    -------
+        DataFrame: ``key`` plus one column per field.
+
+    """
+    import pandas as pd
+
+    fields = list(fields)
+    names = [key, *(f"{column}.{field}" for field in fields)]
+    if frame is None or column not in frame.columns or key not in frame.columns:
+        return pd.DataFrame(columns=names)
+
+    rows = [
+        (parent, *(item.get(field) for field in fields))
+        for parent, items in zip(frame[key], frame[column], strict=True)
+        if isinstance(items, list)
+        for item in items
+        if isinstance(item, dict)
+    ]
+    return pd.DataFrame.from_records(rows, columns=names)
@@ -1,21 +1,36 @@
 import json
 import os
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from types import SimpleNamespace
 from typing import Any
 
-import airbyte as ab
-import numpy as np
 from dotenv import load_dotenv
 from py2neo import Node, Relationship
-from airbyte.caches import PostgresCache
+from sink.factory import create_sink
 from sink.sink_neo4j import SinkNeo4j
 from src.config.logging_config import LoggerFactory
-from datetime import datetime, timezone
-from pandas import Timestamp
-from typing import Any
-import pandas as pd
+from src.extract import connector
+from src.extract.aggregates import ActivityAggregator
+from src.extract.checkpoint import CheckpointStore
+from src.extract.dead_letter import (
+    POLICY_DEAD_LETTER,
+    POLICY_RAISE,
+    DeadLetterStore,
+)
+from src.extract.memory import MemoryBudget, SpilledFrame, arrow_schema
+from src.extract.organization import OrganizationConfig
+from src.extract.profiling import StageProfiler
+from src.extract.projection import Projector, log_projection_report
+from src.extract.reconcile import Reconciler
+from src.extract.scope import Scope
+from src.extract.snapshot import SnapshotStore
+from src.sink.records import NodeRecord, intern_properties, make_record
+from datetime import UTC, datetime, timezone
+from typing import Any, Callable, Iterator
+
+# airbyte, pandas and numpy are imported lazily: they take seconds to import
+# and are not needed by report-only or replay runs.
 
 
 logger = LoggerFactory.get_logger("extractor")
@@ -33,67 +48,77 @@ class ExtractBase(ABC):
     cache: Any = None  # Local cache managed by Airbyte (DuckDB)
     source: Any = None  # Data source connector (Airbyte)
     sink: Any = None  # Data sink, in this case Neo4j (via SinkNeo4j)
+    projector: Any = None  # Per-label property projection (see projection.py)
+    checkpoint: Any = None  # Durable run progress (see checkpoint.py)
+    dead_letters: Any = None  # Records that failed to load (see dead_letter.py)
+    aggregates: Any = None  # Incremental Activity aggregates (see aggregates.py)
+    scope: Any = None  # Partition the run is limited to (see scope.py)
+    reconciler: Any = None  # Stale node detection (see reconcile.py)
+    organization: Any = None  # Organization the run is for (see organization.py)
+    profiler: Any = None  # Opt-in per-stage profiling (see profiling.py)
+    snapshots: Any = None  # Previous full-refresh snapshots (see snapshot.py)
+    stage_streams: dict[str, str] = {}  # Load stage -> stream it reads
+
+    def __init__(
+        self,
+        connect_source: bool = True,
+        scope: Scope | None = None,
+        organization: OrganizationConfig | None = None,
+        sink: SinkNeo4j | None = None,
+    ) -> None:
+        """Post-initialization hook.
+
+        Args:
+        ----
+            connect_source (bool): Whether to set up the Airbyte source.
+                Disabled when only the sink is needed (e.g., replaying
+                dead-lettered records, or loading a backfill window that
+                another extractor already read into the cache).
+            scope (Scope): Limit the run to some repositories, streams and
+                date window (e.g., a backfill). Defaults to everything.
+            organization (OrganizationConfig): Organization to extract.
+                Defaults to the one of the environment variables; when
+                given, the checkpoints, dead letters and Airbyte cache of
+                the run are kept apart from other organizations.
+            sink (SinkNeo4j): Sink shared with other extractors (its
+                connection pool and Person index). Defaults to a new one.
 
-    def __init__(self) -> None:
-        """Post-initialization hook."""
+        """
         logger.info("Initializing ExtractBase...")
         load_dotenv()
         logger.debug("Environment variables loaded.")
 
+        self.organization = organization or OrganizationConfig.from_env()
+        isolated = organization is not None
+        self.scope = scope
+        if scope is not None:
+            self.streams = [s for s in self.streams if scope.includes(s)]
+            logger.info(f"Run scoped to {scope} (streams: {self.streams}).")
+
+        self.projector = Projector.from_env()
+        logger.info(f"Node projection mode: {self.projector.mode}")
+        self._open_state(scope, isolated)
+
         # Initialize the Neo4j sink
         try:
-            self.sink = SinkNeo4j()
+            self.sink = sink or create_sink()
             logger.info("Neo4j sink initialized successfully.")
         except Exception as e:
             logger.error(f"Failed to initialize Neo4j sink: {e}")
             raise
+        self.aggregates = ActivityAggregator(self.sink)
+        self.reconciler = Reconciler(self.sink)
 
-        # Load GitHub token from .env
-        self.token = os.getenv("GITHUB_TOKEN", "")
+        # Load GitHub token from .env (or the organization config)
+        self.token = self.organization.token
         if not self.token:
             logger.warning("GITHUB_TOKEN not found in environment variables.")
         else:
             logger.debug("GitHub token loaded.")
 
         # If streams are configured, set up the Airbyte source
-        if self.streams:
-            logger.info(f"Configuring Airbyte source for streams: {self.streams}")
-            repositories = os.getenv("REPOSITORIES", "")
-            if not repositories:
-                logger.warning("REPOSITORIES environment variable is not set.")
-
-            config = {
-                "repositories": [repositories],
-                "credentials": {
-                    "personal_access_token": self.token,
-                },
-            }
-            logger.debug(f"Airbyte source initial config: {config}")
-
-            organization_id = os.getenv("ORGANIZATION_ID", "")
-            if not organization_id:
-                logger.warning("ORGANIZATION_ID environment variable is not set.")
-
-            self.config_node = self.sink.get_node(f"Config_{self.__class__.__name__}", id=organization_id)
-
-            if self.config_node is not None:
-                config["start_date"] = self.config_node["last_retrieve_date"]
-                logger.info(f"Using start_date: {config['start_date']}")
-            
-            try:
-                self.source = ab.get_source(
-                    "source-github",
-                    install_if_missing=True,
-                    config=config,
-                )
-                logger.info("Airbyte source-github obtained.")
-
-                # Check if source credentials and config are valid
-                self.source.check()
-                logger.info("Airbyte source check passed successfully.")
-            except Exception as e:
-                logger.error(f"Failed to configure or check Airbyte source: {e}")
-                raise
+        if self.streams and connect_source:
+            self._connect_source(scope, isolated)
         else:
             logger.info("No Airbyte streams configured. Skipping Airbyte source setup.")
 
@@ -101,27 +126,131 @@ class ExtractBase(ABC):
         self.__load_organization()
         logger.info("ExtractBase initialization complete.")
 
+    def _open_state(self, scope: Scope | None, isolated: bool) -> None:
+        """Open the checkpoint, dead letters and other state of the run.
+
+        The state is named after the extractor and the organization, and
+        kept apart for scoped runs (backfills) and isolated organizations.
+        """
+        checkpoint_key = self.organization.id
+        if scope is not None:  # Backfills never share a normal run checkpoint
+            checkpoint_key = f"{checkpoint_key}_backfill_{scope.name}"
+        self.checkpoint = CheckpointStore.for_extractor(
+            self.__class__.__name__, checkpoint_key
+        )
+        run_name = f"{self.__class__.__name__}_{checkpoint_key}"
+        self.memory = MemoryBudget(run_name)
+        self.profiler = StageProfiler(run_name)
+        self.snapshots = SnapshotStore(run_name)
+
+        self.error_policy = os.getenv("RECORD_ERROR_POLICY", POLICY_DEAD_LETTER)
+        if self.error_policy not in (POLICY_DEAD_LETTER, POLICY_RAISE):
+            raise ValueError(f"Unknown RECORD_ERROR_POLICY: {self.error_policy}")
+        dead_letter_name = self.__class__.__name__
+        if isolated:
+            dead_letter_name = f"{dead_letter_name}_{self.organization.slug}"
+        self.dead_letters = DeadLetterStore.for_extractor(dead_letter_name)
+        self.cache_schema = None  # PostgresCache default schema
+        if scope is not None:
+            self.cache_schema = scope.cache_schema
+        if isolated:
+            self.cache_schema = "_".join(
+                [self.organization.slug, self.cache_schema or "airbyte_raw"]
+            )
+
+    def _source_config(self, scope: Scope | None) -> dict[str, Any]:
+        """Build the Airbyte source config (repositories, token, start date)."""
+        repositories = list(self.organization.repositories)
+        if not repositories:
+            logger.warning("REPOSITORIES environment variable is not set.")
+
+        if scope is not None and scope.repositories:
+            repositories = list(scope.repositories)
+
+        config = {
+            "repositories": repositories,
+            "credentials": {
+                "personal_access_token": self.token,
+            },
+        }
+        logger.debug(f"Airbyte source initial config: {config}")
+
+        organization_id = self.organization.id
+        if not organization_id:
+            logger.warning("ORGANIZATION_ID environment variable is not set.")
+
+        self.config_node = self.sink.get_node(
+            f"Config_{self.__class__.__name__}", id=organization_id
+        )
+
+        if self.config_node is not None:
+            config["start_date"] = self.config_node["last_retrieve_date"]
+            logger.info(f"Using start_date: {config['start_date']}")
+        if scope is not None and scope.since:
+            config["start_date"] = f"{scope.since}T00:00:00Z"
+            logger.info(f"Backfill start_date: {config['start_date']}")
+        return config
+
+    def _connect_source(self, scope: Scope | None, isolated: bool) -> None:
+        """Set up and check the Airbyte source of the streams."""
+        logger.info(f"Configuring Airbyte source for streams: {self.streams}")
+        config = self._source_config(scope)
+        try:
+            started = time.perf_counter()
+            # Scoped and per-organization runs may read concurrently:
+            # they get a source of their own.
+            self.source = connector.get_source(
+                config, shared=scope is None and not isolated
+            )
+            logger.info("Airbyte source-github obtained.")
+
+            # Check if source credentials and config are valid
+            connector.check_source(self.source, config)
+            logger.info(
+                "Airbyte source ready in "
+                f"{time.perf_counter() - started:.2f}s."
+            )
+        except Exception as e:
+            logger.error(f"Failed to configure or check Airbyte source: {e}")
+            raise
+
     def load_data(self) -> None:
-        """Load data from the Airbyte source into the local cache."""
-        if not self.source:
+        """Load data from the Airbyte source into the local cache.
+
+        Scoped runs use a cache schema of their own, so a backfill never
+        mixes its records with the regular cache. Without a source (a
+        backfill window loaded after the read) only the cache is opened.
+        """
+        if not self.source and self.scope is None:
             logger.warning("Airbyte source not initialized. Cannot load data.")
             return
 
-        logger.info(f"Selecting streams to load: {self.streams}")
-        self.source.select_streams(self.streams)  # Select streams to load
+        from airbyte.caches import PostgresCache
 
-        
         logger.info("Initializing Postgres Cache.")
+        cache_options = {}
+        if self.cache_schema is not None:
+            cache_options["schema_name"] = self.cache_schema
         self.cache = PostgresCache(
                 
             host=os.getenv("DB_HOST_LOCAL", "localhost"),
             port=os.getenv("DB_PORT_LOCAL", "localhost"),
             username=os.getenv("DB_USER_LOCAL", "localhost"),
             password=os.getenv("DB_PASSWORD_LOCAL", "localhost"),
-            database=os.getenv("DB_NAME_LOCAL", "localhost")
-                
+            database=os.getenv("DB_NAME_LOCAL", "localhost"),
+            **cache_options,
         )
-         
+
+        if not self.source:
+            logger.info("No Airbyte source: using the records already cached.")
+            return
+
+        logger.info(f"Selecting streams to load: {self.streams}")
+        self.source.select_streams(self.streams)  # Select streams to load
+
+        if self.checkpoint.is_done("read"):
+            logger.info("Airbyte read already completed in this run. Using cache.")
+            return
 
         logger.info("Reading data from Airbyte source into cache...")
         try:
@@ -130,6 +259,375 @@ class ExtractBase(ABC):
         except Exception as e:
             logger.error(f"Failed to load data from Airbyte source: {e}")
             raise
+        self.checkpoint.complete("read")
+
+    def read_frame(self, stream: str, spill_key: list[str] | None = None) -> Any:
+        """Return the cached records of a stream, limited to the run scope.
+
+        With a memory budget (``MEMORY_BUDGET_MB``), streams given a
+        ``spill_key`` are read in chunks sorted by it and spill to disk
+        when the budget would be exceeded (see ``MemoryBudget``).
+
+        Args:
+        ----
+            stream (str): Airbyte stream name.
+            spill_key (list[str]): Columns ordering the records of a stream
+                allowed to spill (the key of its load stage).
+
+        Returns:
+        -------
+            DataFrame | SpilledFrame: The records, or None when the stream
+            is not cached.
+
+        """
+        if self.cache is None or stream not in self.streams or stream not in self.cache:
+            return None
+        if spill_key is not None and self.memory.limited:
+            return self._read_chunks(stream, spill_key)
+        frame = self.cache[stream].to_pandas()
+        if self.scope is not None:
+            frame = self.scope.filter(stream, frame)
+        return frame
+
+    def read_snapshot(self, stream: str) -> Any:
+        """Return the records of a full-refresh stream changed since last run.
+
+        The stream is diffed against its snapshot of the previous run (see
+        ``SnapshotStore``); only its new or changed records are returned.
+        Every record is returned for scoped runs, which see part of the
+        snapshot only, and when ``SNAPSHOT_DELTA`` is off.
+
+        Args:
+        ----
+            stream (str): Full-refresh stream (see ``SNAPSHOT_KEYS``).
+
+        Returns:
+        -------
+            DataFrame: The records to load, or None when the stream is not
+            cached.
+
+        """
+        frame = self.read_frame(stream)
+        if frame is None or self.scope is not None or not self.snapshots.enabled:
+            return frame
+        return self.snapshots.diff(stream, frame, self.sink.generation).changed
+
+    def snapshot_frame(self, stream: str, frame: Any) -> Any:
+        """Return every record of a full-refresh stream, not only its delta."""
+        delta = self.snapshots.deltas.get(stream)
+        return frame if delta is None else delta.frame
+
+    def _read_chunks(self, stream: str, order: list[str]) -> Any:
+        """Read a stream in sorted chunks, within the memory budget."""
+        import pandas as pd
+        from sqlalchemy import select
+
+        table = self.cache[stream].to_sql_table()
+        schema, json_columns = arrow_schema(table)
+        order = [c for c in order if c in table.c]
+        query = select(table).order_by(*(table.c[c] for c in order))
+
+        def chunks() -> Iterator[Any]:
+            engine = self.cache.get_sql_engine()
+            with engine.connect().execution_options(stream_results=True) as conn:
+                for chunk in pd.read_sql(
+                    query, conn, chunksize=self.memory.partition_rows
+                ):
+                    if self.scope is not None:
+                        chunk = self.scope.filter(stream, chunk)
+                    yield chunk
+
+        return self.memory.read(stream, chunks(), schema, json_columns, tuple(order))
+
+    def fetch(self) -> None:
+        """Fetch the data of the run (``fetch_data``), profiled as a stage."""
+        with self.profiler.profile("fetch_data"):
+            self.fetch_data()
+
+    def stages(self) -> list[tuple[str, Callable[[], None]]]:
+        """Load stages of the extractor (name and function), in order."""
+        return []
+
+    def run_stages(self) -> None:
+        """Run every load stage of the extractor, in order."""
+        for stage, load in self.stages():
+            self.run_stage(stage, load)
+
+    def run_stage(self, stage: str, load: Callable[[], None]) -> None:
+        """Run a load stage unless the checkpoint says it already completed.
+
+        Args:
+        ----
+            stage (str): Stage name recorded in the checkpoint.
+            load (Callable): Function that loads the stage.
+
+        """
+        if self.checkpoint.is_done(stage):
+            logger.info(f"Stage '{stage}' already completed. Skipping.")
+            return
+        if self.scope is not None and self.stage_streams.get(stage) not in self.streams:
+            logger.info(f"Stage '{stage}' is outside the run scope. Skipping.")
+            return
+        logger.info(f"Running stage '{stage}'...")
+        try:
+            with self.memory.measure(stage), self.profiler.profile(stage):
+                load()
+        except BaseException:
+            # Publish what was written even if the stage failed midway, but
+            # never let a failed flush hide the error of the stage.
+            try:
+                self._flush_stage(stage)
+            except Exception as e:
+                logger.error(f"Flush after the failure of stage '{stage}' failed: {e}")
+            raise
+        self._flush_stage(stage)
+        self.checkpoint.complete(stage)
+
+    def _flush_stage(self, stage: str) -> None:
+        """Apply the aggregates, watermarks and key index entries of a stage."""
+        with self.profiler.profile(f"{stage}.flush"):
+            self.aggregates.flush()
+            self.sink.flush_watermarks()
+            self.sink.keys.flush()
+
+    def iter_records(
+        self,
+        stage: str,
+        frame: Any,
+        key: str | list[str] | None = None,
+        index: bool = False,
+    ) -> Iterator[Any]:
+        """Iterate over the rows of a stage, resuming after the last batch.
+
+        Rows are visited in a stable order (sorted by ``key`` when given) so
+        that the committed offset points at the same row after a restart.
+        The offset is committed every ``CHECKPOINT_BATCH_SIZE`` rows, once
+        the caller has finished processing them.
+
+        Args:
+        ----
+            stage (str): Stage name recorded in the checkpoint.
+            frame (DataFrame): Rows of the stage.
+            key (str | list[str]): Column(s) that order the rows (optional).
+            index (bool): Whether to include the index in the row tuples.
+
+        Yields:
+        ------
+            Any: One row tuple at a time.
+
+        """
+        if frame is None:
+            return
+        spilled = isinstance(frame, SpilledFrame)
+        if key is not None:
+            frame = self._ordered(stage, frame, key)
+
+        batch_size = int(os.getenv("CHECKPOINT_BATCH_SIZE", "500"))
+        start = self.checkpoint.offset(stage)
+        if start:
+            logger.info(f"Stage '{stage}' resuming at record {start}/{len(frame)}.")
+
+        if spilled:
+            rows = self._iter_spilled(frame, start, index)
+        else:
+            rows = frame.iloc[start:].itertuples(index=index)
+        offset = start
+        row = None
+        for row in rows:
+            yield row
+            offset += 1
+            if offset % batch_size == 0:
+                self.checkpoint.commit(stage, offset, self._row_key(row, key))
+        if offset != start:
+            self.checkpoint.commit(stage, offset, self._row_key(row, key))
+
+    @staticmethod
+    def _ordered(stage: str, frame: Any, key: str | list[str]) -> Any:
+        """Sort the rows of a stage by its key columns, when possible.
+
+        Spilled records cannot be sorted again: they are read in the order
+        they were spilled in, with a warning when it is not the key's.
+        """
+        columns = [key] if isinstance(key, str) else key
+        missing = [c for c in columns if c not in frame.columns]
+        if missing:
+            logger.warning(f"Stage '{stage}' has no key columns {missing}.")
+        elif not isinstance(frame, SpilledFrame):
+            return frame.sort_values(columns, kind="stable")
+        elif tuple(columns) != frame.order:
+            logger.warning(
+                f"Stage '{stage}' reads spilled records sorted by "
+                f"{list(frame.order)}, not {columns}."
+            )
+        return frame
+
+    def load_records(
+        self,
+        stage: str,
+        frame: Any,
+        handler: Callable[[Any], None],
+        key: str | list[str] | None = None,
+        index: bool = False,
+    ) -> None:
+        """Process the rows of a stage one record at a time.
+
+        With the ``dead_letter`` error policy (``RECORD_ERROR_POLICY``), a
+        record whose handler raises is written to the dead-letter store and
+        the stage continues with the next record. The stage is aborted when
+        ``DEAD_LETTER_MAX_CONSECUTIVE`` records fail in a row, since that
+        usually means the sink itself is down.
+
+        Args:
+        ----
+            stage (str): Stage name recorded in the checkpoint.
+            frame (DataFrame): Rows of the stage.
+            handler (Callable): Extractor method that loads one row.
+            key (str | list[str]): Column(s) that order the rows (optional).
+            index (bool): Whether to include the index in the row tuples.
+
+        """
+        max_consecutive = int(os.getenv("DEAD_LETTER_MAX_CONSECUTIVE", "50"))
+        consecutive = 0
+        failed = 0
+        for row in self.iter_records(stage, frame, key=key, index=index):
+            try:
+                handler(row)
+                consecutive = 0
+            except Exception as e:
+                if self.error_policy == POLICY_RAISE:
+                    raise
+                consecutive += 1
+                failed += 1
+                self.dead_letters.add(
+                    stage, handler.__name__, row, e, self.checkpoint.run_id
+                )
+                logger.error(f"Record of stage '{stage}' dead-lettered: {e}")
+                if consecutive >= max_consecutive:
+                    logger.error(
+                        f"{consecutive} consecutive failures in stage '{stage}'."
+                    )
+                    raise
+        if failed:
+            logger.warning(
+                f"Stage '{stage}': {failed} records written to "
+                f"{self.dead_letters.path}"
+            )
+
+    def replay_dead_letters(self) -> tuple[int, int]:
+        """Re-process the dead-lettered records of this extractor.
+
+        Records that load successfully are removed from the store; records
+        that fail again are kept with the new error.
+
+        Returns
+        -------
+            tuple: Number of records replayed and number still failing.
+
+        """
+        entries = self.dead_letters.read()
+        logger.info(
+            f"Replaying {len(entries)} dead-lettered records from "
+            f"{self.dead_letters.path}"
+        )
+        remaining = []
+        for entry in entries:
+            handler = getattr(self, entry["handler"], None)
+            if handler is None:
+                logger.error(f"Unknown handler for dead letter: {entry['handler']}")
+                remaining.append(entry)
+                continue
+            try:
+                handler(self.dead_letters.to_record(entry))
+            except Exception as e:
+                logger.error(f"Replay of stage '{entry['stage']}' failed: {e}")
+                entry.update(
+                    error_type=type(e).__name__,
+                    error=str(e),
+                    replayed_at=datetime.now(UTC).isoformat(),
+                )
+                remaining.append(entry)
+        self.dead_letters.replace(remaining)
+        replayed = len(entries) - len(remaining)
+        logger.info(f"Replayed {replayed} records, {len(remaining)} still failing.")
+        return replayed, len(remaining)
+
+    @staticmethod
+    def _iter_spilled(frame: SpilledFrame, start: int, index: bool) -> Iterator[Any]:
+        """Iterate over the rows of a spilled frame from position ``start``."""
+        position = 0
+        for part in frame.partitions():
+            count = len(part)
+            if position + count > start:
+                part.index = range(position, position + count)
+                yield from part.iloc[max(0, start - position) :].itertuples(
+                    index=index
+                )
+            position += count
+
+    @staticmethod
+    def _row_key(row: Any, key: str | list[str] | None) -> Any:
+        if row is None or key is None:
+            return None
+        if isinstance(key, str):
+            return getattr(row, key, None)
+        return tuple(getattr(row, k, None) for k in key)
+
+    def reconcile(
+        self,
+        label: str,
+        key: str,
+        seen: Any,
+        scope_property: str | None = None,
+        scope: Any = None,
+        stream: str | None = None,
+        node_keys: Callable[[Any], list[Any]] | None = None,
+    ) -> None:
+        """Mark or delete the nodes of a label missing from a full snapshot.
+
+        Only meaningful for unscoped runs: a backfill or a window does not
+        see the whole snapshot, so it never reconciles. When ``stream`` was
+        diffed against its previous snapshot, only the keys it removed are
+        marked or deleted (restricted to ``scope``), instead of diffing
+        ``seen`` with every stored key.
+
+        Args:
+        ----
+            label (str): Node label (e.g., "Branch").
+            key (str): Key property of the label.
+            seen (Iterable): Node keys present in the current snapshot.
+            scope_property (str): Property restricting the nodes compared.
+            scope (Iterable): Values of ``scope_property`` covered.
+            stream (str): Full-refresh stream the snapshot comes from.
+            node_keys (Callable): Node keys of a frame of stream records.
+
+        """
+        if self.scope is not None:
+            logger.info(f"Scoped run: {label} reconciliation skipped.")
+            return
+        delta = self.snapshots.deltas.get(stream) if stream else None
+        if delta is None or not delta.incremental or node_keys is None:
+            self.reconciler.reconcile(label, key, seen, scope_property, scope)
+            return
+        removed = delta.removed
+        if scope is not None and scope_property in removed.columns:
+            removed = removed[removed[scope_property].isin(list(scope))]
+        self.reconciler.reconcile_delta(
+            label, key, node_keys(removed), node_keys(delta.inserted)
+        )
+
+    def finish_run(self) -> None:
+        """Report the run and discard its checkpoint.
+
+        The stream snapshots are only replaced when the sink persists its
+        writes: after an in-memory run, the next real run must still see
+        the changes since the previous real one.
+        """
+        self.log_projection_report()
+        self.memory.report()
+        self.memory.release()
+        if self.sink.persistent:
+            self.snapshots.commit()
+        self.checkpoint.finish()
 
     def flatten_nested_dict(self, d: dict, parent_key='', sep='.') -> dict:
         items = []
@@ -159,6 +657,9 @@ class ExtractBase(ABC):
 
 
     def safe_nan_to_none(self, v):
+        import numpy as np
+        import pandas as pd
+
         try:
             if isinstance(v, (list, np.ndarray, pd.Series)):
                 return [None if pd.isna(item) else item for item in v]
@@ -167,15 +668,17 @@ class ExtractBase(ABC):
             return v
 
 
-    def transform(self, value: Any) -> Any:
+    def transform(self, value: Any, label: str | None = None) -> Any:
         """Transform a record from Airbyte into a clean dictionary.
 
         Removes auxiliary fields (starting with "_airbyte")
-        and converts NaN values to None.
+        and converts NaN values to None. When a label is given, the
+        label projection is applied instead of the full flattening.
 
         Args:
         ----
             value (Any): A single record object.
+            label (str): Node label the record is stored as (optional).
 
         Returns:
         -------
@@ -189,18 +692,38 @@ class ExtractBase(ABC):
             if not k.startswith("_airbyte")  # Remove metadata fields
         }
 
-        clean = self.data_clean(data)
+        clean = self.project(data, label) if label else self.data_clean(data)
         logger.debug(f"Transformed record: {clean}")
-        
+
         return clean
 
-        
-    def save_node(self, node: Node, type: str, key: str) -> Node:
+    def project(self, data: dict[str, Any], label: str) -> dict[str, Any]:
+        """Apply the projection configured for a label to a record.
+
+        Args:
+        ----
+            data (dict): Record with nested dicts and lists.
+            label (str): Node label (e.g., "Issue").
+
+        Returns:
+        -------
+            dict: Flat dictionary with the properties to store.
+
+        """
+        if not self.projector.enabled:
+            return self.data_clean(data)
+        return self.projector.project(label, data)
+
+    def log_projection_report(self) -> None:
+        """Log the bytes saved by the node projection, per label."""
+        log_projection_report(self.projector, self.__class__.__name__)
+
+    def save_node(self, node: NodeRecord | Node, type: str, key: str) -> Node:
         """Persist a node into Neo4j.
 
         Args:
         ----
-            node (Node): Py2neo Node object.
+            node (NodeRecord | Node): Node record or py2neo Node object.
             type (str): Node label (e.g., "User", "Repository").
             key (str): Unique property key to identify the node.
 
@@ -257,8 +780,29 @@ class ExtractBase(ABC):
         logger.info(
             f"Retrieve node of type '{type_element}' with properties: {properties}"
         )
+        person = type_element == "Person" and list(properties) == ["id"]
+        if person:
+            node = self.sink.people.get(properties["id"])
+            if node is not None:
+                return node
+        # Single-key lookups are answered by the persistent key index; the
+        # node is then only known by that key and its element id.
+        key = value = None
+        if len(properties) == 1:
+            ((key, value),) = properties.items()
+        element_id = self.sink.keys.get(type_element, key, value) if key else None
+        if element_id is not None:
+            node = make_record(type_element, key, {key: value})
+            node.element_id = element_id
+            if person:
+                self.sink.people.add(value, node)
+            return node
         try:
             node = self.sink.get_node(type_element, **properties)
+            if node and person:
+                self.sink.people.add(properties["id"], node)
+            if node and key:
+                self.sink.keys.add(type_element, key, value, node.element_id)
             if node:
                 logger.info(
                     f"Node '{type_element}' with properties {properties} found."
@@ -282,21 +826,24 @@ class ExtractBase(ABC):
         pass
 
     def transform_object(self, value: Any) -> Any:
-        """Transform dictionary to object.
+        """Decode a JSON value into plain dictionaries and lists.
+
+        Property names are interned, so the same keys repeated across
+        thousands of decoded records are stored once.
 
         Args:
         ----
-            value (Any): dictionary
+            value (Any): JSON text
 
         Returns:
         -------
-            Object: Object
+            Any: Decoded value
 
         """
-        logger.debug(f"Transforming dictionary to object: {value}")
+        logger.debug(f"Decoding JSON value: {value}")
         try:
-            obj = json.loads(value, object_hook=lambda d: SimpleNamespace(**d))
-            logger.debug("Dictionary transformed to object successfully.")
+            obj = json.loads(value, object_hook=intern_properties)
+            logger.debug("JSON value decoded successfully.")
             return obj
         except json.JSONDecodeError as e:
             logger.error(f"JSON decoding error during object transformation: {e}")
@@ -308,15 +855,15 @@ class ExtractBase(ABC):
             raise
 
     def create_relationship(
-        self, node_from: Node, relation: str, node_to: Node
+        self, node_from: NodeRecord | Node, relation: str, node_to: NodeRecord | Node
     ) -> None:
         """Create a Relationship between nodes.
 
         Args:
         ----
-            node_from (Node): node source relationship
+            node_from (NodeRecord | Node): node source relationship
             relation (str): relation name
-            node_to (Node): node target from relationship
+            node_to (NodeRecord | Node): node target from relationship
 
         """
         logger.info(
@@ -326,13 +873,13 @@ class ExtractBase(ABC):
         )
 
         try:
-            self.sink.save_relationship(Relationship(node_from, relation, node_to))
+            self.sink.save_relationship_between(node_from, relation, node_to)
             logger.info(f"Relationship '{relation}' created successfully.")
         except Exception as e:
             logger.error(f"Failed to create relationship '{relation}': {e}")
             raise
 
-    def create_node(self, data: Any, node_type: str, id_field: str) -> Node:
+    def create_node(self, data: Any, node_type: str, id_field: str) -> NodeRecord:
         """Create a Node.
 
         Args:
@@ -343,14 +890,17 @@ class ExtractBase(ABC):
 
         Returns:
         -------
-            Node: a node in a graph
+            NodeRecord: the saved node (label, key and properties only)
 
         """
         logger.info(f"Create node '{node_type}' with field '{id_field}': {data}")
         data["created_node_at"] = datetime.now().isoformat()
-        node = Node(node_type, **data)
+        node = make_record(node_type, id_field, data)
         try:
             self.sink.save_node(node, node_type.strip().lower(), id_field)
+            self.sink.keys.add(node_type, id_field, data.get(id_field), node.element_id)
+            if node_type == "Person":
+                self.sink.people.add(data.get(id_field), node)
             logger.info(
                 f"Node '{node_type}' - '{data.get(id_field)}' created and saved."
             )
@@ -361,13 +911,41 @@ class ExtractBase(ABC):
             )
             raise
 
+    def create_relationships(
+        self,
+        relation: str,
+        start: tuple[str, str],
+        end: tuple[str, str],
+        rows: list[dict[str, Any]],
+    ) -> None:
+        """Create many Relationships between existing nodes in batches.
+
+        Args:
+        ----
+            relation (str): relation name
+            start (tuple[str, str]): label and key property of the source nodes
+            end (tuple[str, str]): label and key property of the target nodes
+            rows (list[dict]): ``{"start": key, "end": key}`` per relationship
+
+        """
+        logger.info(
+            f"Create {len(rows)} relationships '{relation}' "
+            f"from {start[0]} to {end[0]}"
+        )
+        try:
+            self.sink.save_relationships(relation, start, end, rows)
+            logger.info(f"{len(rows)} relationships '{relation}' created.")
+        except Exception as e:
+            logger.error(f"Failed to create relationships '{relation}': {e}")
+            raise
+
     def create_config_domain(self,name:str) -> None:
         """Load retrieve date."""
         logger.info("Creating retrieve date configuration node.")
         today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
         start_date = today.isoformat() + "Z"
-        organization_id = os.getenv("ORGANIZATION_ID", "")
-        organization_name = os.getenv("ORGANIZATION", "")
+        organization_id = self.organization.id
+        organization_name = self.organization.name
 
         if not organization_id:
             logger.warning("ORGANIZATION_ID not found for creating retrieve config.")
@@ -393,8 +971,8 @@ class ExtractBase(ABC):
 
     def __load_organization(self) -> None:
         """Load the organization node."""
-        organization_id = os.getenv("ORGANIZATION_ID", "")
-        organization_name = os.getenv("ORGANIZATION", "")
+        organization_id = self.organization.id
+        organization_name = self.organization.name
 
         if not organization_id:
             logger.warning("ORGANIZATION_ID not found for loading organization node.")
@@ -1,8 +1,43 @@
 from src.extract.extract_base import ExtractBase  # noqa: I001
+from src.extract.organization import OrganizationConfig  # noqa: I001
+from src.extract.scope import Scope  # noqa: I001
+from sink.sink_neo4j import SinkNeo4j  # noqa: I001
 from typing import Any  # noqa: I001
 from py2neo import Node  # noqa: I001
 from src.config.logging_config import LoggerFactory  # noqa: I001
-import json  # noqa: I001
+from src.extract.decoding import JSON_COLUMNS, decode_columns, explode, loads  # noqa: I001
+from src.extract.memory import map_partitions, partitions  # noqa: I001
+from datetime import datetime  # noqa: I001
+import os  # noqa: I001
+
+# What to do with the issues that are pull requests (GitHub lists every
+# pull request in the issues stream): "link" writes a minimal Issue node
+# linked to its PullRequest, "skip" writes nothing, "full" loads them like
+# any other issue.
+PR_ISSUES_LINK = "link"
+PR_ISSUES_SKIP = "skip"
+PR_ISSUES_FULL = "full"
+
+PR_ISSUE_COLUMNS = [
+    "id",
+    "number",
+    "title",
+    "state",
+    "repository",
+    "html_url",
+    "created_at",
+    "updated_at",
+    "closed_at",
+]
+
+# Backed by the pullrequest (repository, number) index (see schema.py). An
+# issue whose pull request is not in the graph is not written.
+LINK_PR_ISSUES = """UNWIND $rows AS row
+MATCH (pr:pullrequest {repository: row.repository, number: row.number})
+MERGE (i:issue {id: row.id})
+SET i += row, i.updated_node_at = timestamp() SET i:Issue
+MERGE (pr)-[h:has]->(i)
+SET h.updated_node_at = timestamp()"""
 
 
 class ExtractCIRO(ExtractBase):
@@ -15,7 +50,21 @@ class ExtractCIRO(ExtractBase):
     issue_labels: Any = None
     projects: Any = None
 
-    def __init__(self) -> None:
+    stage_streams = {
+        "labels": "issue_labels",
+        "milestones": "issue_milestones",
+        "pull_requests": "pull_requests",
+        "pull_request_commits": "pull_request_commits",
+        "issues": "issues",
+    }
+
+    def __init__(
+        self,
+        connect_source: bool = True,
+        scope: Scope | None = None,
+        organization: OrganizationConfig | None = None,
+        sink: SinkNeo4j | None = None,
+    ) -> None:
         """Initialize the extractor and define streams to load from Airbyte."""
         self.logger = LoggerFactory.get_logger(__name__)
         self.streams = [
@@ -25,7 +74,12 @@ class ExtractCIRO(ExtractBase):
             "pull_requests",
             "issue_labels",
         ]
-        super().__init__()
+        super().__init__(
+            connect_source=connect_source,
+            scope=scope,
+            organization=organization,
+            sink=sink,
+        )
         self.logger.debug("Initialized ExtractCIRO with streams: %s", self.streams)
 
     def fetch_data(self) -> None:
@@ -33,67 +87,191 @@ class ExtractCIRO(ExtractBase):
         self.logger.info("Fetching data from Airbyte cache...")
         self.load_data()
 
-        if "issue_milestones" in self.cache:
-            self.milestones = self.cache["issue_milestones"].to_pandas()
+        self.milestones = self.read_frame("issue_milestones")
+        if self.milestones is not None:
             self.logger.info(f"{len(self.milestones)} issue_milestones loaded.")
 
-        if "issues" in self.cache:
-            self.issues = self.cache["issues"].to_pandas()
+        self.issues = decode_columns(
+            self.read_frame("issues", spill_key=["id"]), JSON_COLUMNS["issues"]
+        )
+        if self.issues is not None:
             self.logger.info(f"{len(self.issues)} issues loaded.")
 
-        if "pull_request_commits" in self.cache:
-            self.pull_request_commits = self.cache["pull_request_commits"].to_pandas()
+        self.pull_request_commits = self.read_frame(
+            "pull_request_commits", spill_key=["repository", "pull_number", "sha"]
+        )
+        if self.pull_request_commits is not None:
             self.logger.info(
                 f"{len(self.pull_request_commits)} pull_request_commits loaded."
             )
 
-        if "pull_requests" in self.cache:
-            self.pull_requests = self.cache["pull_requests"].to_pandas()
+        self.pull_requests = decode_columns(
+            self.read_frame("pull_requests", spill_key=["id"]),
+            JSON_COLUMNS["pull_requests"],
+        )
+        if self.pull_requests is not None:
             self.logger.info(f"{len(self.pull_requests)} pull_requests loaded.")
 
-        if "issue_labels" in self.cache:
-            self.issue_labels = self.cache["issue_labels"].to_pandas()
+        self.issue_labels = self.read_snapshot("issue_labels")
+        if self.issue_labels is not None:
             self.logger.info(f"{len(self.issue_labels)} issue_labels loaded.")
 
     def __load_milestones(self) -> None:
         """Create Milestone nodes and link them to their respective repositories."""
         self.logger.info("Loading milestones...")
-        for milestone in self.milestones.itertuples(index=False):
-            data = self.transform(milestone)
-            self.logger.debug("Milestone transformed: %s", data)
+        self.load_records(
+            "milestones",
+            self.milestones,
+            self._load_milestones_record,
+            key="id",
+        )
+
+    def _load_milestones_record(self, milestone: Any) -> None:
+        """Create one Milestone node and link it to its repository."""
+        data = self.transform(milestone, "Milestone")
+        self.logger.debug("Milestone transformed: %s", data)
+
+        # Milestone progress, from the counters GitHub already computed
+        closed = data.get("closed_issues") or 0
+        total = (data.get("open_issues") or 0) + closed
+        data["progress"] = round(closed / total, 4) if total else None
 
-            milestone_node = self.create_node(data, "Milestone", "id")
-            self.logger.debug("Milestone node created: %s", milestone_node)
+        milestone_node = self.create_node(data, "Milestone", "id")
+        self.logger.debug("Milestone node created: %s", milestone_node)
 
-            repository_node = self.get_node(
-                "Repository", full_name=milestone.repository
+        repository_node = self.get_node(
+            "Repository", full_name=milestone.repository
+        )
+        if repository_node:
+            self.create_relationship(repository_node, "has", milestone_node)
+            self.logger.info(
+                "Linked Repository to Milestone: %s - %s",
+                milestone.repository,
+                milestone.title,
+            )
+        else:
+            self.logger.warning(
+                f"Repository not found for milestone: {milestone.title}"
             )
-            if repository_node:
-                self.create_relationship(repository_node, "has", milestone_node)
-                self.logger.info(
-                    "Linked Repository to Milestone: %s - %s",
-                    milestone.repository,
-                    milestone.title,
-                )
-            else:
-                self.logger.warning(
-                    f"Repository not found for milestone: {milestone.title}"
-                )
 
     def __load_issue(self) -> None:
         """Create Issue nodes and link."""
         self.logger.info("Loading issues...")
-        for issue in self.issues.itertuples(index=False):
-            data = self.transform(issue)
-            self.logger.debug("Issue transformed: %s", data)
-
-            node = self._create_issue_node(data, issue)
-            self._link_issue_to_repository(node, issue)
-            self._link_issue_to_milestone(node, issue)
-            self._link_issue_to_users(node, issue)
-            self._link_issue_to_labels(node, issue)
-            self._link_issue_to_pull_request(node,issue)
-    
+        issues, pr_issues = self._split_pr_issues(self.issues)
+        self.load_records("issues", issues, self._load_issues_record, key="id")
+        self._link_labels(issues, "Issue")
+        self._load_pr_issues(pr_issues)
+
+    def _split_pr_issues(self, frame: Any) -> tuple[Any, Any]:
+        """Separate the issues that are pull requests, per ``PR_ISSUES``."""
+        mode = os.getenv("PR_ISSUES", PR_ISSUES_LINK).strip().lower()
+        if mode not in (PR_ISSUES_LINK, PR_ISSUES_SKIP, PR_ISSUES_FULL):
+            raise ValueError(f"Unknown PR_ISSUES: {mode}")
+        if (
+            frame is None
+            or mode == PR_ISSUES_FULL
+            or "pull_request" not in frame.columns
+        ):
+            return frame, None
+
+        def issues_only(part: Any) -> Any:
+            return part[part["pull_request"].isna()].reset_index(drop=True)
+
+        def pr_issues_only(part: Any) -> Any:
+            return part[part["pull_request"].notna()].reset_index(drop=True)
+
+        issues = map_partitions(frame, issues_only)
+        pr_issues = map_partitions(frame, pr_issues_only)
+        self._report_pr_issues(pr_issues, mode)
+        return issues, (pr_issues if mode == PR_ISSUES_LINK else None)
+
+    def _report_pr_issues(self, pr_issues: Any, mode: str) -> None:
+        """Log the writes and lookups the PR-backed issues no longer cost."""
+
+        def total(part: Any, column: str) -> int:
+            if column not in part.columns:
+                return 0
+            return int(sum(len(v) for v in part[column] if isinstance(v, list)))
+
+        def present(part: Any, column: str) -> int:
+            if column not in part.columns:
+                return 0
+            return int(part[column].notna().sum())
+
+        count = links = 0
+        for part in partitions(pr_issues, self.memory.partition_rows):
+            # Full path: repository, creator, assignees, milestone, labels
+            # and pull request links, each after a node lookup.
+            count += len(part)
+            links += (
+                len(part)
+                + present(part, "user")
+                + present(part, "assignee")
+                + total(part, "assignees")
+                + present(part, "milestone")
+                + total(part, "labels")
+                + len(part)
+            )
+        kept = count if mode == PR_ISSUES_LINK else 0
+        self.logger.info(
+            f"{count} issues are pull requests ({mode}): "
+            f"{count - kept} node writes and {links - kept} relationship "
+            f"writes and lookups avoided."
+        )
+
+    def _load_pr_issues(self, pr_issues: Any) -> None:
+        """Write a minimal Issue node linked to its PullRequest, in bulk."""
+        for part in partitions(pr_issues, self.memory.partition_rows):
+            if part.empty:
+                continue
+            columns = [c for c in PR_ISSUE_COLUMNS if c in part.columns]
+            frame = part[columns].astype(object)
+            # Same projection as regular issues, so properties keep one type
+            # (e.g., dates stored as text, not as Neo4j DateTime).
+            rows = [
+                self.project(row, "Issue")
+                for row in frame.where(frame.notna(), None).to_dict("records")
+            ]
+            created_at = datetime.now().isoformat()
+            for row in rows:
+                row["pull_request_backed"] = True
+                row["created_node_at"] = created_at
+            self.logger.info(
+                f"Linking {len(rows)} PR-backed issues to pull requests..."
+            )
+            self.sink.run_batch(
+                LINK_PR_ISSUES,
+                rows,
+                key=lambda row: row["id"],
+                labels=["Issue", "PullRequest"],
+            )
+
+    def _load_issues_record(self, issue: Any) -> None:
+        """Create one Issue node and link it."""
+        data = self.transform(issue, "Issue")
+        self.logger.debug("Issue transformed: %s", data)
+
+        node = self._create_issue_node(data, issue)
+        self._link_issue_to_repository(node, issue)
+        self._link_issue_to_milestone(node, issue)
+        self._link_issue_to_users(node, issue)
+        self._link_issue_to_pull_request(node,issue)
+        if not issue.pull_request:  # PRs are counted by the PR loader
+            self.aggregates.add(
+                "issues",
+                issue.id,
+                self._login(issue.user),
+                issue.repository,
+                issue.created_at,
+            )
+
+    def _login(self, user_data: Any) -> Any:
+        """Return the login of a user given as a dict or a JSON string."""
+        if not user_data:
+            return None
+        user = loads(user_data)
+        return user.get("login") if isinstance(user, dict) else None
+
     def _link_issue_to_pull_request(self, node: Node, issue: Any) -> None:
         """create a link bettween issue and pullrquest"""
         pullrequest = issue.pull_request
@@ -194,127 +372,166 @@ class ExtractCIRO(ExtractBase):
             )
 
 
-    def _link_issue_to_labels(self, node: Node, issue: Any) -> None:
-        """Link the Issue to its associated Labels."""
-        if issue.labels:
-            labels = issue.labels
-            self.logger.debug(
-                f"Processing {len(labels)} labels for issue: {issue.title}"
-            )
-            for label in labels:
-                label_node = self.get_node("Label", id=label["id"])
-                if label_node:
-                    self.create_relationship(node, "labeled", label_node)
-                    self.logger.info(
-                        f"Labeled issue {issue.title} with {label['name']}"
-                    )
-                else:
-                    self.logger.warning(
-                        f"Label not found: {label['id']} for issue {issue.title}"
-                    )
+    def _link_labels(self, frame: Any, label: str) -> None:
+        """Link every Issue or Pull Request of a frame to its Labels in bulk."""
+        for part in partitions(frame, self.memory.partition_rows):
+            links = explode(part, "labels", "id", ["id"]).dropna()
+            rows = [
+                {"start": start, "end": end}
+                for start, end in zip(links["id"], links["labels.id"], strict=True)
+            ]
+            self.logger.info(f"Linking {len(rows)} {label} labels...")
+            self.create_relationships("labeled", (label, "id"), ("Label", "id"), rows)
 
     def __load_labels(self) -> None:
         """Create Label nodes and link them to their respective repositories."""
         self.logger.info("Loading labels...")
-        for label in self.issue_labels.itertuples(index=False):
-            data = self.transform(label)
-            node = self.create_node(data, "Label", "id")
-            self.logger.info(
-                f"Created Label {label.name} for Repository {label.repository}"
-            )
-            repository_node = self.get_node("Repository", full_name=label.repository)
-            if repository_node:
-                self.create_relationship(repository_node, "has", node)
-            else:
-                self.logger.warning(f"Repository not found for label: {label.name}")
+        self.load_records(
+            "labels",
+            self.issue_labels,
+            self._load_labels_record,
+            key="id",
+        )
+
+    def _load_labels_record(self, label: Any) -> None:
+        """Create one Label node and link it to its repository."""
+        data = self.transform(label, "Label")
+        node = self.create_node(data, "Label", "id")
+        self.logger.info(
+            f"Created Label {label.name} for Repository {label.repository}"
+        )
+        repository_node = self.get_node("Repository", full_name=label.repository)
+        if repository_node:
+            self.create_relationship(repository_node, "has", node)
+        else:
+            self.logger.warning(f"Repository not found for label: {label.name}")
 
     def __load_pull_request_commit(self) -> None:
         """Link commits to their respective Pull Requests."""
         self.logger.info("Linking commits to pull requests...")
-        for pr_commit in self.pull_request_commits.itertuples(index=False):
-            data = self.transform(pr_commit)
-            commit_node = self.get_node("Commit", sha=data["sha"])
-            pr_node = self.get_node(
-                "PullRequest", repository=data["repository"], number=data["pull_number"]
+        self.load_records(
+            "pull_request_commits",
+            self.pull_request_commits,
+            self._load_pull_request_commits_record,
+            key=["repository", "pull_number", "sha"],
+        )
+
+    def _load_pull_request_commits_record(self, pr_commit: Any) -> None:
+        """Link one commit to its Pull Request."""
+        data = self.transform(pr_commit)
+        commit_node = self.get_node("Commit", sha=data["sha"])
+        pr_node = self.get_node(
+            "PullRequest", repository=data["repository"], number=data["pull_number"]
+        )
+        if commit_node and pr_node:
+            self.create_relationship(commit_node, "committed", pr_node)
+            self.create_relationship(pr_node, "has", commit_node)
+            self.logger.info("Linked commit to pull_request")
+        else:
+            self.logger.warning(
+                "Commit or PullRequest not found for commit SHA: %s", data["sha"]
             )
-            if commit_node and pr_node:
-                self.create_relationship(commit_node, "committed", pr_node)
-                self.create_relationship(pr_node, "has", commit_node)
-                self.logger.info("Linked commit to pull_request")
-            else:
-                self.logger.warning(
-                    "Commit or PullRequest not found for commit SHA: %s", data["sha"]
-                )
 
     def __load_pull_requests(self) -> None:
         """Create Pull Request nodes and link."""
         self.logger.info("Loading pull requests...")
-        for pr in self.pull_requests.itertuples(index=False):
-            data = self.transform(pr)
-            node = self.create_node(data, "PullRequest", "id")
-            self.logger.debug(f"Created PullRequest node: {pr.title}")
-
-            repository_node = self.get_node("Repository", full_name=pr.repository)
-            if repository_node:
-                self.create_relationship(repository_node, "has", node)
-
-            if pr.labels:
-                labels = pr.labels
-                for label in labels:
-                    label_node = self.get_node("Label", id=label["id"])
-                    if label_node:
-                        self.create_relationship(node, "labeled", label_node)
-
-            if pr.milestone:
-                milestone = pr.milestone
-                milestone_node = self.get_node("Milestone", id=milestone["id"])
-                if milestone_node:
-                    self.create_relationship(node, "has", milestone_node)
-
-            if pr.merge_commit_sha:
-                commit_node = self.get_node("Commit", sha=pr.merge_commit_sha)
-                if commit_node:
-                    self.create_relationship(node, "merged", commit_node)
-
-            self.logger.info(f"Linking users to pull request: {pr.title}")
-            self._link_issue_to_users(node, pr)
+        self.load_records(
+            "pull_requests",
+            self.pull_requests,
+            self._load_pull_requests_record,
+            key="id",
+        )
+        self._link_labels(self.pull_requests, "PullRequest")
+
+    def _load_pull_requests_record(self, pr: Any) -> None:
+        """Create one Pull Request node and link it."""
+        data = self.transform(pr, "PullRequest")
+        node = self.create_node(data, "PullRequest", "id")
+        self.logger.debug(f"Created PullRequest node: {pr.title}")
+
+        repository_node = self.get_node("Repository", full_name=pr.repository)
+        if repository_node:
+            self.create_relationship(repository_node, "has", node)
+
+        if pr.milestone:
+            milestone = pr.milestone
+            milestone_node = self.get_node("Milestone", id=milestone["id"])
+            if milestone_node:
+                self.create_relationship(node, "has", milestone_node)
+
+        if pr.merge_commit_sha:
+            commit_node = self.get_node("Commit", sha=pr.merge_commit_sha)
+            if commit_node:
+                self.create_relationship(node, "merged", commit_node)
+
+        self.logger.info(f"Linking users to pull request: {pr.title}")
+        self._link_issue_to_users(node, pr)
+        self.aggregates.add(
+            "pull_requests", pr.id, self._login(pr.user), pr.repository, pr.created_at
+        )
             
-            if pr.requested_reviewers:
-                reviewers = pr.requested_reviewers
-                self.logger.debug(
-                    f"Procssing {len(reviewers)} reviewers for pull: {pr.title}"
-                )
-                for reviewer in reviewers:
-                    login = reviewer.get("login")
-                    user_node = self.get_node("Person", id=login)
-                    if user_node:
-                        self.create_relationship(
-                                node, "reviewed_by", user_node)
-                        self.logger.info(
-                            f"Pull Request {node} reviewed by : {user_node}"
-                        )
-                    else:
-                        login = reviewer["login"]
-                        reviewer["id"] = login
-                        reviewer["name"] = login
+        if pr.requested_reviewers:
+            reviewers = pr.requested_reviewers
+            self.logger.debug(
+                f"Procssing {len(reviewers)} reviewers for pull: {pr.title}"
+            )
+            for reviewer in reviewers:
+                login = reviewer.get("login")
+                user_node = self.get_node("Person", id=login)
+                if user_node:
+                    self.create_relationship(
+                            node, "reviewed_by", user_node)
+                    self.logger.info(
+                        f"Pull Request {node} reviewed by : {user_node}"
+                    )
+                else:
+                    login = reviewer["login"]
+                    reviewer["id"] = login
+                    reviewer["name"] = login
                                 
-                        user_node = self.create_node(reviewer, "Person", "id")
-                        self.create_relationship(user_node, "present_in", self.organization_node)
-                        self.create_relationship(node, "reviewed_by", user_node)
+                    user_node = self.create_node(reviewer, "Person", "id")
+                    self.create_relationship(user_node, "present_in", self.organization_node)
+                    self.create_relationship(node, "reviewed_by", user_node)
                     
-                        self.logger.info(
-                            f"Linked present_in between Pull Request and Reviewe: {login} - {node}"
-                        )   
+                    self.logger.info(
+                        f"Linked present_in between Pull Request and Reviewe: {login} - {node}"
+                    )   
+                self.aggregates.add(
+                    "reviews", pr.id, login, pr.repository, pr.created_at
+                )
     
 
 
+    def __reconcile_labels(self) -> None:
+        """Mark or delete the labels deleted on GitHub."""
+        if self.issue_labels is None:
+            return
+        labels = self.snapshot_frame("issue_labels", self.issue_labels)
+        self.reconcile(
+            "Label",
+            "id",
+            labels["id"].tolist(),
+            scope_property="repository",
+            scope=labels["repository"].unique().tolist(),
+            stream="issue_labels",
+            node_keys=lambda frame: frame["id"].tolist(),
+        )
+
+    def stages(self) -> list[tuple[str, Any]]:
+        """Load stages of the extractor, in dependency order."""
+        return [
+            ("labels", self.__load_labels),
+            ("milestones", self.__load_milestones),
+            ("pull_requests", self.__load_pull_requests),
+            ("pull_request_commits", self.__load_pull_request_commit),
+            ("issues", self.__load_issue),
+            ("reconcile_labels", self.__reconcile_labels),
+        ]
+
     def run(self) -> None:
         """Run the full extraction and persistence process."""
         self.logger.info("🔄 Starting CIRO extraction pipeline...")
-        self.fetch_data()
-        self.__load_labels()
-        self.__load_milestones()
-        self.__load_pull_requests()
-        self.__load_pull_request_commit()
-        self.__load_issue()
+        self.fetch()
+        self.run_stages()
+        self.finish_run()
         self.logger.info("✅ Extraction completed successfully!")
@@ -1,7 +1,11 @@
 from typing import Any  # noqa: I001
 from src.extract.extract_base import ExtractBase  # noqa: I001
+from src.extract.organization import OrganizationConfig  # noqa: I001
+from src.extract.scope import Scope  # noqa: I001
+from sink.sink_neo4j import SinkNeo4j  # noqa: I001
 from src.config.logging_config import LoggerFactory  # noqa: I001
-import json  # noqa: I001
+from src.extract.decoding import JSON_COLUMNS, decode_columns, explode, loads  # noqa: I001
+from src.extract.memory import map_partitions, partitions  # noqa: I001
 
 
 class ExtractCMPO(ExtractBase):
@@ -13,11 +17,31 @@ class ExtractCMPO(ExtractBase):
     repositories: Any = None
     projects: Any = None
 
-    def __init__(self) -> None:
+    stage_streams = {
+        "repositories": "repositories",
+        "repository_projects": "projects_v2",
+        "branches": "branches",
+        "commits": "commits",
+        "commit_branches": "commits",
+        "commit_parents": "commits",
+    }
+
+    def __init__(
+        self,
+        connect_source: bool = True,
+        scope: Scope | None = None,
+        organization: OrganizationConfig | None = None,
+        sink: SinkNeo4j | None = None,
+    ) -> None:
         """Initialize the extractor and define streams to load from Airbyte."""
         self.logger = LoggerFactory.get_logger(__name__)
         self.streams = ["repositories", "projects_v2", "commits", "branches"]
-        super().__init__()
+        super().__init__(
+            connect_source=connect_source,
+            scope=scope,
+            organization=organization,
+            sink=sink,
+        )
         self.logger.debug("CMPO extractor initialized with streams: %s", self.streams)
 
     def fetch_data(self) -> None:
@@ -25,53 +49,74 @@ class ExtractCMPO(ExtractBase):
         self.logger.info("Fetching CMPO data streams...")
         self.load_data()
 
-        if "repositories" in self.cache:
-            self.repositories = self.cache["repositories"].to_pandas()
+        self.repositories = self.read_snapshot("repositories")
+        if self.repositories is not None:
             self.logger.info(f"{len(self.repositories)} repositories loaded.")
 
-        if "projects_v2" in self.cache:
-            self.projects = self.cache["projects_v2"].to_pandas()
+        self.projects = self.read_frame("projects_v2")
+        if self.projects is not None:
             self.logger.info(f"{len(self.projects)} projects loaded.")
 
-        if "commits" in self.cache:
-            self.commits = self.cache["commits"].to_pandas()
+        self.commits = decode_columns(
+            self.read_frame("commits", spill_key=["sha", "branch"]),
+            JSON_COLUMNS["commits"],
+        )
+        if self.commits is not None:
             self.logger.info(f"{len(self.commits)} commits loaded.")
 
-        if "branches" in self.cache:
-            self.branches = self.cache["branches"].to_pandas()
+        self.branches = self.read_snapshot("branches")
+        if self.branches is not None:
             self.logger.info(f"{len(self.branches)} branches loaded.")
 
     def __load_repository(self) -> None:
         """Load repositories."""
         self.logger.info("Loading repositories...")
-        for repository in self.repositories.itertuples():
-            data = self.transform(repository)
-            self.logger.debug("Repository transformed: %s", data)
-            node = self.create_node(data, "Repository", "id")
-            self.create_relationship(self.organization_node, "has", node)
-            self.logger.info(f"Repository node created and linked: {data['id']}")
+        self.load_records(
+            "repositories",
+            self.repositories,
+            self._load_repositories_record,
+            key="id",
+            index=True,
+        )
+
+    def _load_repositories_record(self, repository: Any) -> None:
+        """Load one repository."""
+        data = self.transform(repository, "Repository")
+        self.logger.debug("Repository transformed: %s", data)
+        node = self.create_node(data, "Repository", "id")
+        self.create_relationship(self.organization_node, "has", node)
+        self.logger.info(f"Repository node created and linked: {data['id']}")
 
     def __load_repository_project(self) -> None:
         """Link repositories to projects."""
         self.logger.info("Linking repositories to projects...")
-        for project in self.projects.itertuples():
-            self.logger.debug("Processing project: %s", project.id)
-            repository_node = self.get_node("Repository", full_name=project.repository)
-            project_node = self.get_node("Project", id=project.id)
+        self.load_records(
+            "repository_projects",
+            self.projects,
+            self._load_repository_projects_record,
+            key="id",
+            index=True,
+        )
 
-            if repository_node and project_node:
-                self.create_relationship(project_node, "has", repository_node)
-                self.logger.info(
-                    "Linked Project: %s - %s",
-                    project.id,
-                    project.repository,
-                )
-            else:
-                self.logger.info(
-                    "Missing node for Project %s or Repository %s",
-                    project.id,
-                    project.repository,
-                )
+    def _load_repository_projects_record(self, project: Any) -> None:
+        """Link one project to its repository."""
+        self.logger.debug("Processing project: %s", project.id)
+        repository_node = self.get_node("Repository", full_name=project.repository)
+        project_node = self.get_node("Project", id=project.id)
+
+        if repository_node and project_node:
+            self.create_relationship(project_node, "has", repository_node)
+            self.logger.info(
+                "Linked Project: %s - %s",
+                project.id,
+                project.repository,
+            )
+        else:
+            self.logger.info(
+                "Missing node for Project %s or Repository %s",
+                project.id,
+                project.repository,
+            )
 
     def flatten_dict(self, d: Any, prefix: Any) -> Any:
         """Flatten a nested dictionary, prefixing keys with their parent path."""
@@ -90,157 +135,225 @@ class ExtractCMPO(ExtractBase):
         - a string (to be parsed),
         - or invalid.
         """
-        if isinstance(raw_json, dict):
-            return [raw_json]  # retorna como lista, se for um único dict
-        elif isinstance(raw_json, list):
-            return raw_json
-        elif isinstance(raw_json, str):
-            try:
-                return json.loads(raw_json.strip())
-            except json.JSONDecodeError as e:
-                print(f"[ERRO] Falha ao carregar JSON: {e}")
-                return []
-        else:
-            print(f"[ERRO] Tipo inesperado: {type(raw_json)}")
-            return []
+        value = loads(raw_json)
+        if isinstance(value, dict):
+            return [value]  # retorna como lista, se for um único dict
+        if isinstance(value, list):
+            return value
+        return []
 
     def __load_commits(self) -> None:
-        """Load commits."""
+        """Load commits, once per SHA."""
         self.logger.info("Loading commits...")
-        for commit in self.commits.itertuples(index=False):
-            data = self.transform(commit)
-            data["id"] = data["sha"]
-            self.logger.debug("Commit transformed: %s", data["id"])
+        # The commits stream repeats a commit once per branch containing it:
+        # each commit is written once, and its branches are linked in bulk
+        # by the commit_branches stage. Spilled records are sorted by SHA,
+        # so only a commit straddling two partitions is written twice.
+        self.load_records(
+            "commits",
+            map_partitions(self.commits, lambda part: part.drop_duplicates("sha")),
+            self._load_commits_record,
+            key=["sha", "branch"],
+        )
 
+    def _load_commits_record(self, commit: Any) -> None:
+        """Load one commit."""
+        data = {
+            k: self.safe_nan_to_none(v)
+            for k, v in commit._asdict().items()
+            if not k.startswith("_airbyte")
+        }
+        data["id"] = data["sha"]
+        self.logger.debug("Commit transformed: %s", data["id"])
 
-            try:
-               combined = {**data, **commit.commit}
-                
-            except Exception as e:
-                self.logger.warning(f"Invalid commit JSON for {commit.sha}: {e}")
-                continue
+        try:
+            # The git signature is stored un-nested (``author_name``,
+            # ``message``...) next to the GitHub users, which stay nested
+            # so the projection still finds ``author.login``.
+            signature = self.flatten_dict(commit.commit, "")
+        except Exception as e:
+            self.logger.warning(f"Invalid commit JSON for {commit.sha}: {e}")
+            return
 
-            node_data = {**data, **self.flatten_dict(combined, "")}
-            node = self.create_node(node_data, "Commit", "id")
+        node_data = self.project({**data, **signature}, "Commit")
+        node = self.create_node(node_data, "Commit", "id")
 
-            repository_node = self.get_node("Repository", full_name=commit.repository)
+        repository_node = self.get_node("Repository", full_name=commit.repository)
             
-            if repository_node:
-                self.create_relationship(repository_node, "has", node)
-                self.create_relationship(node, "belongs_to", repository_node)
-            else:
-                self.logger.warning(
-                    "Repository not found for commit: %s", 
-                    commit.repository
-                )
-            # Author
-            if commit.author:
-                author = commit.author
-                login = author["login"]
-                user_node = self.get_node("Person", id=login)
+        if repository_node:
+            self.create_relationship(repository_node, "has", node)
+            self.create_relationship(node, "belongs_to", repository_node)
+        else:
+            self.logger.warning(
+                "Repository not found for commit: %s", 
+                commit.repository
+            )
+        # Author
+        if commit.author:
+            author = commit.author
+            login = author["login"]
+            user_node = self.get_node("Person", id=login)
                 
-                if user_node:
-                    self.create_relationship(node, "created_by", user_node)
-                    self.logger.debug(
-                        f"Linked author {login} to commit {commit.sha}"
-                    )
-                else:
-                    self.logger.warning(f"Author not found: {login}")
-                    author["id"] = login
-                    author["name"] = login
-                    
-                    person_node = self.create_node(author, "Person", "id")
-                    self.create_relationship(person_node, "present_in", self.organization_node)
-                    self.create_relationship(node, "created_by", person_node)
-                    self.logger.info(
-                        f"Linked author {login} to commit {commit.sha}"
-                    )
-            
-            # Committer
-            if commit.committer:
-                committer = commit.committer
-                login = committer["login"]
-                user_node = self.get_node("Person", id=login)
-                if user_node:
-                    self.create_relationship(node, "commited_by", user_node)
-                    self.logger.debug(
-                        f"Linked committer {login} to commit {commit.sha}"
-                    )
-                else:
-                    self.logger.warning(f"Committer not found: {login}")
-                    committer["id "]= login
-                    committer["name"] = login
+            if user_node:
+                self.create_relationship(node, "created_by", user_node)
+                self.logger.debug(
+                    f"Linked author {login} to commit {commit.sha}"
+                )
+            else:
+                self.logger.warning(f"Author not found: {login}")
+                author["id"] = login
+                author["name"] = login
                     
-                    person_node = self.create_node(committer, "Person", "id")
-                    self.create_relationship(person_node, "present_in", self.organization_node)
-                    self.create_relationship(node, "commited_by", person_node)
-                    self.logger.info(
-                        f"Linked committer {login} to commit {commit.sha}"
-                    )
-            # Branch
-            branch_id = commit.branch + "-" + commit.repository
-            branch_node = self.get_node("Branch", id=branch_id)
-            if branch_node:
-                self.create_relationship(branch_node, "has", node)
-                self.create_relationship(node, "in", branch_node)
-                self.logger.debug(f"Linked commit {commit.sha} to branch {branch_id}")
+                person_node = self.create_node(author, "Person", "id")
+                self.create_relationship(person_node, "present_in", self.organization_node)
+                self.create_relationship(node, "created_by", person_node)
+                self.logger.info(
+                    f"Linked author {login} to commit {commit.sha}"
+                )
+            authored_at = (commit.commit.get("author") or {}).get("date")
+            self.aggregates.add(
+                "commits", data["id"], login, commit.repository, authored_at
+            )
+
+        # Committer
+        if commit.committer:
+            committer = commit.committer
+            login = committer["login"]
+            user_node = self.get_node("Person", id=login)
+            if user_node:
+                self.create_relationship(node, "commited_by", user_node)
+                self.logger.debug(
+                    f"Linked committer {login} to commit {commit.sha}"
+                )
             else:
-                self.logger.warning(f"Branch not found: {branch_id}")
-            
+                self.logger.warning(f"Committer not found: {login}")
+                committer["id "]= login
+                committer["name"] = login
+                    
+                person_node = self.create_node(committer, "Person", "id")
+                self.create_relationship(person_node, "present_in", self.organization_node)
+                self.create_relationship(node, "commited_by", person_node)
+                self.logger.info(
+                    f"Linked committer {login} to commit {commit.sha}"
+                )
+
+    def __link_commit_branches(self) -> None:
+        """Link every commit to the branches containing it, in batches."""
+        self.logger.info("Linking commits to their branches...")
+        if self.commits is None:
+            return
+
+        branch_key, commit_key = ("Branch", "id"), ("Commit", "id")
+        for part in partitions(self.commits, self.memory.partition_rows):
+            links = part[["sha", "branch", "repository"]].dropna().drop_duplicates()
+            branch_ids = links["branch"].astype(str) + "-" + links["repository"]
+            rows = [
+                {"start": branch_id, "end": sha}
+                for branch_id, sha in zip(branch_ids, links["sha"], strict=True)
+            ]
+            self.logger.info(f"Linking {len(rows)} commit-branch pairs...")
+            self.create_relationships("has", branch_key, commit_key, rows)
+            self.create_relationships(
+                "in",
+                commit_key,
+                branch_key,
+                [{"start": row["end"], "end": row["start"]} for row in rows],
+            )
 
     def __create_relation_commits(self) -> None:
-        
-        """Create parent relationships between commits."""
+        """Create parent relationships between commits in batches."""
         self.logger.info("Creating parent relationships between commits...")
-        for commit in self.commits.itertuples(index=False):
-            parents = commit.parents
-            
-            for parent in parents:
-                commit_node = self.get_node("Commit", id=commit.sha)
-                parent_node = self.get_node("Commit", id=parent["sha"])
-                if commit_node and parent_node:
-                    self.create_relationship(parent_node, "is_parent", commit_node)
-                    self.create_relationship(commit_node, "has_parent", parent_node)
-                    self.logger.debug(f"Linked {parent['sha']} -> {commit.sha}")
-                else:
-                    self.logger.info(
-                        "Missing node for parent-child relation: %s ->  %s",
-                        parent["sha"],
-                        commit.sha,
-                    )
-                
+        if self.commits is None:
+            return
+
+        commit_key = ("Commit", "id")
+        for part in partitions(self.commits, self.memory.partition_rows):
+            # The commits stream repeats a commit once per branch: dedupe pairs.
+            links = (
+                explode(part, "parents", "sha", ["sha"]).dropna().drop_duplicates()
+            )
+            rows = [
+                {"start": parent, "end": sha}
+                for sha, parent in zip(links["sha"], links["parents.sha"], strict=True)
+            ]
+            self.logger.info(f"Linking {len(rows)} parent-child commit pairs...")
+            self.create_relationships("is_parent", commit_key, commit_key, rows)
+            self.create_relationships(
+                "has_parent",
+                commit_key,
+                commit_key,
+                [{"start": row["end"], "end": row["start"]} for row in rows],
+            )
+
     def __load_branchs(self) -> None:
         """Load branches."""
         self.logger.info("Loading branches...")
-        for branch in self.branches.itertuples(index=False):
-            data = self.transform(branch)
-            data["id"] = data["name"] + "-" + data["repository"]
-            self.logger.debug("Branch transformed: %s", data["id"])
+        self.load_records(
+            "branches",
+            self.branches,
+            self._load_branches_record,
+            key=["repository", "name"],
+        )
+
+    def _load_branches_record(self, branch: Any) -> None:
+        """Load one branch."""
+        data = self.transform(branch, "Branch")
+        data["id"] = data["name"] + "-" + data["repository"]
+        self.logger.debug("Branch transformed: %s", data["id"])
 
-            node = self.create_node(data, "Branch", "id")
+        node = self.create_node(data, "Branch", "id")
 
-            if branch.repository:
-                repository_node = self.get_node(
-                    "Repository", full_name=branch.repository
+        if branch.repository:
+            repository_node = self.get_node(
+                "Repository", full_name=branch.repository
+            )
+            if repository_node:
+                self.create_relationship(repository_node, "has", node)
+                self.logger.info(
+                    f"Linked branch {data['id']} to repository {branch.repository}"
                 )
-                if repository_node:
-                    self.create_relationship(repository_node, "has", node)
-                    self.logger.info(
-                        f"Linked branch {data['id']} to repository {branch.repository}"
-                    )
-                else:
-                    self.logger.warning(
-                        f"Repository not found for branch: {branch.repository}"
-                    )
+            else:
+                self.logger.warning(
+                    f"Repository not found for branch: {branch.repository}"
+                )
+
+    def __reconcile_branches(self) -> None:
+        """Mark or delete the branches deleted on GitHub."""
+        if self.branches is None:
+            return
+        branches = self.snapshot_frame("branches", self.branches)
+        self.reconcile(
+            "Branch",
+            "id",
+            self._branch_ids(branches),
+            scope_property="repository",
+            scope=branches["repository"].unique().tolist(),
+            stream="branches",
+            node_keys=self._branch_ids,
+        )
+
+    @staticmethod
+    def _branch_ids(frame: Any) -> list[str]:
+        """Branch keys of branches records."""
+        return (frame["name"] + "-" + frame["repository"]).tolist()
+
+    def stages(self) -> list[tuple[str, Any]]:
+        """Load stages of the extractor, in dependency order."""
+        return [
+            ("repositories", self.__load_repository),
+            ("repository_projects", self.__load_repository_project),
+            ("branches", self.__load_branchs),
+            ("commits", self.__load_commits),
+            ("commit_branches", self.__link_commit_branches),
+            ("commit_parents", self.__create_relation_commits),
+            ("reconcile_branches", self.__reconcile_branches),
+        ]
 
     def run(self) -> None:
         """Run the full extraction and persistence process."""
         self.logger.info("🔄 Starting CMPO extraction...")
-        self.fetch_data()
-        self.__load_repository()
-        self.__load_repository_project()
-        self.__load_branchs()
-        self.__load_commits()
-        self.__create_relation_commits()
+        self.fetch()
+        self.run_stages()
         #self.create_config_domain("cmpo")
+        self.finish_run()
         self.logger.info("✅ CMPO extraction completed.")
@@ -1,7 +1,36 @@
 from typing import Any  # noqa: I001
 from src.extract.extract_base import ExtractBase  # noqa: I001
+from src.extract.organization import OrganizationConfig  # noqa: I001
+from src.extract.scope import Scope  # noqa: I001
+from sink.sink_neo4j import SinkNeo4j  # noqa: I001
 from src.config.logging_config import LoggerFactory  # noqa: I001
 
+# Teams and team members written before they were keyed by organization
+# (TeamMember ids were "<login>-<team_slug>"): the teams of an organization
+# get its name, and their members the new key. A legacy member whose new
+# key already exists (loaded since) is deleted instead.
+MIGRATE_TEAMS = """MATCH (:organization {id: $organization})-[:has]->(t:team)
+    WHERE t.organization IS NULL
+    SET t.organization = $name, t.updated_node_at = timestamp()
+    RETURN count(t) AS teams"""
+
+DELETE_LEGACY_MEMBERS = """MATCH (:organization {id: $organization})-[:has]->(:team)
+    -[:has]->(m:teammember)
+    WHERE m.organization IS NULL
+    WITH DISTINCT m
+    MATCH (:teammember {id: $name + '-' + m.id})
+    WITH DISTINCT m, m.id AS id
+    DETACH DELETE m
+    RETURN collect(id) AS ids"""
+
+REKEY_LEGACY_MEMBERS = """MATCH (:organization {id: $organization})-[:has]->(:team)
+    -[:has]->(m:teammember)
+    WHERE m.organization IS NULL
+    WITH DISTINCT m
+    SET m.id = $name + '-' + m.id, m.organization = $name,
+        m.updated_node_at = timestamp()
+    RETURN count(m) AS members"""
+
 
 class ExtractEO(ExtractBase):
     """Extracts and loads data related to teams, team members, and projects."""
@@ -14,74 +43,209 @@ class ExtractEO(ExtractBase):
     users: Any = None
     organization_node: Any = None
 
-    def __init__(self) -> None:
+    stage_streams = {
+        "projects": "projects_v2",
+        "teams": "teams",
+        "team_members": "team_members",
+    }
+
+    def __init__(
+        self,
+        connect_source: bool = True,
+        scope: Scope | None = None,
+        organization: OrganizationConfig | None = None,
+        sink: SinkNeo4j | None = None,
+    ) -> None:
         """Post-initialization hook."""
         self.logger = LoggerFactory.get_logger(__name__)
         self.streams = ["projects_v2", "teams", "team_members"]
-        super().__init__()
+        super().__init__(
+            connect_source=connect_source,
+            scope=scope,
+            organization=organization,
+            sink=sink,
+        )
 
     def fetch_data(self) -> None:
         """Load data from the Airbyte cache into pandas DataFrames."""  # noqa: D401
         self.logger.info("Fetching data from Airbyte cache.")
         self.load_data()
 
-        if "teams" in self.cache:
-            self.teams = self.cache["teams"].to_pandas()
+        self.teams = self.read_snapshot("teams")
+        if self.teams is not None:
             self.logger.info("✅ %d teams loaded.", len(self.teams))
 
-        if "projects_v2" in self.cache:
-            self.projects = self.cache["projects_v2"].to_pandas()
+        self.projects = self.read_frame("projects_v2")
+        if self.projects is not None:
             self.logger.info("✅ %d projects_v2 loaded.", len(self.projects))
 
-        if "team_members" in self.cache:
-            self.team_members = self.cache["team_members"].to_pandas()
+        self.team_members = self.read_snapshot("team_members")
+        if self.team_members is not None:
             self.logger.info("✅ %d team_members loaded.", len(self.team_members))
 
     def __load_project(self) -> None:
         """Create project nodes and relationships to the organization in Neo4j."""
         self.logger.info("Creating Project nodes and relationships...")
-        for project in self.projects.itertuples():
-            data = self.transform(project)
-            project_node = self.create_node(data, "Project", "id")
-            self.create_relationship(self.organization_node, "has", project_node)
+        self.load_records(
+            "projects",
+            self.projects,
+            self._load_projects_record,
+            key="id",
+            index=True,
+        )
+
+    def _load_projects_record(self, project: Any) -> None:
+        """Create one Project node and link it to the organization."""
+        data = self.transform(project, "Project")
+        project_node = self.create_node(data, "Project", "id")
+        self.create_relationship(self.organization_node, "has", project_node)
 
     def __load_team_member(self) -> None:
         """Create Person and TeamMember and links them to teams and the organization."""
         self.logger.info("Creating TeamMember and Person nodes...")
-        for member in self.team_members.itertuples():
-            data = self.transform(member)
-            data["id"] = member.login
+        self.load_records(
+            "team_members",
+            self.team_members,
+            self._load_team_members_record,
+            key=["login", "team_slug"],
+            index=True,
+        )
+
+    def _load_team_members_record(self, member: Any) -> None:
+        """Create one Person and TeamMember and link them."""
+        data = self.transform(member, "Person")
+        data["id"] = member.login
+        data["name"] = member.login
+
+        person_node = self.create_node(data, "Person", "id")
+        self.create_relationship(person_node, "present_in", self.organization_node)
+
+        if member.team_slug:
+            # Team slugs are only unique within an organization.
+            organization = self._organization_of(member)
+            data["id"] = self._member_id(organization, member.login, member.team_slug)
             data["name"] = member.login
-
-            person_node = self.create_node(data, "Person", "id")
-            self.create_relationship(person_node, "present_in", self.organization_node)
-
-            if member.team_slug:
-                data["id"] = f"{member.login}-{member.team_slug}"
-                data["name"] = member.login
-
-                team_member_node = self.create_node(data, "TeamMember", "id")
-                team_node = self.sink.get_node("Team", slug=member.team_slug)
-
-                self.create_relationship(team_member_node, "done_for", team_node)
-                self.create_relationship(team_node, "has", team_member_node)
-                self.create_relationship(team_member_node, "is", person_node)
+            data["organization"] = organization
+
+            team_member_node = self.create_node(data, "TeamMember", "id")
+            team_node = self.sink.get_node(
+                "Team", organization=organization, slug=member.team_slug
+            )
+
+            self.create_relationship(team_member_node, "done_for", team_node)
+            self.create_relationship(team_node, "has", team_member_node)
+            self.create_relationship(team_member_node, "is", person_node)
+
+    def __migrate_team_keys(self) -> None:
+        """Key the teams and team members of older runs by organization."""
+        parameters = {
+            "organization": self.organization.id,
+            "name": self.organization.name,
+        }
+        teams = self.sink.run(MIGRATE_TEAMS, **parameters)
+        deleted = self.sink.run(DELETE_LEGACY_MEMBERS, **parameters)
+        deleted_ids = deleted[0]["ids"] if deleted else []
+        self.sink.keys.discard("TeamMember", "id", deleted_ids)
+        members = self.sink.run(REKEY_LEGACY_MEMBERS, **parameters)
+        team_count = teams[0]["teams"] if teams else 0
+        member_count = members[0]["members"] if members else 0
+        if team_count or member_count or deleted_ids:
+            self.logger.info(
+                "Keyed legacy teams by organization: %d teams, %d members "
+                "re-keyed, %d duplicate members deleted.",
+                team_count,
+                member_count,
+                len(deleted_ids),
+            )
 
     def __load_team(self) -> None:
         """Create Team nodes and links them to the organization."""
         self.logger.info("Creating Team nodes and relationships...")
-        for team in self.teams.itertuples():
-            data = self.transform(team)
-            team_node = self.create_node(data, "Team", "id")
-            self.logger.info("🔄 Creating Team... %s", team.name)
-            self.create_relationship(self.organization_node, "has", team_node)
+        self.load_records(
+            "teams",
+            self.teams,
+            self._load_teams_record,
+            key="id",
+            index=True,
+        )
+
+    def _load_teams_record(self, team: Any) -> None:
+        """Create one Team node and link it to the organization."""
+        data = self.transform(team, "Team")
+        data["organization"] = self._organization_of(team)
+        team_node = self.create_node(data, "Team", "id")
+        self.logger.info("🔄 Creating Team... %s", team.name)
+        self.create_relationship(self.organization_node, "has", team_node)
+
+    def __reconcile_teams(self) -> None:
+        """Mark or delete the teams and team members removed on GitHub."""
+        if self.teams is not None:
+            teams = self.snapshot_frame("teams", self.teams)
+            self.reconcile(
+                "Team",
+                "id",
+                teams["id"].tolist(),
+                *self._organizations(teams),
+                stream="teams",
+                node_keys=lambda frame: frame["id"].tolist(),
+            )
+        if self.team_members is not None:
+            members = self.snapshot_frame("team_members", self.team_members)
+            self.reconcile(
+                "TeamMember",
+                "id",
+                self._member_ids(members),
+                *self._organizations(members),
+                stream="team_members",
+                node_keys=self._member_ids,
+            )
+
+    def _organization_of(self, record: Any) -> str:
+        """Organization of a teams or team_members record."""
+        organization = self.safe_nan_to_none(getattr(record, "organization", None))
+        return organization or self.organization.name
+
+    @staticmethod
+    def _member_id(organization: str, login: str, team_slug: str) -> str:
+        """Key of the TeamMember of a login in a team of an organization."""
+        return f"{organization}-{login}-{team_slug}"
+
+    def _member_ids(self, frame: Any) -> list[str]:
+        """TeamMember keys of team_members records (those with a team)."""
+        members = frame[frame["team_slug"].notna()]
+        if "organization" in members.columns:
+            organizations = members["organization"].fillna(self.organization.name)
+        else:
+            organizations = [self.organization.name] * len(members)
+        return [
+            self._member_id(organization, login, team_slug)
+            for organization, login, team_slug in zip(
+                organizations, members["login"], members["team_slug"], strict=True
+            )
+        ]
+
+    @staticmethod
+    def _organizations(frame: Any) -> tuple[str | None, Any]:
+        """Scope of a snapshot: the organizations it covers, when known."""
+        if "organization" not in frame.columns:
+            return None, None
+        return "organization", frame["organization"].dropna().unique().tolist()
+
+    def stages(self) -> list[tuple[str, Any]]:
+        """Load stages of the extractor, in dependency order."""
+        return [
+            ("projects", self.__load_project),
+            ("migrate_team_keys", self.__migrate_team_keys),
+            ("teams", self.__load_team),
+            ("team_members", self.__load_team_member),
+            ("reconcile_teams", self.__reconcile_teams),
+            ("config", lambda: self.create_config_domain("eo")),
+        ]
 
     def run(self) -> None:
         """Orchestrate the full extraction and loading process."""
         self.logger.info("🔄 Starting extraction for Teams, Projects, and Members...")
-        self.fetch_data()
-        self.__load_project()
-        self.__load_team()
-        self.__load_team_member()
-        self.create_config_domain("eo")
+        self.fetch()
+        self.run_stages()
+        self.finish_run()
         self.logger.info("✅ Extraction completed successfully!")
@@ -0,0 +1,351 @@
+import math  # noqa: I001
+import os  # noqa: I001
+import shutil  # noqa: I001
+import threading  # noqa: I001
+from collections.abc import Callable, Iterable, Iterator  # noqa: I001
+from contextlib import contextmanager  # noqa: I001
+from typing import Any  # noqa: I001
+
+import orjson  # noqa: I001
+import psutil  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+from src.extract.decoding import loads  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("extractor")
+
+MB = 1024 * 1024
+
+
+def rss() -> int:
+    """Resident set size of the process, in bytes."""
+    return psutil.Process().memory_info().rss
+
+
+def arrow_schema(table: Any) -> tuple[Any, tuple[str, ...]]:
+    """Arrow schema of a cached stream table, and its JSON columns.
+
+    The schema comes from the SQL column types rather than from the first
+    records, so every spilled chunk gets the same one (a chunk where an
+    integer column is all null would otherwise look like text). Nested
+    (JSON) columns are stored as JSON text.
+
+    Args:
+    ----
+        table (Table): SQLAlchemy table of the stream in the cache.
+
+    Returns:
+    -------
+        tuple: The Arrow schema and the names of the JSON columns.
+
+    """
+    import pyarrow as pa
+    from sqlalchemy import types
+
+    fields = []
+    json_columns = []
+    for column in table.columns:
+        kind = column.type
+        if isinstance(kind, types.Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(kind, types.Integer):
+            arrow_type = pa.int64()
+        elif isinstance(kind, types.Numeric):
+            arrow_type = pa.float64()
+        elif isinstance(kind, types.DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC" if kind.timezone else None)
+        else:
+            arrow_type = pa.string()
+            if not isinstance(kind, types.String):
+                json_columns.append(column.name)
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields), tuple(json_columns)
+
+
+def _dumps(value: Any) -> str | None:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return orjson.dumps(
+        value, default=str, option=orjson.OPT_SERIALIZE_NUMPY
+    ).decode("utf-8")
+
+
+class SpilledFrame:
+    """Stream records spilled to a Parquet file, read back in partitions.
+
+    Stands in for a DataFrame where the loaders only iterate: records come
+    back one partition (a DataFrame) at a time, in file order, with their
+    JSON columns decoded. Per-partition transformations (decoding, row
+    filters) are chained with ``map_partitions`` and applied on read.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rows: int,
+        json_columns: tuple[str, ...] = (),
+        order: tuple[str, ...] = (),
+        partition_rows: int = 50_000,
+        transforms: tuple[Callable[[Any], Any], ...] = (),
+    ) -> None:
+        """Wrap a spilled Parquet file.
+
+        Args:
+        ----
+            path (str): Parquet file.
+            rows (int): Records in the file.
+            json_columns (tuple): Columns stored as JSON text.
+            order (tuple): Columns the records are sorted by.
+            partition_rows (int): Records per partition read back.
+            transforms (tuple): Functions applied to every partition.
+
+        """
+        self.path = path
+        self.rows = rows
+        self.json_columns = json_columns
+        self.order = order
+        self.partition_rows = partition_rows
+        self.transforms = transforms
+        self._length: int | None = None if transforms else rows
+
+    @property
+    def columns(self) -> list[str]:
+        """Column names of the records."""
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(self.path).names
+
+    @property
+    def empty(self) -> bool:
+        """Whether no record is left after the transformations."""
+        return len(self) == 0
+
+    def __len__(self) -> int:
+        """Count the records left after the transformations (one pass if needed)."""
+        if self._length is None:
+            self._length = sum(len(part) for part in self.partitions())
+        return self._length
+
+    def map_partitions(self, function: Callable[[Any], Any]) -> "SpilledFrame":
+        """Return the same records with ``function`` applied per partition."""
+        return SpilledFrame(
+            self.path,
+            self.rows,
+            self.json_columns,
+            self.order,
+            self.partition_rows,
+            (*self.transforms, function),
+        )
+
+    def partitions(self) -> Iterator[Any]:
+        """Yield the records one DataFrame partition at a time."""
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(self.path)
+        for batch in parquet.iter_batches(batch_size=self.partition_rows):
+            part = batch.to_pandas()
+            for column in self.json_columns:
+                if column in part.columns:
+                    part[column] = [loads(v) for v in part[column]]
+            for transform in self.transforms:
+                part = transform(part)
+            yield part
+
+
+def map_partitions(frame: Any, function: Callable[[Any], Any]) -> Any:
+    """Apply a per-partition function to a DataFrame or a SpilledFrame."""
+    if frame is None:
+        return None
+    if isinstance(frame, SpilledFrame):
+        return frame.map_partitions(function)
+    return function(frame)
+
+
+def partitions(frame: Any, rows: int = 50_000) -> Iterator[Any]:
+    """Yield a DataFrame or a SpilledFrame in partitions of ``rows`` records.
+
+    Intermediate tables (exploded labels, parents...) are built one
+    partition at a time, so their size is bounded whatever the stream size.
+    """
+    if frame is None:
+        return
+    if isinstance(frame, SpilledFrame):
+        yield from frame.partitions()
+        return
+    for start in range(0, len(frame), rows):
+        yield frame.iloc[start : start + rows]
+
+
+class MemoryBudget:
+    """Memory budget of an extractor run.
+
+    Large streams are read from the cache in chunks. As long as the
+    process stays under the budget the chunks are concatenated into a
+    DataFrame; once it would exceed it, the chunks read so far and all
+    the following ones are written to a Parquet file instead, and the
+    stream is loaded from a ``SpilledFrame``. The peak RSS of every stage
+    is measured and reported.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit_mb: int | None = None,
+        spill_dir: str | None = None,
+        partition_rows: int | None = None,
+    ) -> None:
+        """Initialize the budget.
+
+        Args:
+        ----
+            name (str): Name of the run (spill files subdirectory).
+            limit_mb (int): Budget in MB; 0 means unlimited (defaults to
+                ``MEMORY_BUDGET_MB`` or 0).
+            spill_dir (str): Root of the spill files (defaults to
+                ``SPILL_DIR`` or ``STATE_DIR/spill``).
+            partition_rows (int): Records per chunk and partition
+                (defaults to ``SPILL_PARTITION_ROWS`` or 50000).
+
+        """
+        if limit_mb is None:
+            limit_mb = int(os.getenv("MEMORY_BUDGET_MB", "0"))
+        self.limit = limit_mb * MB
+        root = spill_dir or os.getenv("SPILL_DIR") or os.path.join(
+            os.getenv("STATE_DIR", "state"), "spill"
+        )
+        self.spill_dir = os.path.join(root, name)
+        self.partition_rows = partition_rows or int(
+            os.getenv("SPILL_PARTITION_ROWS", "50000")
+        )
+        self.spilled: dict[str, SpilledFrame] = {}
+        self.stage_peaks: dict[str, tuple[int, int]] = {}
+
+    @property
+    def limited(self) -> bool:
+        """Whether a budget is set."""
+        return self.limit > 0
+
+    def read(
+        self,
+        stream: str,
+        chunks: Iterable[Any],
+        schema: Any,
+        json_columns: tuple[str, ...],
+        order: tuple[str, ...] = (),
+    ) -> Any:
+        """Collect the chunks of a stream in memory, or spill them to disk.
+
+        Args:
+        ----
+            stream (str): Stream name.
+            chunks (Iterable[DataFrame]): Records of the stream, in order.
+            schema (Schema): Arrow schema of the stream (see arrow_schema).
+            json_columns (tuple): Nested columns stored as JSON text.
+            order (tuple): Columns the chunks are sorted by.
+
+        Returns:
+        -------
+            DataFrame | SpilledFrame: The records, or None when empty.
+
+        """
+        import pandas as pd
+
+        held: list[Any] = []
+        writer = None
+        path = os.path.join(self.spill_dir, f"{stream}.parquet")
+        rows = 0
+        try:
+            for chunk in chunks:
+                rows += len(chunk)
+                if writer is None:
+                    held.append(chunk)
+                    if rss() <= self.limit:
+                        continue
+                    logger.warning(
+                        f"{stream}: RSS {rss() // MB} MB over the "
+                        f"{self.limit // MB} MB budget after {rows} records. "
+                        f"Spilling to {path}."
+                    )
+                    writer = self._open_writer(path, schema)
+                    pending, held = held, []
+                else:
+                    pending = [chunk]
+                for part in pending:
+                    writer.write_table(self._to_arrow(part, schema, json_columns))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            return pd.concat(held, ignore_index=True) if held else None
+        spilled = SpilledFrame(
+            path, rows, json_columns, tuple(order), self.partition_rows
+        )
+        self.spilled[stream] = spilled
+        logger.info(
+            f"{stream}: {rows} records spilled "
+            f"({os.path.getsize(path) // MB} MB on disk)."
+        )
+        return spilled
+
+    def _open_writer(self, path: str, schema: Any) -> Any:
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.spill_dir, exist_ok=True)
+        return pq.ParquetWriter(path, schema, compression="zstd")
+
+    @staticmethod
+    def _to_arrow(chunk: Any, schema: Any, json_columns: tuple[str, ...]) -> Any:
+        import pyarrow as pa
+
+        chunk = chunk.copy(deep=False)
+        for column in json_columns:
+            if column in chunk.columns:
+                chunk[column] = [_dumps(v) for v in chunk[column]]
+        return pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Record the peak RSS of a stage, sampled in the background."""
+        start = peak = rss()
+        done = threading.Event()
+
+        def sample() -> None:
+            nonlocal peak
+            while not done.wait(0.1):
+                peak = max(peak, rss())
+
+        sampler = threading.Thread(target=sample, name=f"rss-{stage}", daemon=True)
+        sampler.start()
+        try:
+            yield
+        finally:
+            done.set()
+            sampler.join()
+            peak = max(peak, rss())
+            self.stage_peaks[stage] = (start, peak)
+            over = " (over budget)" if self.limited and peak > self.limit else ""
+            logger.info(
+                f"Stage '{stage}': peak RSS {peak // MB} MB "
+                f"(+{(peak - start) // MB} MB){over}."
+            )
+
+    def report(self) -> None:
+        """Log the peak RSS of every stage and the spilled streams."""
+        if not self.stage_peaks:
+            return
+        budget = f"{self.limit // MB} MB" if self.limited else "unlimited"
+        lines = [f"Peak RSS per stage (budget {budget}):"]
+        for stage, (start, peak) in self.stage_peaks.items():
+            lines.append(
+                f"  {stage:<24} {peak // MB:>7} MB (+{(peak - start) // MB} MB)"
+            )
+        for stream, spilled in self.spilled.items():
+            lines.append(f"  spilled {stream}: {spilled.rows} records")
+        logger.info("\n".join(lines))
+
+    def release(self) -> None:
+        """Delete the spill files of the run."""
+        self.spilled.clear()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
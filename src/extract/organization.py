@@ -0,0 +1,81 @@
+import os  # noqa: I001
+import re  # noqa: I001
+from dataclasses import dataclass, field  # noqa: I001
+from typing import Any  # noqa: I001
+
+
+@dataclass(frozen=True)
+class OrganizationConfig:
+    """GitHub organization an extractor runs for.
+
+    Single-organization runs build it from the environment
+    (``ORGANIZATION``, ``ORGANIZATION_ID``, ``GITHUB_TOKEN``,
+    ``REPOSITORIES``); the multi-organization runner reads one per entry
+    of its config file.
+    """
+
+    name: str
+    id: str
+    token: str = field(default="", repr=False)
+    repositories: tuple[str, ...] = ()
+
+    @classmethod
+    def from_env(cls) -> "OrganizationConfig":
+        """Build the organization from the environment variables."""
+        repositories = os.getenv("REPOSITORIES", "")
+        return cls(
+            name=os.getenv("ORGANIZATION", ""),
+            id=os.getenv("ORGANIZATION_ID", ""),
+            token=os.getenv("GITHUB_TOKEN", ""),
+            repositories=(repositories,) if repositories else (),
+        )
+
+    @property
+    def slug(self) -> str:
+        """File and schema friendly name of the organization."""
+        return re.sub(r"[^a-z0-9_]+", "_", (self.id or self.name).lower()) or "default"
+
+
+def load_organizations(path: str) -> list[OrganizationConfig]:
+    """Read the organizations of a multi-organization config file.
+
+    The YAML file lists the organizations with their GitHub token (or the
+    environment variable holding it) and repositories::
+
+        organizations:
+          - name: acme
+            id: "1234"
+            token_env: GITHUB_TOKEN_ACME
+            repositories: [acme/api, acme/web]
+
+    Args:
+    ----
+        path (str): Location of the YAML file.
+
+    Returns:
+    -------
+        list: One OrganizationConfig per entry.
+
+    """
+    import yaml
+
+    with open(path, encoding="utf-8") as f:
+        document: dict[str, Any] = yaml.safe_load(f) or {}
+
+    organizations = []
+    for entry in document.get("organizations", []):
+        token = entry.get("token") or os.getenv(entry.get("token_env", ""), "")
+        if not entry.get("name") or not entry.get("id"):
+            raise ValueError(f"Organization without name or id in {path}: {entry}")
+        repositories = entry.get("repositories") or []
+        if isinstance(repositories, str):
+            repositories = repositories.replace(",", " ").split()
+        organizations.append(
+            OrganizationConfig(
+                name=str(entry["name"]),
+                id=str(entry["id"]),
+                token=token,
+                repositories=tuple(repositories),
+            )
+        )
+    return organizations
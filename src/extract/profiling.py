@@ -0,0 +1,227 @@
+import cProfile  # noqa: I001
+import os  # noqa: I001
+import re  # noqa: I001
+import sys  # noqa: I001
+import threading  # noqa: I001
+import tracemalloc  # noqa: I001
+from collections import Counter  # noqa: I001
+from collections.abc import Iterator  # noqa: I001
+from contextlib import contextmanager  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("extractor")
+
+PROFILE_OFF = "off"
+PROFILE_SAMPLE = "sample"
+PROFILE_CPROFILE = "cprofile"
+
+# Allocation sites written per stage.
+TOP_ALLOCATIONS = 30
+
+# One stage is profiled at a time per process: tracemalloc is global and
+# only one cProfile profiler may be active. Stages running concurrently
+# with a profiled one (windows, organizations) are not profiled.
+_active = threading.Lock()
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "stage"
+
+
+class StackSampler:
+    """Samples the Python stacks of every thread at a fixed interval.
+
+    The overhead only depends on the interval (the profiled code is not
+    instrumented), so it can stay on for production-sized runs. Stacks are
+    counted in the collapsed format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize the sampler.
+
+        Args:
+        ----
+            interval (float): Seconds between two samples.
+
+        """
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._done.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                calls = []
+                while frame is not None:
+                    code = frame.f_code
+                    module = os.path.basename(code.co_filename)
+                    calls.append(f"{code.co_name} ({module}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                calls.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(calls))] += 1
+            self.samples += 1
+
+    def write(self, path: str) -> None:
+        """Write the counted stacks in collapsed format."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class StageProfiler:
+    """Opt-in CPU and allocation profiling of the extractor stages.
+
+    With ``PROFILE`` set, every profiled stage (``fetch_data``, the load
+    stages and the sink flushes after them) writes to ``PROFILE_DIR``:
+
+    - ``<run>.<stage>.collapsed``: sampled stacks of every thread, for
+      flamegraphs;
+    - ``<run>.<stage>.pstats``: deterministic profile of the stage thread
+      (``cprofile`` mode only, noticeably slower);
+    - ``<run>.<stage>.alloc.txt``: peak traced memory and the top
+      allocation sites still alive at the end of the stage (tracemalloc).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        mode: str | None = None,
+        directory: str | None = None,
+        interval_ms: float | None = None,
+        alloc_frames: int | None = None,
+    ) -> None:
+        """Initialize the profiler of a run.
+
+        Args:
+        ----
+            name (str): Name of the run (prefix of the profile files).
+            mode (str): ``off``, ``sample`` or ``cprofile`` (defaults to
+                ``PROFILE`` or ``off``).
+            directory (str): Output directory (defaults to ``PROFILE_DIR``
+                or ``LOG_DIR/profiles``).
+            interval_ms (float): Sampling interval (defaults to
+                ``PROFILE_INTERVAL_MS`` or 10).
+            alloc_frames (int): Frames kept per traced allocation; 0
+                disables tracemalloc (defaults to ``PROFILE_ALLOC_FRAMES``
+                or 1).
+
+        """
+        mode = (mode or os.getenv("PROFILE", PROFILE_OFF)).strip().lower()
+        if mode not in (PROFILE_OFF, PROFILE_SAMPLE, PROFILE_CPROFILE):
+            raise ValueError(f"Unknown PROFILE: {mode}")
+        self.mode = mode
+        self.name = _safe_name(name)
+        self.directory = directory or os.getenv("PROFILE_DIR") or os.path.join(
+            os.getenv("LOG_DIR", "logs"), "profiles"
+        )
+        if interval_ms is None:
+            interval_ms = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+        self.interval = interval_ms / 1000
+        if alloc_frames is None:
+            alloc_frames = int(os.getenv("PROFILE_ALLOC_FRAMES", "1"))
+        self.alloc_frames = alloc_frames
+
+    @property
+    def enabled(self) -> bool:
+        """Whether profiling is on."""
+        return self.mode != PROFILE_OFF
+
+    @contextmanager
+    def profile(self, stage: str) -> Iterator[None]:
+        """Profile the code run in the block as one stage."""
+        if not self.enabled:
+            yield
+            return
+        if not _active.acquire(blocking=False):
+            logger.debug(f"Stage '{stage}' not profiled: another stage is.")
+            yield
+            return
+
+        sampler = StackSampler(self.interval)
+        profiler = cProfile.Profile() if self.mode == PROFILE_CPROFILE else None
+        trace = self.alloc_frames > 0 and not tracemalloc.is_tracing()
+        try:
+            if trace:
+                tracemalloc.start(self.alloc_frames)
+            sampler.start()
+            if profiler is not None:
+                profiler.enable()
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            sampler.stop()
+            try:
+                self._write(stage, sampler, profiler, trace)
+            except Exception as e:  # A profile is a diagnostic: never fail the run
+                logger.warning(f"Could not write the profile of '{stage}': {e}")
+            finally:
+                if trace:
+                    tracemalloc.stop()
+                _active.release()
+
+    def _write(
+        self,
+        stage: str,
+        sampler: StackSampler,
+        profiler: cProfile.Profile | None,
+        trace: bool,
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = os.path.join(self.directory, f"{self.name}.{_safe_name(stage)}")
+        sampler.write(f"{prefix}.collapsed")
+        written = [f"{prefix}.collapsed ({sampler.samples} samples)"]
+        if profiler is not None:
+            profiler.dump_stats(f"{prefix}.pstats")
+            written.append(f"{prefix}.pstats")
+        if trace:
+            self._write_allocations(f"{prefix}.alloc.txt", stage)
+            written.append(f"{prefix}.alloc.txt")
+        logger.info(f"Profile of stage '{stage}': {', '.join(written)}.")
+
+    @staticmethod
+    def _write_allocations(path: str, stage: str) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            )
+        )
+        statistics = snapshot.statistics("lineno")
+        lines = [
+            f"Stage {stage}: traced memory {current / 2**20:.1f} MB at the end, "
+            f"peak {peak / 2**20:.1f} MB.",
+            f"Top {TOP_ALLOCATIONS} allocation sites still alive:",
+        ]
+        for stat in statistics[:TOP_ALLOCATIONS]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"{stat.size / 2**20:>10.2f} MB {stat.count:>10} blocks  "
+                f"{frame.filename}:{frame.lineno}"
+            )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
@@ -0,0 +1,297 @@
+import json  # noqa: I001
+import os  # noqa: I001
+from dataclasses import dataclass, field  # noqa: I001
+from fnmatch import fnmatchcase  # noqa: I001
+from typing import Any  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("extractor")
+
+PROJECTION_FULL = "full"
+PROJECTION_PROJECTED = "projected"
+
+LIST_MODES = ("json", "str", "keep", "drop")
+
+# URL fields and GraphQL ids that GitHub attaches to every nested object
+# (users, owners, repositories) and that nothing in the graph queries.
+COMMON_EXCLUDE: tuple[str, ...] = (
+    "*_url",
+    "_links.*",
+    "*._links.*",
+    "*.url",
+    "node_id",
+    "*.node_id",
+    "*.gravatar_id",
+)
+COMMON_KEEP: tuple[str, ...] = ("id", "html_url")
+
+
+@dataclass(frozen=True)
+class LabelProjection:
+    """Declarative projection of the properties stored on a node label.
+
+    Fields are matched against the flattened (dotted) property names with
+    shell-style patterns. A property is stored when it matches ``include``
+    and does not match ``exclude``; properties matching ``keep`` are always
+    stored. ``rename`` maps a flattened name to the stored name.
+    """
+
+    include: tuple[str, ...] = ("*",)
+    exclude: tuple[str, ...] = COMMON_EXCLUDE
+    keep: tuple[str, ...] = COMMON_KEEP
+    rename: dict[str, str] = field(default_factory=dict)
+    max_string_length: int | None = None
+    list_mode: str = "json"  # json | str | keep | drop
+
+
+DEFAULT_PROJECTION = LabelProjection()
+
+PROJECTIONS: dict[str, LabelProjection] = {
+    "Repository": LabelProjection(
+        exclude=(*COMMON_EXCLUDE, "owner.*", "permissions.*", "license.*"),
+        keep=(*COMMON_KEEP, "owner.login", "license.spdx_id"),
+    ),
+    "Commit": LabelProjection(
+        # ``commit.*`` is stored again, un-nested, by the CMPO loader.
+        exclude=(*COMMON_EXCLUDE, "commit.*", "author.*", "committer.*", "files"),
+        keep=(*COMMON_KEEP, "author.login", "committer.login"),
+        max_string_length=4096,
+    ),
+    "Issue": LabelProjection(
+        exclude=(
+            *COMMON_EXCLUDE,
+            "user.*",
+            "assignee.*",
+            "milestone.*",
+            "closed_by.*",
+            "reactions.*",
+            "pull_request.*",
+        ),
+        keep=(
+            *COMMON_KEEP,
+            "user.login",
+            "assignee.login",
+            "milestone.id",
+            "milestone.title",
+            "closed_by.login",
+            "reactions.total_count",
+            "pull_request.url",
+        ),
+        max_string_length=4096,
+    ),
+    "PullRequest": LabelProjection(
+        exclude=(
+            *COMMON_EXCLUDE,
+            "user.*",
+            "assignee.*",
+            "milestone.*",
+            "head.*",
+            "base.*",
+            "auto_merge.*",
+        ),
+        keep=(
+            *COMMON_KEEP,
+            "url",
+            "user.login",
+            "assignee.login",
+            "milestone.id",
+            "milestone.title",
+            "head.ref",
+            "head.sha",
+            "base.ref",
+            "base.sha",
+        ),
+        max_string_length=4096,
+    ),
+    "Milestone": LabelProjection(
+        exclude=(*COMMON_EXCLUDE, "creator.*"),
+        keep=(*COMMON_KEEP, "creator.login"),
+    ),
+    "Branch": LabelProjection(
+        exclude=(*COMMON_EXCLUDE, "commit.*", "protection.*"),
+        keep=(*COMMON_KEEP, "commit.sha", "protection.enabled"),
+    ),
+    "Team": LabelProjection(exclude=(*COMMON_EXCLUDE, "parent.*")),
+    "Project": LabelProjection(
+        exclude=(*COMMON_EXCLUDE, "creator.*", "owner.*"),
+        keep=(*COMMON_KEEP, "creator.login"),
+    ),
+}
+
+
+@dataclass
+class ProjectionStats:
+    """Approximate payload sizes before and after projection for one label."""
+
+    records: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    dropped_fields: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes removed from the payload by the projection."""
+        return self.bytes_before - self.bytes_after
+
+
+class Projector:
+    """Apply per-label projections to transformed records.
+
+    In ``full`` mode the records are cleaned the way ``ExtractBase.data_clean``
+    always did, so every flattened property is stored.
+    """
+
+    def __init__(
+        self,
+        mode: str = PROJECTION_PROJECTED,
+        projections: dict[str, LabelProjection] | None = None,
+    ) -> None:
+        """Initialize the projector.
+
+        Args:
+        ----
+            mode (str): ``projected`` or ``full``.
+            projections (dict): label to projection mapping.
+
+        """
+        if mode not in (PROJECTION_PROJECTED, PROJECTION_FULL):
+            raise ValueError(f"Unknown projection mode: {mode}")
+        self.mode = mode
+        self.projections = PROJECTIONS if projections is None else projections
+        self.stats: dict[str, ProjectionStats] = {}
+        # (label, flattened name) -> stored name, or None when dropped
+        self._decisions: dict[tuple[str, str], str | None] = {}
+
+    @classmethod
+    def from_env(cls) -> "Projector":
+        """Build a projector from the ``NODE_PROJECTION`` environment variable."""
+        mode = os.getenv("NODE_PROJECTION", PROJECTION_PROJECTED).strip().lower()
+        return cls(mode=mode)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether records are projected rather than stored in full."""
+        return self.mode == PROJECTION_PROJECTED
+
+    def projection_for(self, label: str) -> LabelProjection:
+        """Return the projection configured for a label."""
+        return self.projections.get(label, DEFAULT_PROJECTION)
+
+    def project(self, label: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Flatten a record and apply the label projection.
+
+        Args:
+        ----
+            label (str): Node label (e.g., "Issue").
+            data (dict): Record with nested dicts and lists.
+
+        Returns:
+        -------
+            dict: Flat dictionary with the projected properties.
+
+        """
+        projection = self.projection_for(label)
+        stats = self.stats.setdefault(label, ProjectionStats())
+        stats.records += 1
+
+        clean: dict[str, Any] = {}
+        for name, value in self._flatten(data, ""):
+            size = len(name) + self._size(value)
+            stats.bytes_before += size
+
+            target = self._decide(label, projection, name)
+            if target is None:
+                stats.dropped_fields += 1
+                continue
+
+            value = self._convert(value, projection)
+            if value is _DROP:
+                stats.dropped_fields += 1
+                continue
+
+            clean[target] = value
+            stats.bytes_after += len(target) + self._size(value)
+        return clean
+
+    def report(self) -> dict[str, ProjectionStats]:
+        """Return the accumulated statistics per label."""
+        return dict(self.stats)
+
+    def _flatten(self, data: dict[str, Any], prefix: str) -> Any:
+        for k, v in data.items():
+            name = f"{prefix}{k}"
+            if isinstance(v, dict):
+                yield from self._flatten(v, name + ".")
+            else:
+                yield name, v
+
+    def _decide(
+        self, label: str, projection: LabelProjection, name: str
+    ) -> str | None:
+        cache_key = (label, name)
+        if cache_key in self._decisions:
+            return self._decisions[cache_key]
+
+        kept = any(fnmatchcase(name, p) for p in projection.keep) or (
+            any(fnmatchcase(name, p) for p in projection.include)
+            and not any(fnmatchcase(name, p) for p in projection.exclude)
+        )
+        target = projection.rename.get(name, name) if kept else None
+        self._decisions[cache_key] = target
+        return target
+
+    def _convert(self, value: Any, projection: LabelProjection) -> Any:
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        if isinstance(value, str):
+            limit = projection.max_string_length
+            return value[:limit] if limit is not None else value
+        if isinstance(value, (list, tuple)):
+            return self._convert_list(list(value), projection)
+        return self._convert(str(value), projection)
+
+    def _convert_list(self, value: list[Any], projection: LabelProjection) -> Any:
+        mode = projection.list_mode
+        if mode == "drop":
+            return _DROP
+        if mode == "str":
+            return self._convert(str(value), projection)
+        if mode == "keep" and self._is_homogeneous_primitive(value):
+            return value
+        return self._convert(json.dumps(value, default=str), projection)
+
+    @staticmethod
+    def _is_homogeneous_primitive(value: list[Any]) -> bool:
+        types = {type(item) for item in value}
+        return len(types) <= 1 and types <= {str, int, float, bool}
+
+    @staticmethod
+    def _size(value: Any) -> int:
+        if value is None:
+            return 0
+        if isinstance(value, str):
+            return len(value)
+        return len(str(value))
+
+
+_DROP = object()
+
+
+def log_projection_report(projector: Projector, name: str) -> None:
+    """Log the bytes saved per label by a projector."""
+    if not projector.enabled:
+        logger.info(f"[{name}] Node projection disabled (full-fidelity mode).")
+        return
+    for label, stats in sorted(projector.report().items()):
+        saved_pct = (
+            100.0 * stats.bytes_saved / stats.bytes_before if stats.bytes_before else 0
+        )
+        logger.info(
+            f"[{name}] Projection {label}: {stats.records} records, "
+            f"{stats.bytes_before / 1024:.1f} KiB -> "
+            f"{stats.bytes_after / 1024:.1f} KiB "
+            f"({stats.bytes_saved / 1024:.1f} KiB saved, {saved_pct:.1f}%, "
+            f"{stats.dropped_fields} fields dropped)"
+        )
@@ -0,0 +1,226 @@
+import os  # noqa: I001
+from collections.abc import Iterable, Iterator  # noqa: I001
+from datetime import datetime  # noqa: I001
+from typing import Any  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("extractor")
+
+RECONCILE_OFF = "off"
+RECONCILE_MARK = "mark"
+RECONCILE_DELETE = "delete"
+
+# Changes found by ``Reconciler.reconcile``.
+STALE = "stale"
+RESTORED = "restored"
+
+# Stored keys of a label, a page at a time (keyset pagination on the key).
+STORED_KEYS = """MATCH (n:`%(label)s`)
+    WHERE n.`%(key)s` > $after
+      AND ($scope IS NULL OR n.`%(scope_property)s` IN $scope)
+    RETURN n.`%(key)s` AS key, n.deleted_at IS NOT NULL AS deleted
+    ORDER BY key LIMIT $limit"""
+
+MARK_STALE = """UNWIND $rows AS row
+    MATCH (n:`%(label)s` {`%(key)s`: row.key})
+    SET n.deleted_at = row.now, n.updated_node_at = timestamp(), n:Tombstone
+    WITH n, row
+    OPTIONAL MATCH (n)-[r]-()
+    SET r.deleted_at = row.now, r.updated_node_at = timestamp()"""
+
+DELETE_STALE = """UNWIND $rows AS row
+    MATCH (n:`%(label)s` {`%(key)s`: row.key})
+    DETACH DELETE n"""
+
+RESTORE = """UNWIND $rows AS row
+    MATCH (n:`%(label)s` {`%(key)s`: row.key})
+    REMOVE n.deleted_at, n:Tombstone
+    SET n.updated_node_at = timestamp()
+    WITH n
+    OPTIONAL MATCH (n)-[r]-()
+    REMOVE r.deleted_at
+    SET r.updated_node_at = timestamp()"""
+
+
+class Reconciler:
+    """Find the nodes of full-snapshot streams that disappeared from GitHub.
+
+    The keys seen in the current snapshot of a stream (branches, labels,
+    teams, team members) are diffed against the keys stored for the label,
+    read a page at a time by key and restricted to the repositories or
+    organizations the snapshot covers. Stale nodes are then marked (a
+    ``deleted_at`` date and the ``Tombstone`` label on the node and its
+    relationships) or deleted, in batches. A marked node seen again is
+    restored.
+    """
+
+    def __init__(
+        self, sink: Any, mode: str | None = None, batch_size: int | None = None
+    ) -> None:
+        """Initialize the reconciler.
+
+        Args:
+        ----
+            sink (SinkNeo4j): Sink used to read keys and apply the changes.
+            mode (str): ``mark``, ``delete`` or ``off`` (defaults to
+                ``RECONCILE`` or ``mark``).
+            batch_size (int): Keys per page and per write (defaults to
+                ``RECONCILE_BATCH_SIZE`` or 5000).
+
+        """
+        self.sink = sink
+        self.mode = (mode or os.getenv("RECONCILE", RECONCILE_MARK)).strip().lower()
+        if self.mode not in (RECONCILE_OFF, RECONCILE_MARK, RECONCILE_DELETE):
+            raise ValueError(f"Unknown RECONCILE mode: {self.mode}")
+        self.batch_size = batch_size or int(os.getenv("RECONCILE_BATCH_SIZE", "5000"))
+
+    def reconcile(
+        self,
+        label: str,
+        key: str,
+        seen: Iterable[Any],
+        scope_property: str | None = None,
+        scope: Iterable[Any] | None = None,
+    ) -> int:
+        """Mark or delete the stored nodes of a label missing from a snapshot.
+
+        Args:
+        ----
+            label (str): Node label (e.g., "Branch").
+            key (str): Key property of the label.
+            seen (Iterable): Keys present in the current snapshot.
+            scope_property (str): Property restricting the stored nodes
+                compared (e.g., "repository").
+            scope (Iterable): Values of ``scope_property`` the snapshot
+                covers. Nodes outside are never touched.
+
+        Returns:
+        -------
+            int: Number of stale nodes.
+
+        """
+        if self.mode == RECONCILE_OFF:
+            return 0
+        seen = set(seen)
+        if not seen:
+            # An empty snapshot is far more likely a failed read than a wipe.
+            logger.warning(f"No {label} in the snapshot: reconciliation skipped.")
+            return 0
+
+        names = {
+            "label": label.strip().lower(),
+            "key": key,
+            "scope_property": scope_property or key,
+        }
+        scope_values = sorted({str(v) for v in scope}) if scope is not None else None
+        stale_query = DELETE_STALE if self.mode == RECONCILE_DELETE else MARK_STALE
+        queries = {STALE: stale_query % names, RESTORED: RESTORE % names}
+        now = datetime.now().isoformat()
+
+        totals = {STALE: 0, RESTORED: 0}
+        for change, keys in self._changes(names, seen, scope_values):
+            totals[change] += self._apply(queries[change], label, keys, now)
+            if change == STALE:
+                self._forget(label, key, keys)
+        logger.info(
+            f"Reconciled {label}: {totals[STALE]} stale ({self.mode}), "
+            f"{totals[RESTORED]} restored, {len(seen)} in the snapshot."
+        )
+        return totals[STALE]
+
+    def _changes(
+        self, names: dict[str, str], seen: set[Any], scope: list[str] | None
+    ) -> Iterator[tuple[str, list[Any]]]:
+        """Page through the stored keys of a label and yield its changes.
+
+        Keys are yielded in batches, once a page brings a batch to
+        ``batch_size`` keys or more (then what is left), tagged ``STALE``
+        (stored, not marked, missing from ``seen``) or ``RESTORED``
+        (marked, seen again).
+        """
+        changes: dict[str, list[Any]] = {STALE: [], RESTORED: []}
+        after: Any = ""  # Below every string key
+        if any(isinstance(k, (int, float)) for k in seen):
+            after = float("-inf")
+        while True:
+            page = self.sink.run(
+                STORED_KEYS % names, after=after, scope=scope, limit=self.batch_size
+            )
+            for row in page:
+                # Seen and marked: restore. Missing and not marked: stale.
+                if (row["key"] in seen) == row["deleted"]:
+                    changes[RESTORED if row["deleted"] else STALE].append(row["key"])
+            for change, keys in changes.items():
+                if len(keys) >= self.batch_size:
+                    yield change, keys
+                    changes[change] = []
+            if len(page) < self.batch_size:
+                break
+            after = page[-1]["key"]
+        for change, keys in changes.items():
+            if keys:
+                yield change, keys
+
+    def reconcile_delta(
+        self,
+        label: str,
+        key: str,
+        removed: Iterable[Any],
+        inserted: Iterable[Any] = (),
+    ) -> int:
+        """Mark or delete the nodes removed since the previous snapshot.
+
+        Used instead of ``reconcile`` when the stream was diffed against
+        its previous snapshot (see ``SnapshotStore``): only the removed
+        keys are written, and the inserted ones restored, without reading
+        the stored keys of the label.
+
+        Args:
+        ----
+            label (str): Node label (e.g., "Branch").
+            key (str): Key property of the label.
+            removed (Iterable): Keys no longer in the snapshot.
+            inserted (Iterable): Keys new in the snapshot (maybe marked).
+
+        Returns:
+        -------
+            int: Number of stale nodes.
+
+        """
+        if self.mode == RECONCILE_OFF:
+            return 0
+        names = {"label": label.strip().lower(), "key": key}
+        stale_query = DELETE_STALE if self.mode == RECONCILE_DELETE else MARK_STALE
+        now = datetime.now().isoformat()
+        inserted = list(inserted)
+        # A key both removed and inserted (two records mapped to one node)
+        # is still in the snapshot: never mark or delete it.
+        kept = set(inserted)
+        removed = [k for k in removed if k not in kept]
+
+        stale_total = restored_total = 0
+        for start in range(0, len(removed), self.batch_size):
+            stale = removed[start : start + self.batch_size]
+            stale_total += self._apply(stale_query % names, label, stale, now)
+            self._forget(label, key, stale)
+        for start in range(0, len(inserted), self.batch_size):
+            restored = inserted[start : start + self.batch_size]
+            restored_total += self._apply(RESTORE % names, label, restored, now)
+        logger.info(
+            f"Reconciled {label} from the snapshot delta: {stale_total} stale "
+            f"({self.mode}), {restored_total} new keys checked for a restore."
+        )
+        return stale_total
+
+    def _apply(self, query: str, label: str, keys: list[Any], now: str) -> int:
+        if keys:
+            rows = [{"key": key, "now": now} for key in keys]
+            self.sink.run_batch(query, rows, key=lambda row: row["key"], labels=[label])
+        return len(keys)
+
+    def _forget(self, label: str, key: str, keys: list[Any]) -> None:
+        """Drop deleted nodes from the key index (element ids get reused)."""
+        if self.mode == RECONCILE_DELETE and keys:
+            self.sink.keys.discard(label, key, keys)
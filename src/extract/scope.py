@@ -0,0 +1,110 @@
+import hashlib  # noqa: I001
+from dataclasses import dataclass, replace  # noqa: I001
+from datetime import date, datetime, timedelta  # noqa: I001
+from typing import Any  # noqa: I001
+
+
+# Date column used to place the records of a stream in a time window
+# (the Airbyte cursor of the incremental streams). Streams without one
+# (branches, labels, teams...) are loaded with the first window only.
+DATE_COLUMNS: dict[str, str] = {
+    "commits": "created_at",
+    "issues": "updated_at",
+    "pull_requests": "updated_at",
+    "issue_milestones": "updated_at",
+}
+
+
+def parse_date(value: str) -> date:
+    """Parse a ``YYYY-MM-DD`` (or ISO datetime) date."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+
+
+@dataclass(frozen=True)
+class Scope:
+    """Partition of the data an extractor run is limited to.
+
+    A scope restricts the Airbyte config (repositories, start date), the
+    streams read, the records taken from the cache (repository and date
+    window) and the load stages run. An empty scope field means "no
+    restriction".
+    """
+
+    repositories: tuple[str, ...] = ()
+    since: str | None = None  # Inclusive, YYYY-MM-DD
+    until: str | None = None  # Exclusive, YYYY-MM-DD
+    streams: tuple[str, ...] = ()
+    part: int = 0  # Index of the sub-window (see split)
+    parent: str = ""  # Name of the scope a sub-window was split from
+
+    @property
+    def name(self) -> str:
+        """Stable identifier of the scope, used for checkpoints and caches."""
+        text = "|".join(
+            [
+                ",".join(sorted(self.repositories)),
+                self.since or "",
+                self.until or "",
+                ",".join(sorted(self.streams)),
+            ]
+        )
+        return hashlib.sha1(text.encode()).hexdigest()[:12]  # noqa: S324
+
+    @property
+    def cache_schema(self) -> str:
+        """Airbyte cache schema of the scope, shared by its sub-windows."""
+        return f"backfill_{self.parent or self.name}"
+
+    def includes(self, stream: str) -> bool:
+        """Whether a stream is part of the scope."""
+        return not self.streams or stream in self.streams
+
+    def split(self, days: int) -> list["Scope"]:
+        """Split the date window into sub-windows of ``days`` days.
+
+        A scope without ``since`` is not split. Without ``until`` the
+        windows run up to today (the last one stays open-ended).
+        """
+        if not self.since or days <= 0:
+            return [self]
+        start = parse_date(self.since)
+        end = parse_date(self.until) if self.until else date.today() + timedelta(1)
+        windows = []
+        while start < end:
+            stop = min(start + timedelta(days), end)
+            windows.append(
+                replace(
+                    self,
+                    since=start.isoformat(),
+                    until=stop.isoformat() if stop < end or self.until else None,
+                    part=len(windows),
+                    parent=self.name,
+                )
+            )
+            start = stop
+        return windows or [self]
+
+    def filter(self, stream: str, frame: Any) -> Any:
+        """Keep the records of a stream DataFrame that fall in the scope."""
+        if frame is None or frame.empty:
+            return frame
+        mask = None
+        if self.repositories and "repository" in frame.columns:
+            mask = frame["repository"].isin(self.repositories)
+
+        column = DATE_COLUMNS.get(stream)
+        if column is None or column not in frame.columns:
+            if self.part > 0:  # Undated records belong to the first window
+                return frame.iloc[0:0]
+        elif self.since or self.until:
+            import pandas as pd
+
+            dates = pd.to_datetime(frame[column], utc=True, errors="coerce")
+            if self.since:
+                since = pd.Timestamp(self.since, tz="UTC")
+                mask = (dates >= since) if mask is None else mask & (dates >= since)
+            if self.until:
+                until = pd.Timestamp(self.until, tz="UTC")
+                mask = (dates < until) if mask is None else mask & (dates < until)
+
+        return frame if mask is None else frame[mask].reset_index(drop=True)
@@ -0,0 +1,212 @@
+import hashlib  # noqa: I001
+import math  # noqa: I001
+import os  # noqa: I001
+from dataclasses import dataclass  # noqa: I001
+from typing import Any  # noqa: I001
+
+import orjson  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("extractor")
+
+# Full-refresh streams (read whole on every run) and the columns keying
+# their records.
+SNAPSHOT_KEYS: dict[str, tuple[str, ...]] = {
+    "repositories": ("id",),
+    "teams": ("id",),
+    "team_members": ("organization", "login", "team_slug"),
+    "branches": ("repository", "name"),
+    "issue_labels": ("id",),
+}
+
+# Kept in the snapshot with the keys, to scope the removed records.
+SCOPE_COLUMNS = ("repository", "organization")
+
+KEY_COLUMN = "_key"
+HASH_COLUMN = "_row_hash"
+ROW_COLUMN = "_row"
+
+
+def _text(value: Any) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "\x00"
+    return str(value)
+
+
+def row_hash(values: list[Any]) -> str:
+    """Stable hash of the values of a record (nested values included)."""
+    data = orjson.dumps(
+        values,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass
+class Delta:
+    """Records of a full-refresh stream compared with the previous run.
+
+    ``changed`` holds the records to load (new keys and changed values),
+    ``inserted`` and ``removed`` the key and scope columns of the records
+    whose key appeared or disappeared. Without a previous snapshot
+    (``incremental`` is False) every record is changed and none removed.
+    """
+
+    stream: str
+    frame: Any  # Every record of the current snapshot
+    changed: Any
+    inserted: Any
+    removed: Any
+    incremental: bool
+
+
+class SnapshotStore:
+    """Previous snapshots of the full-refresh streams, as Parquet files.
+
+    Each snapshot keeps, per record, its key, scope columns and a hash of
+    its values. The current records are anti-joined (Arrow) with it on
+    key and hash, so only new or changed records are handed to the
+    loaders, and on key alone to find the removed ones. The snapshots are
+    replaced once the run finished; a failed run diffs against the same
+    snapshot again. A snapshot taken on another generation of the graph
+    (see ``KeyIndex``), or keyed on other columns, is ignored.
+    """
+
+    def __init__(
+        self, name: str, directory: str | None = None, enabled: bool | None = None
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+        ----
+            name (str): Name of the run (snapshot subdirectory).
+            directory (str): Root of the snapshots (defaults to
+                ``SNAPSHOT_DIR`` or ``STATE_DIR/snapshots``).
+            enabled (bool): Whether to diff the streams (defaults to
+                ``SNAPSHOT_DELTA`` not being ``off``).
+
+        """
+        if enabled is None:
+            enabled = os.getenv("SNAPSHOT_DELTA", "on").strip().lower() != "off"
+        self.enabled = enabled
+        root = directory or os.getenv("SNAPSHOT_DIR") or os.path.join(
+            os.getenv("STATE_DIR", "state"), "snapshots"
+        )
+        self.directory = os.path.join(root, name)
+        self.deltas: dict[str, Delta] = {}
+        self._pending: dict[str, Any] = {}
+
+    def _path(self, stream: str) -> str:
+        return os.path.join(self.directory, f"{stream}.parquet")
+
+    def diff(self, stream: str, frame: Any, generation: str | None = None) -> Delta:
+        """Compare the records of a stream with its previous snapshot.
+
+        Args:
+        ----
+            stream (str): Full-refresh stream (see ``SNAPSHOT_KEYS``).
+            frame (DataFrame): Every record of the stream.
+            generation (str): Generation of the graph, when known.
+
+        Returns:
+        -------
+            Delta: The changed, inserted and removed records.
+
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        key = [c for c in SNAPSHOT_KEYS[stream] if c in frame.columns]
+        scope = [c for c in SCOPE_COLUMNS if c in frame.columns and c not in key]
+        stored = key + scope
+        hashed = [c for c in frame.columns if not c.startswith("_airbyte")]
+
+        keys = [
+            "\x1f".join(_text(v) for v in values)
+            for values in zip(*(frame[c] for c in key), strict=True)
+        ]
+        hashes = [
+            row_hash(list(values))
+            for values in frame[hashed].itertuples(index=False, name=None)
+        ]
+        columns = frame[stored].astype(object)
+        current = pa.Table.from_pandas(
+            columns.where(columns.notna(), None), preserve_index=False
+        ).append_column(KEY_COLUMN, pa.array(keys, pa.string()))
+        current = current.append_column(HASH_COLUMN, pa.array(hashes, pa.string()))
+        metadata = {"generation": generation or "", "key": ",".join(key)}
+        self._pending[stream] = current.replace_schema_metadata(metadata)
+
+        previous = self._previous(stream, generation, metadata["key"])
+        if previous is None:
+            empty = frame.iloc[0:0][stored]
+            delta = Delta(stream, frame, frame, frame[stored], empty, False)
+        else:
+            rows = current.select([KEY_COLUMN, HASH_COLUMN]).append_column(
+                ROW_COLUMN, pa.array(range(len(frame)), pa.int64())
+            )
+            changed = rows.join(
+                previous.select([KEY_COLUMN, HASH_COLUMN]),
+                keys=[KEY_COLUMN, HASH_COLUMN],
+                join_type="left anti",
+            )
+            previous_keys = previous[KEY_COLUMN].combine_chunks()
+            current_keys = current[KEY_COLUMN].combine_chunks()
+            known = pc.is_in(changed[KEY_COLUMN], value_set=previous_keys)
+            inserted = sorted(changed.filter(pc.invert(known))[ROW_COLUMN].to_pylist())
+            kept = pc.is_in(previous[KEY_COLUMN], value_set=current_keys)
+            removed = previous.filter(pc.invert(kept))
+            delta = Delta(
+                stream,
+                frame,
+                frame.iloc[sorted(changed[ROW_COLUMN].to_pylist())],
+                frame.iloc[inserted][stored],
+                removed.drop_columns([KEY_COLUMN, HASH_COLUMN]).to_pandas(),
+                True,
+            )
+        logger.info(
+            f"{stream}: {len(delta.changed)} of {len(frame)} records new or changed "
+            f"({len(delta.inserted)} new keys), {len(delta.removed)} removed"
+            + ("." if delta.incremental else " (no previous snapshot).")
+        )
+        self.deltas[stream] = delta
+        return delta
+
+    def _previous(self, stream: str, generation: str | None, key: str) -> Any:
+        """Read the previous snapshot of a stream, if usable."""
+        import pyarrow.parquet as pq
+
+        path = self._path(stream)
+        if not os.path.exists(path):
+            return None
+        try:
+            previous = pq.read_table(path)
+        except Exception as e:
+            logger.warning(f"Unreadable snapshot {path}, full load: {e}")
+            return None
+        metadata = previous.schema.metadata or {}
+        stored = metadata.get(b"generation", b"").decode()
+        if generation and stored and stored != generation:
+            logger.info(f"{stream}: snapshot of another graph generation, full load.")
+            return None
+        if metadata.get(b"key", b"").decode() != key:
+            logger.info(f"{stream}: snapshot keyed on other columns, full load.")
+            return None
+        return previous
+
+    def commit(self) -> None:
+        """Replace the snapshots with those of the current run."""
+        import pyarrow.parquet as pq
+
+        if not self._pending:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        for stream, table in self._pending.items():
+            path = self._path(stream)
+            pq.write_table(table, f"{path}.tmp", compression="zstd")
+            os.replace(f"{path}.tmp", path)
+        logger.info(f"Snapshots of {sorted(self._pending)} saved to {self.directory}.")
+        self._pending.clear()
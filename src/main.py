@@ -1,7 +1,303 @@
+import argparse
+import os
+import shutil
+import tempfile
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from dotenv import load_dotenv
+
+from sink.factory import create_sink
+from sink.sink_memory import MemorySink
 from src.config.logging_config import LoggerFactory
 from src.extract.extract_ciro import ExtractCIRO
 from src.extract.extract_cmpo import ExtractCMPO
 from src.extract.extract_eo import ExtractEO
+from src.extract.organization import OrganizationConfig, load_organizations
+from src.extract.scope import Scope, parse_date
+from src.extract.windowed import WindowedLoad
+from src.sink.query_log import get_query_log
+
+EXTRACTORS = {
+    "ExtractEO": ExtractEO,
+    "ExtractCMPO": ExtractCMPO,
+    "ExtractCIRO": ExtractCIRO,
+}
+
+
+def replay(names: Sequence[str]) -> None:
+    """Re-process the dead-lettered records of the given extractors.
+
+    The extractors are created without an Airbyte source: only the
+    records stored in the dead-letter files are loaded into Neo4j.
+    """
+    logger = LoggerFactory.get_logger("extractor")
+    for name in names:
+        logger.info(f"Replaying dead letters of {name}...")
+        replayed, failed = EXTRACTORS[name](connect_source=False).replay_dead_letters()
+        logger.info(f"{name}: {replayed} replayed, {failed} still failing.")
+
+
+def backfill(scope: Scope, workers: int = 4, window_days: int = 7) -> None:
+    """Re-extract a partition (repositories, streams, date window) of the data.
+
+    For each extractor owning a requested stream, the partition is read
+    once from Airbyte into a cache schema of its own, then loaded in
+    concurrent sub-windows of ``window_days`` (see ``WindowedLoad``).
+    Rerunning the same command after a failure skips the read and the
+    finished windows.
+    """
+    # EO/CMPO first: CIRO links pull requests to the commits CMPO writes.
+    sink = create_sink()
+    for extractor in EXTRACTORS.values():
+        WindowedLoad(extractor, scope, window_days, workers, sink=sink).run()
+
+
+def initial_load(since: str, workers: int = 4, window_days: int = 30) -> None:
+    """First load of an organization with years of history.
+
+    EO is small and runs as usual. CMPO and CIRO are read per repository
+    (concurrent Airbyte reads, each into its own cache schema) and loaded
+    in concurrent date windows from ``since``, so a stall or a failure
+    only redoes the repository read or the window it hit.
+
+    ``workers`` bounds the threads of the whole load: the partitions run
+    concurrently, each with its share of the workers for its windows, and
+    every extractor shares one sink.
+    """
+    logger = LoggerFactory.get_logger("extractor")
+    load_dotenv()
+    repositories = os.getenv("REPOSITORIES", "").replace(",", " ").split()
+    if not repositories or any("*" in r for r in repositories):
+        partitions = [Scope(since=since)]  # Wildcards: one read for everything
+    else:
+        partitions = [Scope(repositories=(r,), since=since) for r in repositories]
+    logger.info(f"Initial load from {since} in {len(partitions)} partitions.")
+
+    workers = max(1, workers)
+    concurrent = min(workers, len(partitions))
+    window_workers = max(1, workers // concurrent)
+    sink = create_sink()
+    ExtractEO(sink=sink).run()
+    for extractor in (ExtractCMPO, ExtractCIRO):
+        with ThreadPoolExecutor(max_workers=concurrent) as pool:
+            futures = [
+                pool.submit(
+                    WindowedLoad(
+                        extractor, partition, window_days, window_workers, sink=sink
+                    ).run
+                )
+                for partition in partitions
+            ]
+            for future in futures:
+                future.result()  # Re-raise the failure of a partition
+
+
+def run_organization(organization: OrganizationConfig, sink: Any) -> None:
+    """Run EO, CMPO and CIRO, in order, for one organization."""
+    logger = LoggerFactory.get_logger("extractor")
+    for name, extractor in EXTRACTORS.items():
+        logger.info(f"[{organization.name}] Running {name}...")
+        extractor(organization=organization, sink=sink).run()
+    logger.info(f"[{organization.name}] Extraction completed.")
+
+
+def multi_org(config_path: str, workers: int = 4) -> None:
+    """Extract several organizations concurrently into one graph.
+
+    Each organization runs its extractors in order, with its own token,
+    repositories, Airbyte source and cache schema, checkpoints, dead
+    letters and retrieve-date config. All of them share one sink: its
+    connection pool, watermarks and the index of the Person nodes, which
+    are common to every organization. A failing organization does not
+    stop the others; the failures are reported at the end.
+    """
+    logger = LoggerFactory.get_logger("extractor")
+    load_dotenv()
+    organizations = load_organizations(config_path)
+    logger.info(f"Extracting {len(organizations)} organizations from {config_path}.")
+
+    sink = create_sink()
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(run_organization, organization, sink): organization
+            for organization in organizations
+        }
+        for future, organization in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logger.exception(f"[{organization.name}] Extraction failed: {e}")
+                failed.append(organization.name)
+
+    logger.info(
+        f"{len(organizations) - len(failed)} organizations extracted, "
+        f"{len(sink.people)} people indexed "
+        f"({sink.people.hits} lookups avoided)."
+    )
+    if failed:
+        raise RuntimeError(f"Extraction failed for: {', '.join(failed)}")
+
+
+def dry_run(keys: str | None = None) -> None:
+    """Run EO, CMPO and CIRO against an in-memory graph and print the plan.
+
+    Nothing is written to Neo4j: the extractors read from Airbyte as
+    usual and write into a ``MemorySink``, which counts the nodes and
+    relationships merged per label and type and the write transactions
+    they would take. Nodes are told new or existing from a key index
+    snapshot of the target graph (``KEY_INDEX_PATH`` by default) when one
+    exists. Checkpoints, dead letters, spill files and stream snapshots go
+    to a temporary directory, so a dry run never skips or resumes a stage
+    of a real run nor replaces its snapshots. The full-refresh streams are
+    diffed against a copy of the real snapshots.
+    """
+    logger = LoggerFactory.get_logger("extractor")
+    load_dotenv()
+    state = os.getenv("STATE_DIR", "state")
+    keys = keys or os.getenv("KEY_INDEX_PATH") or os.path.join(
+        state, "key_index.sqlite"
+    )
+    snapshot = keys if os.path.exists(keys) else None
+    snapshots = os.getenv("SNAPSHOT_DIR") or os.path.join(state, "snapshots")
+    logger.info(f"Dry run (key snapshot: {snapshot or 'none'}).")
+
+    with tempfile.TemporaryDirectory(prefix="dry_run_") as state_dir:
+        os.environ["STATE_DIR"] = state_dir
+        os.environ["DEAD_LETTER_DIR"] = os.path.join(state_dir, "dead_letter")
+        os.environ["SPILL_DIR"] = os.path.join(state_dir, "spill")
+        os.environ["SNAPSHOT_DIR"] = os.path.join(state_dir, "snapshots")
+        if os.path.isdir(snapshots):
+            shutil.copytree(snapshots, os.environ["SNAPSHOT_DIR"])
+        sink = MemorySink(snapshot)
+        for name, extractor in EXTRACTORS.items():
+            logger.info(f"Dry run of {name}...")
+            extractor(sink=sink).run()
+    print(sink.writes.render())
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(prog="python -m src.main")
+    parser.add_argument(
+        "--profile",
+        choices=("sample", "cprofile"),
+        help="Profile every extractor stage into PROFILE_DIR (sets PROFILE).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Run against an in-memory graph and print the write plan.",
+    )
+    parser.add_argument(
+        "--keys",
+        help="Key index snapshot of the graph for --dry-run (KEY_INDEX_PATH).",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("run", help="Run the extraction pipeline (default).")
+    replay_parser = commands.add_parser(
+        "replay", help="Re-process dead-lettered records after a fix."
+    )
+    replay_parser.add_argument(
+        "--extractor",
+        action="append",
+        choices=sorted(EXTRACTORS),
+        help="Extractor to replay (repeatable). Defaults to all extractors.",
+    )
+    backfill_parser = commands.add_parser(
+        "backfill", help="Re-extract some repositories, streams or a time window."
+    )
+    backfill_parser.add_argument(
+        "--repo",
+        action="append",
+        default=[],
+        help="Repository full name, e.g. org/x (repeatable). Defaults to all.",
+    )
+    backfill_parser.add_argument(
+        "--since", type=parse_date, help="First day of the window (YYYY-MM-DD)."
+    )
+    backfill_parser.add_argument(
+        "--until", type=parse_date, help="Day after the window (default: today)."
+    )
+    backfill_parser.add_argument(
+        "--streams",
+        default="",
+        help="Comma separated Airbyte streams, e.g. commits,pull_requests.",
+    )
+    backfill_parser.add_argument(
+        "--window-days", type=int, default=7, help="Days per concurrent sub-window."
+    )
+    backfill_parser.add_argument(
+        "--workers", type=int, default=4, help="Sub-windows loaded concurrently."
+    )
+    initial_parser = commands.add_parser(
+        "initial-load",
+        help="First load of a large organization in repositories and windows.",
+    )
+    initial_parser.add_argument(
+        "--since", type=parse_date, required=True, help="Oldest day to load."
+    )
+    initial_parser.add_argument(
+        "--window-days", type=int, default=30, help="Days per date window."
+    )
+    initial_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Repositories read, and windows loaded, concurrently.",
+    )
+    multi_org_parser = commands.add_parser(
+        "multi-org", help="Extract the organizations of a config file concurrently."
+    )
+    multi_org_parser.add_argument(
+        "--config", required=True, help="YAML file listing the organizations."
+    )
+    multi_org_parser.add_argument(
+        "--workers", type=int, default=4, help="Organizations run concurrently."
+    )
+    args = parser.parse_args(argv)
+    if args.dry_run and args.command not in (None, "run"):
+        parser.error("--dry-run only applies to the run command")
+    return args
+
+
+def cli(argv: Sequence[str] | None = None) -> None:
+    """Dispatch the command line to the pipeline or one of the commands."""
+    args = parse_args(argv)
+    if args.profile:
+        os.environ["PROFILE"] = args.profile
+    if args.dry_run:
+        dry_run(args.keys)
+        return
+    if args.command in (None, "run"):
+        main()
+        return
+    try:
+        run_command(args)
+    finally:
+        get_query_log().write_report()
+
+
+def run_command(args: argparse.Namespace) -> None:
+    """Run one of the commands other than the pipeline."""
+    if args.command == "replay":
+        replay(args.extractor or list(EXTRACTORS))
+    elif args.command == "backfill":
+        scope = Scope(
+            repositories=tuple(args.repo),
+            since=args.since.isoformat() if args.since else None,
+            until=args.until.isoformat() if args.until else None,
+            streams=tuple(s.strip() for s in args.streams.split(",") if s.strip()),
+        )
+        backfill(scope, workers=args.workers, window_days=args.window_days)
+    elif args.command == "multi-org":
+        multi_org(args.config, workers=args.workers)
+    elif args.command == "initial-load":
+        initial_load(
+            args.since.isoformat(), workers=args.workers, window_days=args.window_days
+        )
 
 
 def main() -> None:
@@ -46,7 +342,10 @@ def main() -> None:
     except Exception as e:
         # Log the exception with traceback for detailed error analysis
         logger.exception(f"❌ Extraction pipeline failed with an exception: {e}")
+    finally:
+        # Ranked query timings and the plans of the slow queries
+        get_query_log().write_report()
 
 
 if __name__ == "__main__":
-    main()
+    cli()
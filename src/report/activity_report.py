@@ -0,0 +1,114 @@
+from py2neo import Graph  # noqa: I001
+from typing import Any  # noqa: I001
+import os  # noqa: I001
+
+
+class ActivityReport:
+    """Engineering metrics read from the pre-aggregated Activity nodes.
+
+    The extractors maintain one ``Activity`` node per Person x Repository
+    (commits, pull requests, reviews and issues, with first/last activity
+    dates) and a ``progress`` property on each Milestone, so these helpers
+    read a handful of nodes instead of traversing the raw edges.
+    """
+
+    def __init__(self) -> None:
+        """Initialize connection to Neo4j database."""
+        self.graph = Graph(
+            os.getenv("NEO4J_URI", ""),
+            auth=(
+                os.getenv("NEO4J_USER", ""),
+                os.getenv("NEO4J_PASSWORD", ""),
+            ),
+        )
+
+    def fetch_person_repository_activity(
+        self, login: str | None = None, repository: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Fetch activity counts per person and repository.
+
+        Args:
+        ----
+            login (str): Only this person (optional).
+            repository (str): Only this repository full name (optional).
+
+        Returns:
+        -------
+            list: one dictionary per Person x Repository.
+
+        """
+        query = """MATCH (a:activity)
+            WHERE ($login IS NULL OR a.login = $login)
+              AND ($repository IS NULL OR a.repository = $repository)
+            RETURN a.login AS login,
+                   a.repository AS repository,
+                   coalesce(a.commits, 0) AS commits,
+                   coalesce(a.pull_requests, 0) AS pull_requests,
+                   coalesce(a.reviews, 0) AS reviews,
+                   coalesce(a.issues, 0) AS issues,
+                   a.first_activity_at AS first_activity_at,
+                   a.last_activity_at AS last_activity_at
+            ORDER BY login, repository"""
+        return self.graph.run(query, login=login, repository=repository).data()
+
+    def fetch_reviews_per_person(self) -> list[dict[str, Any]]:
+        """Fetch the number of pull requests each person was asked to review.
+
+        Returns
+        -------
+            list: ``login`` and ``reviews``, most active reviewers first.
+
+        """
+        query = """MATCH (a:activity) WHERE a.reviews > 0
+            RETURN a.login AS login, sum(a.reviews) AS reviews
+            ORDER BY reviews DESC, login"""
+        return self.graph.run(query).data()
+
+    def fetch_milestone_progress(
+        self, repository: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Fetch open/closed issue counts and progress of each milestone.
+
+        Args:
+        ----
+            repository (str): Only milestones of this repository (optional).
+
+        Returns:
+        -------
+            list: one dictionary per milestone.
+
+        """
+        query = """MATCH (m:Milestone)
+            WHERE $repository IS NULL OR m.repository = $repository
+            RETURN m.repository AS repository,
+                   m.title AS title,
+                   m.state AS state,
+                   coalesce(m.open_issues, 0) AS open_issues,
+                   coalesce(m.closed_issues, 0) AS closed_issues,
+                   m.progress AS progress
+            ORDER BY repository, title"""
+        return self.graph.run(query, repository=repository).data()
+
+    def fetch_team_activity(self) -> list[dict[str, Any]]:
+        """Fetch activity totals per team, summed over its members.
+
+        Only the Activity nodes of the members are read, never the commit,
+        pull request or issue edges.
+
+        Returns
+        -------
+            list: one dictionary per team.
+
+        """
+        query = """MATCH (t:Team)-[:has]->(tm:TeamMember)-[:is]->(p:Person)
+            WHERE t.deleted_at IS NULL AND tm.deleted_at IS NULL
+            MATCH (p)-[:has_activity]->(a:activity)
+            RETURN t.name AS team,
+                   count(DISTINCT p) AS active_members,
+                   sum(coalesce(a.commits, 0)) AS commits,
+                   sum(coalesce(a.pull_requests, 0)) AS pull_requests,
+                   sum(coalesce(a.reviews, 0)) AS reviews,
+                   sum(coalesce(a.issues, 0)) AS issues,
+                   max(a.last_activity_at) AS last_activity_at
+            ORDER BY team"""
+        return self.graph.run(query).data()
@@ -1,14 +1,12 @@
 # from src.report.team_report import TeamReport
 # extractor = TeamReport()
 
-# markdown = extractor.create_people_markdown()
 # output_path = "/data/people.md"
-# extractor.save_markdown_to_file(markdown, output_path)
+# extractor.write_people_report(output_path)
 
 # print(f"Markdown saved to: {output_path}")
 
-# markdown = extractor.create_team_markdown()
 # output_path = "/data/team.md"
-# extractor.save_markdown_to_file(markdown, output_path)
+# extractor.write_team_report(output_path)
 
 # print(f"Markdown saved to: {output_path}")
@@ -0,0 +1,407 @@
+import argparse  # noqa: I001
+import json  # noqa: I001
+import os  # noqa: I001
+import shutil  # noqa: I001
+import uuid  # noqa: I001
+from collections.abc import Iterator  # noqa: I001
+from typing import Any  # noqa: I001
+
+import pyarrow as pa  # noqa: I001
+import pyarrow.compute as pc  # noqa: I001
+import pyarrow.dataset as ds  # noqa: I001
+import pyarrow.parquet as pq  # noqa: I001
+from py2neo import Graph  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("export")
+
+NODE_LABELS = [
+    "Organization",
+    "Repository",
+    "Project",
+    "Team",
+    "TeamMember",
+    "Person",
+    "Branch",
+    "Commit",
+    "Milestone",
+    "Label",
+    "Issue",
+    "PullRequest",
+    "Activity",
+]
+
+PARTITION_COLUMNS = ["organization", "repository", "month"]
+RELATIONSHIP_PARTITION_COLUMNS = ["organization"]
+UNKNOWN = "unknown"  # Partition value of nodes without repository or date
+
+# Properties used to date a node, in order of preference
+DATE_PROPERTIES = ["created_at", "author_date", "committer_date", "created_node_at"]
+
+NEO4J_TO_ARROW = {
+    "String": pa.string(),
+    "Long": pa.int64(),
+    "Integer": pa.int64(),
+    "Double": pa.float64(),
+    "Float": pa.float64(),
+    "Boolean": pa.bool_(),
+    "StringArray": pa.list_(pa.string()),
+    "LongArray": pa.list_(pa.int64()),
+    "DoubleArray": pa.list_(pa.float64()),
+    "BooleanArray": pa.list_(pa.bool_()),
+}
+
+# ``updated_node_at`` is set by every sink write (server epoch milliseconds).
+NODES_QUERY = """MATCH (n:`%(label)s`)
+    WHERE $since IS NULL OR n.updated_node_at >= $since
+    RETURN elementId(n) AS element_id, properties(n) AS properties"""
+
+RELATIONSHIPS_QUERY = """MATCH (a)-[r:`%(type)s`]->(b)
+    WHERE $since IS NULL OR r.updated_node_at >= $since
+    RETURN elementId(r) AS element_id,
+           elementId(a) AS start_element_id,
+           elementId(b) AS end_element_id,
+           [l IN labels(a) WHERE l <> toLower(l)][0] AS start_label,
+           [l IN labels(b) WHERE l <> toLower(l)][0] AS end_label,
+           a.id AS start_id,
+           b.id AS end_id,
+           properties(r) AS properties"""
+
+
+class GraphExporter:
+    """Export the graph to partitioned Parquet datasets for analytics.
+
+    Each node label is written to ``<output>/nodes/<Label>`` and each
+    relationship type to ``<output>/relationships/<type>``, partitioned
+    (Hive style) by organization, repository and month. Records are
+    streamed from Neo4j and written in Arrow batches.
+
+    Incremental exports only write the nodes and relationships written
+    since the previous export began (``updated_node_at``); the rows they
+    replace are removed from the files of earlier exports, so each element
+    id appears once per dataset. Full exports rewrite the datasets.
+    """
+
+    def __init__(self, output_dir: str | None = None, batch_size: int = 10000) -> None:
+        """Initialize connection to Neo4j database.
+
+        Args:
+        ----
+            output_dir (str): Root of the datasets (defaults to ``EXPORT_DIR``
+                or ``export``).
+            batch_size (int): Rows per Arrow batch.
+
+        """
+        self.graph = Graph(
+            os.getenv("NEO4J_URI", ""),
+            auth=(
+                os.getenv("NEO4J_USER", ""),
+                os.getenv("NEO4J_PASSWORD", ""),
+            ),
+        )
+        self.output_dir = output_dir or os.getenv("EXPORT_DIR", "export")
+        self.batch_size = batch_size
+        self.organization = os.getenv("ORGANIZATION", "")
+        self.state_path = os.path.join(self.output_dir, "_export_state.json")
+
+    def run(self, full: bool = False) -> None:
+        """Export every label and relationship type.
+
+        Args:
+        ----
+            full (bool): Rewrite the datasets instead of exporting the
+                changes since the last export.
+
+        """
+        state = self._read_state()
+        since = None if full else state.get("last_export_ms")
+        started_ms = self.graph.evaluate("RETURN timestamp()")  # Clock of the stamps
+        export_id = uuid.uuid4().hex[:12]
+        logger.info(
+            f"Exporting graph to {self.output_dir} "
+            f"({'full' if since is None else f'changes since {since} ms'})."
+        )
+        if since is None:
+            for dataset in ("nodes", "relationships"):
+                path = os.path.join(self.output_dir, dataset)
+                shutil.rmtree(path, ignore_errors=True)
+
+        schemas = self.fetch_node_schemas()
+        for label in NODE_LABELS:
+            rows = self.export_nodes(label, schemas.get(label, {}), since, export_id)
+            logger.info(f"Exported {rows} {label} nodes.")
+
+        for rel_type in self.fetch_relationship_types():
+            rows = self.export_relationships(rel_type, since, export_id)
+            logger.info(f"Exported {rows} '{rel_type}' relationships.")
+
+        self._write_state({"last_export_ms": started_ms, "last_export_id": export_id})
+
+    def fetch_node_schemas(self) -> dict[str, dict[str, pa.DataType]]:
+        """Build the Arrow type of every property of every exported label.
+
+        Properties stored with several types are exported as strings.
+
+        Returns
+        -------
+            dict: label -> property name -> Arrow type.
+
+        """
+        schemas: dict[str, dict[str, pa.DataType]] = {}
+        result = self.graph.run(
+            "CALL db.schema.nodeTypeProperties() "
+            "YIELD nodeLabels, propertyName, propertyTypes "
+            "RETURN nodeLabels, propertyName, propertyTypes"
+        )
+        for row in result:
+            if row["propertyName"] is None:
+                continue
+            types = row["propertyTypes"] or []
+            arrow_type = (
+                NEO4J_TO_ARROW.get(types[0], pa.string())
+                if len(types) == 1
+                else pa.string()
+            )
+            for label in row["nodeLabels"]:
+                if label not in NODE_LABELS:
+                    continue
+                fields = schemas.setdefault(label, {})
+                previous = fields.get(row["propertyName"])
+                if previous is not None and previous != arrow_type:
+                    arrow_type = pa.string()
+                fields[row["propertyName"]] = arrow_type
+        return schemas
+
+    def fetch_relationship_types(self) -> list[str]:
+        """Return the relationship types present in the graph."""
+        result = self.graph.run(
+            "CALL db.relationshipTypes() YIELD relationshipType "
+            "RETURN relationshipType ORDER BY relationshipType"
+        )
+        return [row["relationshipType"] for row in result]
+
+    def export_nodes(
+        self,
+        label: str,
+        properties: dict[str, pa.DataType],
+        since: str | None,
+        export_id: str,
+    ) -> int:
+        """Stream the nodes of a label into its Parquet dataset.
+
+        Returns
+        -------
+            int: Number of exported nodes.
+
+        """
+        reserved = {"element_id", *PARTITION_COLUMNS}
+        fields = [pa.field("element_id", pa.string())]
+        fields += [
+            pa.field(name, arrow_type)
+            for name, arrow_type in sorted(properties.items())
+            if name not in reserved
+        ]
+        fields += [pa.field(name, pa.string()) for name in PARTITION_COLUMNS]
+        schema = pa.schema(fields)
+        names = set(schema.names)
+
+        def rows() -> Iterator[dict[str, Any]]:
+            for record in self.graph.run(NODES_QUERY % {"label": label}, since=since):
+                props = dict(record["properties"])
+                row = {
+                    k: self._value(v, schema.field(k).type)
+                    for k, v in props.items()
+                    if k in names and k not in reserved
+                }
+                row["element_id"] = record["element_id"]
+                row.update(self._partition(props))
+                yield row
+
+        return self._write(
+            f"nodes/{label}", schema, rows(), export_id, PARTITION_COLUMNS, since
+        )
+
+    def export_relationships(
+        self, rel_type: str, since: str | None, export_id: str
+    ) -> int:
+        """Stream the relationships of a type into its Parquet dataset.
+
+        Returns
+        -------
+            int: Number of exported relationships.
+
+        """
+        schema = pa.schema(
+            [
+                pa.field("element_id", pa.string()),
+                pa.field("start_element_id", pa.string()),
+                pa.field("end_element_id", pa.string()),
+                pa.field("start_label", pa.string()),
+                pa.field("end_label", pa.string()),
+                pa.field("start_id", pa.string()),
+                pa.field("end_id", pa.string()),
+                pa.field("properties", pa.string()),
+                *(
+                    pa.field(name, pa.string())
+                    for name in RELATIONSHIP_PARTITION_COLUMNS
+                ),
+            ]
+        )
+
+        def rows() -> Iterator[dict[str, Any]]:
+            query = RELATIONSHIPS_QUERY % {"type": rel_type}
+            for record in self.graph.run(query, since=since):
+                row = dict(record)
+                row["start_id"] = self._text(row["start_id"])
+                row["end_id"] = self._text(row["end_id"])
+                row["properties"] = json.dumps(row["properties"] or {}, default=str)
+                row["organization"] = self.organization or UNKNOWN
+                yield row
+
+        return self._write(
+            f"relationships/{rel_type}",
+            schema,
+            rows(),
+            export_id,
+            RELATIONSHIP_PARTITION_COLUMNS,
+            since,
+        )
+
+    def _write(
+        self,
+        name: str,
+        schema: pa.Schema,
+        rows: Iterator[dict[str, Any]],
+        export_id: str,
+        partition_columns: list[str],
+        since: Any = None,
+    ) -> int:
+        count = 0
+        written: set[str] = set()
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            nonlocal count
+            batch: list[dict[str, Any]] = []
+            for row in rows:
+                batch.append(row)
+                if since is not None:
+                    written.add(row["element_id"])
+                if len(batch) >= self.batch_size:
+                    count += len(batch)
+                    yield pa.RecordBatch.from_pylist(batch, schema=schema)
+                    batch = []
+            if batch:
+                count += len(batch)
+                yield pa.RecordBatch.from_pylist(batch, schema=schema)
+
+        ds.write_dataset(
+            batches(),
+            os.path.join(self.output_dir, name),
+            schema=schema,
+            format="parquet",
+            partitioning=ds.partitioning(
+                pa.schema([schema.field(c) for c in partition_columns]),
+                flavor="hive",
+            ),
+            basename_template=f"part-{export_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        if written:
+            replaced = self._drop_replaced(name, export_id, written)
+            logger.info(f"{name}: {replaced} rows of earlier exports replaced.")
+        return count
+
+    def _drop_replaced(self, name: str, export_id: str, element_ids: set[str]) -> int:
+        """Remove the rows re-exported by ``export_id`` from earlier files.
+
+        Only the ``element_id`` column of the earlier files is read; a file
+        is rewritten when some of its rows were re-exported (an element may
+        also have moved to another partition), and removed when all were.
+        """
+        value_set = pa.array(sorted(element_ids), pa.string())
+        replaced = 0
+        for directory, _, files in os.walk(os.path.join(self.output_dir, name)):
+            for file in files:
+                if not file.endswith(".parquet") or file.startswith(
+                    f"part-{export_id}-"
+                ):
+                    continue
+                path = os.path.join(directory, file)
+                ids = pq.ParquetFile(path).read(columns=["element_id"])["element_id"]
+                stale = pc.is_in(ids, value_set=value_set)
+                count = pc.sum(stale).as_py() or 0
+                if not count:
+                    continue
+                if count == len(ids):
+                    os.remove(path)
+                else:
+                    kept = pq.ParquetFile(path).read().filter(pc.invert(stale))
+                    pq.write_table(kept, f"{path}.tmp")
+                    os.replace(f"{path}.tmp", path)
+                replaced += count
+        return replaced
+
+    def _partition(self, props: dict[str, Any]) -> dict[str, str]:
+        repository = self._text(props.get("repository") or props.get("full_name"))
+        organization = self.organization
+        if repository and "/" in repository:
+            organization = repository.split("/", 1)[0]
+        month = UNKNOWN
+        for name in DATE_PROPERTIES:
+            value = props.get(name)
+            if value:
+                month = self._text(value)[:7]  # YYYY-MM
+                break
+        return {
+            "organization": organization or UNKNOWN,
+            "repository": repository or UNKNOWN,
+            "month": month,
+        }
+
+    def _value(self, value: Any, arrow_type: pa.DataType) -> Any:
+        if value is None:
+            return None
+        if pa.types.is_string(arrow_type):
+            return self._text(value)
+        if pa.types.is_list(arrow_type) and not isinstance(value, list):
+            return None
+        return value
+
+    @staticmethod
+    def _text(value: Any) -> str | None:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, default=str)
+        return str(value)
+
+    def _read_state(self) -> dict[str, Any]:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, encoding="utf-8") as f:
+            return dict(json.load(f))
+
+    def _write_state(self, state: dict[str, Any]) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+
+
+def main() -> None:
+    """Export the graph from the command line."""
+    parser = argparse.ArgumentParser(prog="python -m src.report.export_parquet")
+    parser.add_argument("--output", help="Output directory (default: EXPORT_DIR).")
+    parser.add_argument(
+        "--full", action="store_true", help="Export everything, not only changes."
+    )
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+    GraphExporter(args.output, args.batch_size).run(full=args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import json  # noqa: I001
+import os  # noqa: I001
+import shutil  # noqa: I001
+from typing import Any  # noqa: I001
+
+
+class ReportCache:
+    """Rendered reports stored on disk with the graph watermark they reflect.
+
+    For each report the cache keeps the rendered markdown file and a JSON
+    metadata file with the watermark (label -> version) of the graph at
+    rendering time, plus any per-section data the report needs to
+    regenerate only what changed.
+    """
+
+    def __init__(self, directory: str | None = None) -> None:
+        """Initialize the cache.
+
+        Args:
+        ----
+            directory (str): Cache directory (defaults to ``REPORT_CACHE_DIR``
+                or ``report_cache``).
+
+        """
+        self.directory = directory or os.getenv("REPORT_CACHE_DIR", "report_cache")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def content_path(self, name: str) -> str:
+        """Path of the rendered markdown of a report."""
+        return os.path.join(self.directory, f"{name}.md")
+
+    def load(self, name: str) -> dict[str, Any]:
+        """Return the metadata of a cached report, or an empty dict."""
+        path = os.path.join(self.directory, f"{name}.json")
+        if not os.path.exists(path) or not os.path.exists(self.content_path(name)):
+            return {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                return dict(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self, name: str, metadata: dict[str, Any]) -> None:
+        """Store the metadata of a freshly rendered report."""
+        path = os.path.join(self.directory, f"{name}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, path)
+
+    def is_fresh(self, name: str, watermark: dict[str, int]) -> bool:
+        """Whether the cached report was rendered at the given watermark.
+
+        An empty watermark (a graph never written by a sink that maintains
+        watermarks) is never considered fresh.
+        """
+        return bool(watermark) and self.load(name).get("watermark") == watermark
+
+    def copy_to(self, name: str, path: str) -> None:
+        """Copy the rendered markdown of a report to ``path``."""
+        shutil.copyfile(self.content_path(name), path)
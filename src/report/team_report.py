@@ -1,7 +1,48 @@
 from py2neo import Graph  # noqa: I001
 from typing import Any  # noqa: I001
 import os  # noqa: I001
-from collections import defaultdict  # noqa: I001
+from collections.abc import Iterator  # noqa: I001
+from src.config.logging_config import LoggerFactory  # noqa: I001
+from src.report.report_cache import ReportCache  # noqa: I001
+
+logger = LoggerFactory.get_logger("report")
+
+# Watermark labels each report depends on (see SinkNeo4j.flush_watermarks)
+PEOPLE_LABELS = ["person", "organization"]
+TEAM_LABELS = ["team", "teammember", "person"]
+
+WATERMARK_QUERY = """MATCH (w:watermark) WHERE w.label IN $labels
+    RETURN w.label AS label, w.version AS version"""
+
+PEOPLE_QUERY = """MATCH (p:Person)-[:present_in]->(o:Organization)
+    RETURN coalesce(p.name, '') AS name,
+           coalesce(p.login, '') AS login,
+           coalesce(o.name, '') AS organization
+    ORDER BY name, p.id, o.id"""
+
+TEAM_MEMBERS_QUERY = """MATCH (t:Team)-[:has]->(tm:TeamMember)-[:is]->(p:Person)
+    WHERE t.deleted_at IS NULL AND tm.deleted_at IS NULL
+    RETURN coalesce(t.name, 'Unknown Team') AS team,
+           coalesce(p.name, '') AS name,
+           coalesce(p.login, '') AS login
+    ORDER BY team, name, tm.id"""
+
+TEAM_FINGERPRINTS_QUERY = """MATCH (t:Team)-[:has]->(tm:TeamMember)-[:is]->(p:Person)
+    WHERE t.deleted_at IS NULL AND tm.deleted_at IS NULL
+    RETURN coalesce(t.name, 'Unknown Team') AS team,
+           count(tm) AS members,
+           toString(max(t.created_node_at)) AS team_at,
+           toString(max(tm.created_node_at)) AS members_at,
+           toString(max(p.created_node_at)) AS people_at
+    ORDER BY team"""
+
+TEAM_SECTION_QUERY = """MATCH (t:Team)-[:has]->(tm:TeamMember)-[:is]->(p:Person)
+    WHERE coalesce(t.name, 'Unknown Team') = $team
+      AND t.deleted_at IS NULL AND tm.deleted_at IS NULL
+    RETURN coalesce(p.name, '') AS name,
+           coalesce(p.login, '') AS login,
+           toString(tm.id) AS member_id
+    ORDER BY name, member_id"""
 
 
 class TeamReport:
@@ -16,30 +57,45 @@ class TeamReport:
                 os.getenv("NEO4J_PASSWORD", ""),
             ),
         )
+        self.cache = ReportCache()
 
-    def fetch_persons_in_organizations(self) -> list[dict[str, Any]]:
-        """Fetch Persons who are PRESENT_IN an Organization.
+    def _stream(self, query: str) -> Iterator[dict[str, Any]]:
+        """Stream the rows of a query, sorted once by the server.
 
-        Returns
-        -------
-            list: list of dictionaries representing Persons and their Organizations.
+        Only the rendered columns are returned, so a row holds a few
+        strings instead of whole nodes.
 
-        """  # noqa: D205, D401
-        query = """MATCH (p:Person)-[:present_in]->(o:Organization)
-            WITH p, o
-            ORDER BY p.name
-            RETURN p, o"""
+        Args:
+        ----
+            query (str): Cypher query returning the rendered columns.
+
+        Yields:
+        ------
+            dict: One row at a time.
 
-        result = self.graph.run(query).data()
+        """
+        for record in self.graph.run(query):
+            yield dict(record)
 
-        people = []
-        for row in result:
-            person_props = dict(row["p"])
-            org_props = dict(row["o"])
-            person_props["organization"] = org_props
-            people.append(person_props)
+    def iter_persons_in_organizations(self) -> Iterator[dict[str, Any]]:
+        """Stream the rendered columns of Persons present in Organizations.
 
-        return people
+        Yields
+        ------
+            dict: ``name``, ``login`` and ``organization`` of one person.
+
+        """
+        return self._stream(PEOPLE_QUERY)
+
+    def iter_team_members(self) -> Iterator[dict[str, Any]]:
+        """Stream the rendered columns of TeamMembers ordered by team.
+
+        Yields
+        ------
+            dict: ``team``, ``name`` and ``login`` of one team member.
+
+        """
+        return self._stream(TEAM_MEMBERS_QUERY)
 
     def create_people_markdown(self) -> str:
         """Creates a markdown table from a list of people with their organization.
@@ -49,70 +105,145 @@ class TeamReport:
             str: Markdown formatted table.
 
         """  # noqa: D205, D401
-        people = self.fetch_persons_in_organizations()
-        md = ["# People on Organization"]
-        md.append("| Name | Login | Organization |")
-        md.append("|------|--------|--------------|")
-        for person in people:
-            name = person.get("name", "").strip()
-            login = person.get("login", "").strip().lower()
-            organization = person.get("organization", {}).get("name", "").strip()
-            md.append(f"| {name} | {login} | {organization} |")
-        return "\n".join(md)
-
-    def fetch_team_members_with_person(self) -> list[dict[str, Any]]:
-        """Fetch TeamMembers with their respective Team and Person info.
+        return "\n".join(self.iter_people_markdown())
+
+    def iter_people_markdown(self) -> Iterator[str]:
+        """Yield the lines of the people markdown table.
+
+        Yields
+        ------
+            str: One markdown line at a time.
+
+        """
+        yield "# People on Organization"
+        yield "| Name | Login | Organization |"
+        yield "|------|--------|--------------|"
+        for person in self.iter_persons_in_organizations():
+            name = person["name"].strip()
+            login = person["login"].strip().lower()
+            organization = person["organization"].strip()
+            yield f"| {name} | {login} | {organization} |"
+
+    def create_team_markdown(self) -> str:
+        """Create a markdown listing members grouped by team.
 
         Returns
         -------
-            list: list of dictionaries, each with team, team_member, and person.
+            str: Markdown formatted string.
 
         """  # noqa: D205, D401
-        query = """MATCH (t:Team)-[:has]->(tm:TeamMember)-[:is]->(p:Person)
-                RETURN t, tm, p ORDER BY t.name, p.name"""
+        return "\n".join(self.iter_team_markdown())
 
-        result = self.graph.run(query).data()
+    def iter_team_markdown(self) -> Iterator[str]:
+        """Yield the lines of the markdown listing members grouped by team.
 
-        members = []
-        for row in result:
-            team = dict(row["t"])
-            team_member = dict(row["tm"])
-            person = dict(row["p"])
+        Members are streamed in team order, so a team section is complete
+        as soon as the next team starts.
 
-            members.append({"team": team, "team_member": team_member, "person": person})
+        Yields
+        ------
+            str: One markdown line at a time.
 
-        return members
+        """
+        current = None
+        for member in self.iter_team_members():
+            if member["team"] != current:
+                if current is not None:
+                    yield ""  # empty line after each team
+                current = member["team"]
+                yield from self._team_header(current)
+            yield self._team_row(member)
+        if current is not None:
+            yield ""
 
-    def create_team_markdown(self) -> str:
-        """Create a markdown listing members grouped by team.
+    @staticmethod
+    def _team_header(team: str) -> list[str]:
+        return [f"## {team.strip()}", "| Name | Login |", "|------|-------|"]
 
-        Returns
+    @staticmethod
+    def _team_row(member: dict[str, Any]) -> str:
+        return f"| {member['name'].strip()} | {member['login'].strip().lower()} |"
+
+    def fetch_watermark(self, labels: list[str]) -> dict[str, int]:
+        """Fetch the change counters of the given labels.
+
+        Args:
+        ----
+            labels (list[str]): Lower-case labels (e.g., ``["person"]``).
+
+        Returns:
         -------
-            str: Markdown formatted string.
+            dict: label -> version, for the labels that have a watermark.
 
-        """  # noqa: D205, D401
-        members = self.fetch_team_members_with_person()
+        """
+        result = self.graph.run(WATERMARK_QUERY, labels=labels)
+        return {row["label"]: row["version"] for row in result}
+
+    def write_people_report(self, path: str) -> None:
+        """Write the people markdown, reusing the cached one when possible.
+
+        Args:
+        ----
+            path (str): The full file path (e.g., /data/people.md).
+
+        """
+        watermark = self.fetch_watermark(PEOPLE_LABELS)
+        if self.cache.is_fresh("people", watermark):
+            logger.info("People report unchanged since last run. Using cache.")
+        else:
+            logger.info("Rendering people report...")
+            self.write_markdown_lines(
+                self.iter_people_markdown(), self.cache.content_path("people")
+            )
+            self.cache.save("people", {"watermark": watermark})
+        self.cache.copy_to("people", path)
 
-        teams = defaultdict(list)
+    def write_team_report(self, path: str) -> None:
+        """Write the team markdown, re-rendering only the teams that changed.
 
-        for entry in members:
-            team_name = entry["team"].get("name", "Unknown Team").strip()
-            person_name = entry["person"].get("name", "").strip()
-            person_login = entry["person"].get("login", "").strip().lower()
+        When no team, member or person was written since the cached report,
+        the cache is served as is. Otherwise a per-team fingerprint (member
+        count and last write times) decides which sections are re-queried.
 
-            teams[team_name].append((person_name, person_login))
+        Args:
+        ----
+            path (str): The full file path (e.g., /data/team.md).
 
-        # Generate markdown
-        md = []
-        for team, people in sorted(teams.items()):
-            md.append(f"## {team}")
-            md.append("| Name | Login |")
-            md.append("|------|-------|")
-            for name, login in people:
-                md.append(f"| {name} | {login} |")
-            md.append("")  # empty line after each team
+        """
+        watermark = self.fetch_watermark(TEAM_LABELS)
+        if self.cache.is_fresh("team", watermark):
+            logger.info("Team report unchanged since last run. Using cache.")
+            self.cache.copy_to("team", path)
+            return
+
+        cached = self.cache.load("team").get("sections", {})
+        sections = {}
+        regenerated = 0
+        for row in self.graph.run(TEAM_FINGERPRINTS_QUERY):
+            fingerprint = dict(row)
+            team = fingerprint.pop("team")
+            section = cached.get(team)
+            if section is None or section["fingerprint"] != fingerprint:
+                members = self.graph.run(TEAM_SECTION_QUERY, team=team)
+                section = {
+                    "fingerprint": fingerprint,
+                    "lines": [self._team_row(dict(m)) for m in members],
+                }
+                regenerated += 1
+            sections[team] = section
+        logger.info(
+            f"Team report: {regenerated} of {len(sections)} teams re-rendered."
+        )
 
-        return "\n".join(md)
+        def lines() -> Iterator[str]:
+            for team, section in sections.items():
+                yield from self._team_header(team)
+                yield from section["lines"]
+                yield ""
+
+        self.write_markdown_lines(lines(), self.cache.content_path("team"))
+        self.cache.save("team", {"watermark": watermark, "sections": sections})
+        self.cache.copy_to("team", path)
 
     def save_markdown_to_file(self, markdown: str, path: str) -> None:
         """Save the markdown string to a file.
@@ -125,3 +256,20 @@ class TeamReport:
         """  # noqa: D205, D401
         with open(path, "w", encoding="utf-8") as f:
             f.write(markdown)
+
+    def write_markdown_lines(self, lines: Iterator[str], path: str) -> None:
+        """Write markdown lines to a file as they are produced.
+
+        Args:
+        ----
+            lines (Iterator[str]): Markdown lines (e.g., ``iter_people_markdown()``).
+            path (str): The full file path (e.g., /data/output.md).
+
+        """  # noqa: D205, D401
+        with open(path, "w", encoding="utf-8") as f:
+            first = True
+            for line in lines:
+                if not first:
+                    f.write("\n")
+                f.write(line)
+                first = False
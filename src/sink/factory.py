@@ -0,0 +1,38 @@
+import os  # noqa: I001
+from typing import Any  # noqa: I001
+from dotenv import load_dotenv  # noqa: I001
+
+BACKEND_PY2NEO = "py2neo"
+BACKEND_ASYNC = "neo4j-async"
+BACKEND_MEMORY = "memory"
+
+
+def create_sink(backend: str | None = None) -> Any:
+    """Create the Neo4j sink of the configured backend.
+
+    Args:
+    ----
+        backend (str): ``py2neo`` (default), ``neo4j-async`` (the official
+            driver's asyncio API) or ``memory`` (an in-memory graph, nothing
+            is written). Defaults to ``SINK_BACKEND``.
+
+    Returns:
+    -------
+        SinkNeo4j: The sink; every backend shares its interface.
+
+    """
+    load_dotenv()
+    backend = (backend or os.getenv("SINK_BACKEND", BACKEND_PY2NEO)).strip().lower()
+    if backend == BACKEND_PY2NEO:
+        from sink.sink_neo4j import SinkNeo4j
+
+        return SinkNeo4j()
+    if backend == BACKEND_ASYNC:
+        from sink.sink_neo4j_async import AsyncSinkNeo4j
+
+        return AsyncSinkNeo4j()
+    if backend == BACKEND_MEMORY:
+        from sink.sink_memory import MemorySink
+
+        return MemorySink()
+    raise ValueError(f"Unknown SINK_BACKEND: {backend}")
@@ -0,0 +1,152 @@
+import os  # noqa: I001
+import sqlite3  # noqa: I001
+import threading  # noqa: I001
+from collections.abc import Iterable  # noqa: I001
+from typing import Any  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("sink")
+
+# Marker of the graph the index was built against. Created once with a
+# random generation; a wiped database loses it, and the index with it.
+GENERATION_QUERY = """MERGE (g:graphgeneration {id: 'graph'})
+    ON CREATE SET g.generation = randomUUID(), g:GraphGeneration
+    RETURN g.generation AS generation"""
+
+SCHEMA = """CREATE TABLE IF NOT EXISTS keys (
+        label TEXT NOT NULL,
+        property TEXT NOT NULL,
+        value TEXT NOT NULL,
+        element_id TEXT NOT NULL,
+        PRIMARY KEY (label, property, value)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS keys_element_id ON keys (element_id);
+    CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);"""
+
+
+class KeyIndex:
+    """Persistent map of node keys to their Neo4j element ids.
+
+    Stored in a SQLite file next to the checkpoints, so it survives runs:
+    a node written or found once (e.g., the ``Repository`` of a
+    ``full_name``) is never looked up in the graph again, and
+    relationships to it are written by element id. The index belongs to
+    one generation of the graph and is cleared when the graph's
+    ``GraphGeneration`` marker changes (e.g., the database was wiped).
+    Thread safe.
+    """
+
+    def __init__(
+        self, path: str | None = None, enabled: bool | None = None
+    ) -> None:
+        """Open the index file.
+
+        Args:
+        ----
+            path (str): SQLite file (defaults to ``KEY_INDEX_PATH`` or
+                ``STATE_DIR/key_index.sqlite``).
+            enabled (bool): Whether to use the index (defaults to
+                ``KEY_INDEX`` not being ``off``).
+
+        """
+        if enabled is None:
+            enabled = os.getenv("KEY_INDEX", "on").strip().lower() != "off"
+        self.enabled = enabled
+        self.generation: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if not self.enabled:
+            return
+
+        if path is None:
+            path = os.getenv("KEY_INDEX_PATH") or os.path.join(
+                os.getenv("STATE_DIR", "state"), "key_index.sqlite"
+            )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def attach(self, generation: str) -> None:
+        """Bind the index to a graph generation, clearing it on a mismatch."""
+        if self._db is None:
+            return
+        self.generation = generation
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE name = 'generation'"
+            ).fetchone()
+            if row is None or row[0] != generation:
+                if row is not None:
+                    logger.info("Graph generation changed: key index cleared.")
+                self._db.execute("DELETE FROM keys")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('generation', ?)",
+                    (generation,),
+                )
+                self._db.commit()
+            count = self._db.execute("SELECT count(*) FROM keys").fetchone()[0]
+        logger.info(f"Key index {self.path}: {count} keys (generation {generation}).")
+
+    def get(self, label: str, property: str, value: Any) -> str | None:
+        """Return the element id of a node, or None when unknown."""
+        if self._db is None or value is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT element_id FROM keys "
+                "WHERE label = ? AND property = ? AND value = ?",
+                (label.strip().lower(), property, str(value)),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def add(
+        self, label: str, property: str, value: Any, element_id: str | None
+    ) -> None:
+        """Remember the element id of a node; committed in batches."""
+        if self._db is None or value is None or element_id is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO keys VALUES (?, ?, ?, ?)",
+                (label.strip().lower(), property, str(value), element_id),
+            )
+            self._pending += 1
+            if self._pending >= 1000:
+                self._commit()
+
+    def discard(self, label: str, property: str, values: Iterable[Any]) -> None:
+        """Forget deleted nodes, under every property they were indexed by."""
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.executemany(
+                "DELETE FROM keys WHERE element_id IN ("
+                "SELECT element_id FROM keys "
+                "WHERE label = ? AND property = ? AND value = ?)",
+                [(label.strip().lower(), property, str(v)) for v in values],
+            )
+            self._commit()
+
+    def flush(self) -> None:
+        """Commit the entries added since the last commit."""
+        if self._db is None:
+            return
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        if self._pending or self._db.in_transaction:
+            self._db.commit()
+        self._pending = 0
@@ -0,0 +1,162 @@
+import random  # noqa: I001
+import time  # noqa: I001
+from collections.abc import Callable, Iterator, Sequence  # noqa: I001
+from concurrent.futures import ThreadPoolExecutor  # noqa: I001
+from typing import Any  # noqa: I001
+from zlib import crc32  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("sink")
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a Neo4j error is transient (deadlock, lock timeout...)."""
+    code = str(getattr(error, "code", "") or "")
+    name = type(error).__name__
+    return (
+        "TransientError" in code
+        or "DeadlockDetected" in code
+        or name in ("TransientError", "DeadlockDetected")
+    )
+
+
+def partition_of(value: Any, partitions: int) -> int:
+    """Stable partition of a key value (independent of PYTHONHASHSEED)."""
+    return crc32(str(value).encode("utf-8")) % partitions
+
+
+def chunks(rows: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """Split rows into consecutive chunks of at most ``size`` rows."""
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+class ParallelWriter:
+    """Run batched Cypher writes on several threads.
+
+    Rows are partitioned by the hash of the head of their key, and each
+    partition is written by a single thread, so two concurrent node
+    merges never lock the same node. Within a partition, rows are sorted
+    by key so that locks are always taken in the same order; transient
+    errors (deadlocks, lock timeouts) are retried with exponential
+    backoff.
+
+    Relationship rows are partitioned by their start key only: their end
+    nodes (a branch, a parent commit) are shared across partitions and
+    locked by concurrent transactions, which can deadlock. The sinks
+    write relationship batches with ``NEO4J_RELATIONSHIP_WRITERS`` (one
+    by default) for that reason.
+    """
+
+    def __init__(
+        self,
+        graph: Any,
+        writers: int = 4,
+        batch_size: int = 1000,
+        max_retries: int = 5,
+        on_batch: Callable[[str, dict[str, Any], float], None] | None = None,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+        ----
+            graph (Graph): py2neo Graph used to open transactions.
+            writers (int): Number of writer threads.
+            batch_size (int): Rows per transaction.
+            max_retries (int): Attempts for a batch failing transiently.
+            on_batch (Callable): Called with the query, its parameters and
+                the seconds taken by every committed batch.
+
+        """
+        self.graph = graph
+        self.writers = max(1, writers)
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.on_batch = on_batch
+
+    def write(
+        self,
+        query: str,
+        rows: Sequence[dict[str, Any]],
+        key: Callable[[dict[str, Any]], Any],
+        writers: int | None = None,
+    ) -> None:
+        """Write rows with ``query`` (which must ``UNWIND $rows AS row``).
+
+        Args:
+        ----
+            query (str): Cypher query run once per batch.
+            rows (Sequence[dict]): Parameters of each row.
+            key (Callable): Returns the lock key of a row (the merged node
+                key, or the (start, end) pair of a relationship).
+            writers (int): Threads for this write (defaults to the
+                writer's).
+
+        """
+        if not rows:
+            return
+
+        writers = max(1, writers or self.writers)
+        partitions: list[list[dict[str, Any]]] = [[] for _ in range(writers)]
+        for row in rows:
+            lock_key = key(row)
+            head = lock_key[0] if isinstance(lock_key, tuple) else lock_key
+            partitions[partition_of(head, writers)].append(row)
+
+        def ordering(row: dict[str, Any]) -> tuple[str, ...]:
+            lock_key = key(row)
+            values = lock_key if isinstance(lock_key, tuple) else (lock_key,)
+            return tuple(str(v) for v in values)
+
+        for partition in partitions:
+            partition.sort(key=ordering)
+
+        if writers == 1:
+            self._write_partition(query, partitions[0])
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=writers, thread_name_prefix="neo4j-writer"
+        ) as executor:
+            futures = [
+                executor.submit(self._write_partition, query, partition)
+                for partition in partitions
+                if partition
+            ]
+            for future in futures:
+                future.result()  # Re-raise the first failure
+
+    def _write_partition(self, query: str, rows: Sequence[dict[str, Any]]) -> None:
+        for batch in chunks(rows, self.batch_size):
+            self._write_batch(query, batch)
+
+    def _write_batch(self, query: str, batch: Sequence[dict[str, Any]]) -> None:
+        for attempt in range(1, self.max_retries + 1):
+            started = time.perf_counter()
+            tx = self.graph.begin()
+            try:
+                parameters = {"rows": list(batch)}
+                tx.run(query, parameters)
+                self.graph.commit(tx)
+                if self.on_batch is not None:
+                    self.on_batch(query, parameters, time.perf_counter() - started)
+                return
+            except Exception as e:
+                self._rollback(tx)
+                if not is_transient(e) or attempt == self.max_retries:
+                    raise
+                delay = min(5.0, 0.1 * 2**attempt) * (0.5 + random.random())  # noqa: S311
+                logger.warning(
+                    f"Transient error on batch of {len(batch)} rows "
+                    f"(attempt {attempt}/{self.max_retries}), "
+                    f"retrying in {delay:.2f}s: {e}"
+                )
+                time.sleep(delay)
+
+    def _rollback(self, tx: Any) -> None:
+        try:
+            self.graph.rollback(tx)
+        except Exception as e:  # The transaction may already be closed
+            logger.debug(f"Rollback failed: {e}")
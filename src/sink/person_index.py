@@ -0,0 +1,40 @@
+import threading  # noqa: I001
+from typing import Any  # noqa: I001
+
+
+class PersonIndex:
+    """In-memory index of the Person nodes known to exist, by login.
+
+    Person nodes are keyed by login and shared by every organization, so
+    extractors sharing a sink (e.g., the multi-organization runner) also
+    share this index: a person seen by one organization is never looked
+    up again by the others. Thread safe.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._nodes: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, login: Any) -> Any:
+        """Return the node of a login, or None when unknown."""
+        with self._lock:
+            node = self._nodes.get(str(login))
+            if node is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return node
+
+    def add(self, login: Any, node: Any) -> None:
+        """Remember the node of a login."""
+        if login is None or node is None:
+            return
+        with self._lock:
+            self._nodes[str(login)] = node
+
+    def __len__(self) -> int:
+        """Return the number of indexed people."""
+        return len(self._nodes)
@@ -0,0 +1,317 @@
+import os  # noqa: I001
+import random  # noqa: I001
+import re  # noqa: I001
+import threading  # noqa: I001
+from collections.abc import Callable  # noqa: I001
+from datetime import UTC, datetime  # noqa: I001
+from typing import Any  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("sink")
+
+PLAN_OFF = "off"
+PLAN_EXPLAIN = "explain"
+PLAN_PROFILE = "profile"
+
+# Latency samples kept per query shape (reservoir sampling beyond it).
+MAX_SAMPLES = 10_000
+
+# Plan operators worth a look in a write pipeline.
+SCAN_OPERATORS = ("AllNodesScan", "NodeByLabelScan", "DirectedRelationshipTypeScan")
+
+
+def shape_of(query: str) -> str:
+    """Return the shape of a query: whitespace collapsed, literals hidden."""
+    shape = re.sub(r"\s+", " ", query).strip()
+    shape = re.sub(r"'(?:[^'\\]|\\.)*'", "'?'", shape)
+    return re.sub(r"(?<![\w$`])\d+(?:\.\d+)?\b", "?", shape)
+
+
+def size_of(parameters: dict[str, Any]) -> int:
+    """Size of the parameters of a query: rows of a batch, else one."""
+    rows = parameters.get("rows")
+    return len(rows) if isinstance(rows, list) else 1
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of unsorted samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def find_issues(plan: dict[str, Any]) -> list[str]:
+    """Flag the scans, eager operators and likely missing indexes of a plan.
+
+    Args:
+    ----
+        plan (dict): Normalized plan (``operator``, ``details``,
+            ``children``), see ``SinkNeo4j.plan``.
+
+    Returns:
+    -------
+        list[str]: One line per issue found.
+
+    """
+    issues = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        operator = str(node.get("operator", ""))
+        details = str(node.get("details", ""))
+        name = operator.split("@")[0]
+        if name in SCAN_OPERATORS:
+            issues.append(f"{name} {details}".strip())
+        if name == "Filter" and any(
+            child.get("operator", "").split("@")[0] in SCAN_OPERATORS
+            for child in node.get("children", [])
+        ):
+            issues.append(f"Filter on a scan, missing index? {details}".strip())
+        if "Eager" in name:
+            issues.append(f"{name} {details}".strip())
+        stack.extend(node.get("children", []))
+    return issues
+
+
+class QueryStats:
+    """Latencies and parameter sizes of one query shape."""
+
+    def __init__(self, shape: str) -> None:
+        """Initialize empty statistics."""
+        self.shape = shape
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.samples: list[float] = []
+        self.plan: dict[str, Any] | None = None
+        self.issues: list[str] = []
+
+    def add(self, seconds: float, rows: int, slow: bool) -> None:
+        """Record one execution."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.rows += rows
+        self.slow += slow
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(seconds)
+        else:
+            slot = random.randrange(self.count)  # noqa: S311
+            if slot < MAX_SAMPLES:
+                self.samples[slot] = seconds
+
+
+class QueryLog:
+    """Timings of the queries issued by the sinks, ranked by total time.
+
+    Every query or batch is recorded under its shape. The first time a
+    shape runs slower than ``SLOW_QUERY_MS``, its plan is collected once
+    (``EXPLAIN``, or ``PROFILE`` in a rolled back transaction) and
+    checked for label scans, eager operators and likely missing indexes.
+    Shared by every sink of the process; thread safe.
+    """
+
+    def __init__(
+        self, threshold_ms: float | None = None, plan_mode: str | None = None
+    ) -> None:
+        """Initialize the log.
+
+        Args:
+        ----
+            threshold_ms (float): Latency above which a query is slow
+                (defaults to ``SLOW_QUERY_MS`` or 500).
+            plan_mode (str): ``explain``, ``profile`` or ``off`` (defaults
+                to ``SLOW_QUERY_PLAN`` or ``explain``).
+
+        """
+        if threshold_ms is None:
+            threshold_ms = float(os.getenv("SLOW_QUERY_MS", "500"))
+        self.threshold = threshold_ms / 1000
+        plan_mode = plan_mode or os.getenv("SLOW_QUERY_PLAN", PLAN_EXPLAIN)
+        self.plan_mode = plan_mode.strip().lower()
+        if self.plan_mode not in (PLAN_OFF, PLAN_EXPLAIN, PLAN_PROFILE):
+            raise ValueError(f"Unknown SLOW_QUERY_PLAN: {self.plan_mode}")
+        self.stats: dict[str, QueryStats] = {}
+        self._planned: set[str] = set()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        query: str,
+        parameters: dict[str, Any],
+        seconds: float,
+        plan: Callable[[str, dict[str, Any], str], dict[str, Any]] | None = None,
+    ) -> None:
+        """Record one execution of a query.
+
+        Args:
+        ----
+            query (str): Cypher query as issued.
+            parameters (dict): Its parameters.
+            seconds (float): Latency, including the commit of batches.
+            plan (Callable): Returns the plan of a query in a mode; called
+                once per slow shape.
+
+        """
+        shape = shape_of(query)
+        slow = seconds >= self.threshold
+        with self._lock:
+            stats = self.stats.get(shape)
+            if stats is None:
+                stats = self.stats[shape] = QueryStats(shape)
+            stats.add(seconds, size_of(parameters), slow)
+            collect = (
+                slow
+                and plan is not None
+                and self.plan_mode != PLAN_OFF
+                and shape not in self._planned
+            )
+            if collect:
+                self._planned.add(shape)
+        if collect:
+            self._collect_plan(stats, query, parameters, plan)
+
+    def _collect_plan(
+        self,
+        stats: QueryStats,
+        query: str,
+        parameters: dict[str, Any],
+        plan: Callable[[str, dict[str, Any], str], dict[str, Any]],
+    ) -> None:
+        try:
+            tree = plan(query, parameters, self.plan_mode)
+        except Exception as e:  # A plan is a diagnostic: never fail the load
+            logger.warning(f"Could not collect the plan of a slow query: {e}")
+            return
+        issues = find_issues(tree) if tree else []
+        with self._lock:
+            stats.plan = tree
+            stats.issues = issues
+        if issues:
+            logger.warning(f"Slow query plan issues: {issues} in {stats.shape[:200]}")
+
+    def ranked(self) -> list[QueryStats]:
+        """Query shapes by total time, slowest first."""
+        with self._lock:
+            return sorted(self.stats.values(), key=lambda s: s.total, reverse=True)
+
+    def write_report(self, path: str | None = None, limit: int = 50) -> str | None:
+        """Write the ranked query report (Markdown).
+
+        Args:
+        ----
+            path (str): Report file (defaults to ``QUERY_REPORT_PATH`` or
+                ``LOG_DIR/slow_queries.md``).
+            limit (int): Query shapes listed.
+
+        Returns:
+        -------
+            str: The path written, or None when no query was recorded.
+
+        """
+        ranked = self.ranked()
+        if not ranked:
+            return None
+        path = path or os.getenv("QUERY_REPORT_PATH") or os.path.join(
+            os.getenv("LOG_DIR", "logs"), "slow_queries.md"
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        threshold = self.threshold * 1000
+        lines = [
+            "# Neo4j query report",
+            "",
+            f"Generated {datetime.now(UTC).isoformat()}. "
+            f"Slow threshold {threshold:.0f} ms, plans: {self.plan_mode}.",
+            "",
+            "| # | calls | slow | total s | p50 ms | p95 ms | p99 ms | max ms "
+            "| rows/call | query |",
+            "|---|------:|-----:|--------:|-------:|-------:|-------:|-------:"
+            "|----------:|-------|",
+        ]
+        for rank, stats in enumerate(ranked[:limit], 1):
+            shape = stats.shape.replace("|", "\\|")
+            shape = shape if len(shape) <= 160 else shape[:157] + "..."
+            lines.append(
+                f"| {rank} | {stats.count} | {stats.slow} | {stats.total:.2f} "
+                f"| {percentile(stats.samples, 0.50) * 1000:.1f} "
+                f"| {percentile(stats.samples, 0.95) * 1000:.1f} "
+                f"| {percentile(stats.samples, 0.99) * 1000:.1f} "
+                f"| {stats.max * 1000:.1f} "
+                f"| {stats.rows / stats.count:.0f} | `{shape}` |"
+            )
+
+        planned = [s for s in ranked if s.plan is not None]
+        if planned:
+            lines += ["", "## Plans of the slow queries"]
+        for stats in planned:
+            lines += ["", "```cypher", stats.shape, "```", ""]
+            if stats.issues:
+                lines += [f"- **{issue}**" for issue in stats.issues]
+            else:
+                lines.append("- No scan or eager operator.")
+            lines += ["", "```", *self._render(stats.plan), "```"]
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        logger.info(f"Query report written to {path} ({len(ranked)} query shapes).")
+        return path
+
+    @staticmethod
+    def _render(plan: dict[str, Any], depth: int = 0) -> list[str]:
+        """Indented text of a plan tree."""
+        line = f"{'  ' * depth}{plan.get('operator', '?')}"
+        if plan.get("details"):
+            line += f" {plan['details']}"
+        if plan.get("db_hits") is not None:
+            line += f" (db hits {plan['db_hits']}, rows {plan.get('rows')})"
+        lines = [line]
+        for child in plan.get("children", []):
+            lines += QueryLog._render(child, depth + 1)
+        return lines
+
+
+def normalize_plan(plan: Any) -> dict[str, Any]:
+    """Normalize a py2neo or neo4j driver plan to plain dictionaries.
+
+    Both expose the operator type, arguments (whose ``Details`` describe
+    labels, properties and indexes) and children, under different names.
+    """
+    if plan is None:
+        return {}
+    if isinstance(plan, dict):
+        operator = plan.get("operatorType") or plan.get("operator_type")
+        args = plan.get("args") or plan.get("arguments") or {}
+        children = plan.get("children") or []
+        db_hits = plan.get("dbHits", plan.get("db_hits"))
+        rows = plan.get("rows")
+    else:
+        operator = getattr(plan, "operator_type", None)
+        args = getattr(plan, "args", None) or {}
+        children = getattr(plan, "children", None) or []
+        db_hits = getattr(plan, "db_hits", None)
+        rows = getattr(plan, "rows", None)
+    return {
+        "operator": str(operator or "?"),
+        "details": str(args.get("Details") or args.get("details") or ""),
+        "db_hits": db_hits,
+        "rows": rows,
+        "children": [normalize_plan(child) for child in children],
+    }
+
+
+_query_log: QueryLog | None = None
+_query_log_lock = threading.Lock()
+
+
+def get_query_log() -> QueryLog:
+    """Return the query log shared by every sink of the process."""
+    global _query_log
+    with _query_log_lock:
+        if _query_log is None:
+            _query_log = QueryLog()
+        return _query_log
@@ -0,0 +1,190 @@
+import sys  # noqa: I001
+from collections.abc import Iterator  # noqa: I001
+from dataclasses import dataclass  # noqa: I001
+from typing import Any  # noqa: I001
+
+
+# Property values repeated across many records (repository full names,
+# logins, states...). They are interned so each distinct value is stored
+# once, however many records carry it. Property names are always interned.
+INTERNED_FIELDS = frozenset(
+    {
+        "repository",
+        "full_name",
+        "login",
+        "name",
+        "state",
+        "branch",
+        "type",
+        "author_association",
+        "user.login",
+        "author.login",
+        "committer.login",
+        "assignee.login",
+        "creator.login",
+        "owner.login",
+        "milestone.title",
+        "head.ref",
+        "base.ref",
+        "team_slug",
+        "created_node_at",
+    }
+)
+
+
+def intern_properties(properties: dict[str, Any]) -> dict[str, Any]:
+    """Return the properties with interned names and repeated values."""
+    return {
+        sys.intern(k): (
+            sys.intern(v) if k in INTERNED_FIELDS and isinstance(v, str) else v
+        )
+        for k, v in properties.items()
+    }
+
+
+@dataclass(slots=True)
+class NodeRecord:
+    """Lightweight node payload: its label, key property and properties.
+
+    Replaces the py2neo ``Node`` built for every loaded record: no
+    subgraph, label set or binding state is kept client-side, only the
+    data the sink needs to ``MERGE`` the node. ``element_id`` is filled
+    in by the sink once the node is persisted.
+
+    Records behave like a read-only mapping of their properties, so
+    ``record["id"]`` and ``dict(record)`` work as they did for ``Node``.
+    """
+
+    label: str
+    key: str
+    properties: dict[str, Any]
+    element_id: str | None = None
+
+    @property
+    def value(self) -> Any:
+        """Value of the key property."""
+        return self.properties.get(self.key)
+
+    def __getitem__(self, name: str) -> Any:
+        """Return a property."""
+        return self.properties[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return a property, or ``default`` when missing."""
+        return self.properties.get(name, default)
+
+    def keys(self) -> Any:
+        """Return the property names."""
+        return self.properties.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the property names."""
+        return iter(self.properties)
+
+    def __len__(self) -> int:
+        """Return the number of properties."""
+        return len(self.properties)
+
+
+class Commit(NodeRecord):
+    """Commit node."""
+
+    __slots__ = ()
+
+
+class Issue(NodeRecord):
+    """Issue node."""
+
+    __slots__ = ()
+
+
+class PullRequest(NodeRecord):
+    """Pull request node."""
+
+    __slots__ = ()
+
+
+class Person(NodeRecord):
+    """Person node (GitHub user)."""
+
+    __slots__ = ()
+
+
+class Label(NodeRecord):
+    """Issue/pull request label node."""
+
+    __slots__ = ()
+
+
+class Milestone(NodeRecord):
+    """Milestone node."""
+
+    __slots__ = ()
+
+
+class Branch(NodeRecord):
+    """Branch node."""
+
+    __slots__ = ()
+
+
+class Repository(NodeRecord):
+    """Repository node."""
+
+    __slots__ = ()
+
+
+class Team(NodeRecord):
+    """Team node."""
+
+    __slots__ = ()
+
+
+class TeamMember(NodeRecord):
+    """Team member node."""
+
+    __slots__ = ()
+
+
+class Project(NodeRecord):
+    """Project node."""
+
+    __slots__ = ()
+
+
+RECORD_TYPES: dict[str, type[NodeRecord]] = {
+    cls.__name__: cls
+    for cls in (
+        Commit,
+        Issue,
+        PullRequest,
+        Person,
+        Label,
+        Milestone,
+        Branch,
+        Repository,
+        Team,
+        TeamMember,
+        Project,
+    )
+}
+
+
+def make_record(label: str, key: str, properties: dict[str, Any]) -> NodeRecord:
+    """Build the record type of a label with interned properties.
+
+    Args:
+    ----
+        label (str): Node label (e.g., "Commit").
+        key (str): Key property of the node.
+        properties (dict): Node properties.
+
+    Returns:
+    -------
+        NodeRecord: The record (a ``NodeRecord`` for unknown labels).
+
+    """
+    record_type = RECORD_TYPES.get(label, NodeRecord)
+    return record_type(
+        sys.intern(label), sys.intern(key), intern_properties(properties)
+    )
@@ -0,0 +1,78 @@
+from typing import Any  # noqa: I001
+
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("sink")
+
+# Merge labels (lower-case) and their key property. Extractors of several
+# organizations and date windows write concurrently: without a uniqueness
+# constraint, two MERGEs of the same key in concurrent transactions may
+# each create a node. The constraint also backs the key lookups.
+UNIQUE_KEYS: tuple[tuple[str, str], ...] = (
+    ("person", "id"),
+    ("activity", "id"),
+    ("repository", "id"),
+    ("commit", "id"),
+    ("issue", "id"),
+    ("pullrequest", "id"),
+    ("branch", "id"),
+    ("label", "id"),
+    ("milestone", "id"),
+    ("team", "id"),
+    ("teammember", "id"),
+    ("project", "id"),
+    ("softwareartifact", "id"),
+    ("organization", "id"),
+)
+
+# Lookups on other properties than the key: (label, properties).
+INDEXES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("pullrequest", ("repository", "number")),  # PR-backed issues (CIRO)
+)
+
+CREATE_CONSTRAINT = (
+    "CREATE CONSTRAINT %(label)s_%(key)s_unique IF NOT EXISTS "
+    "FOR (n:`%(label)s`) REQUIRE n.`%(key)s` IS UNIQUE"
+)
+
+CREATE_INDEX = (
+    "CREATE INDEX %(label)s_%(name)s IF NOT EXISTS "
+    "FOR (n:`%(label)s`) ON (%(properties)s)"
+)
+
+
+def ensure_constraints(sink: Any) -> list[str]:
+    """Create the uniqueness constraints of the merge labels, and the indexes.
+
+    A constraint that cannot be created (e.g., the label already holds
+    duplicate keys, or the user lacks the schema privilege) is logged and
+    skipped: the load still runs, without the guarantee for that label.
+
+    Args:
+    ----
+        sink (SinkNeo4j): Sink used to run the schema queries.
+
+    Returns:
+    -------
+        list: Labels left without a constraint.
+
+    """
+    missing = []
+    for label, key in UNIQUE_KEYS:
+        try:
+            sink.run(CREATE_CONSTRAINT % {"label": label, "key": key})
+        except Exception as e:
+            logger.warning(f"No uniqueness constraint on :{label}({key}): {e}")
+            missing.append(label)
+    for label, properties in INDEXES:
+        names = {
+            "label": label,
+            "name": "_".join(properties),
+            "properties": ", ".join(f"n.`{p}`" for p in properties),
+        }
+        try:
+            sink.run(CREATE_INDEX % names)
+        except Exception as e:
+            logger.warning(f"No index on :{label}({', '.join(properties)}): {e}")
+    return missing
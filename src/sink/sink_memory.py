@@ -0,0 +1,377 @@
+import math  # noqa: I001
+import os  # noqa: I001
+import threading  # noqa: I001
+from collections import Counter, defaultdict  # noqa: I001
+from collections.abc import Callable, Hashable, Sequence  # noqa: I001
+from typing import Any  # noqa: I001
+from dotenv import load_dotenv  # noqa: I001
+from py2neo import Node, Relationship  # noqa: I001
+from src.sink.key_index import KeyIndex  # noqa: I001
+from src.sink.parallel_writer import partition_of  # noqa: I001
+from src.sink.person_index import PersonIndex  # noqa: I001
+from src.sink.query_log import get_query_log, shape_of, size_of  # noqa: I001
+from src.sink.records import NodeRecord, make_record  # noqa: I001
+from sink.sink_neo4j import SinkNeo4j  # noqa: I001
+
+
+class WritePlan:
+    """Writes a run would send to Neo4j, counted per label and type.
+
+    Nodes are counted per merge label: ``new`` nodes are missing from the
+    key snapshot (or every distinct node without one), ``existing`` ones
+    are in it, and ``repeated`` merges hit a node already merged by the
+    run. Relationships are counted per type; ``unmatched`` ones have an
+    endpoint that is neither written by the run nor in the snapshot, and
+    would be skipped by Neo4j. Custom queries (aggregates, watermarks,
+    reconciliation) are not simulated, only counted by shape.
+    """
+
+    def __init__(self, snapshot: bool, batch_size: int, writers: int) -> None:
+        """Initialize an empty plan."""
+        self.snapshot = snapshot
+        self.batch_size = batch_size
+        self.writers = writers
+        self.nodes: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self.relationships: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self.queries: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self.transactions = 0
+
+    def render(self) -> str:
+        """Return the plan as a text report."""
+        lines = ["Dry run write plan"]
+        if not self.snapshot:
+            lines.append("(no key snapshot: every distinct node counts as new)")
+        lines += [
+            "",
+            f"{'nodes (merge label)':<32} {'merges':>10} {'new':>10} "
+            f"{'existing':>10} {'repeated':>10}",
+        ]
+        for label, c in sorted(self.nodes.items()):
+            merges = c["new"] + c["existing"] + c["repeated"]
+            lines.append(
+                f"{label:<32} {merges:>10} {c['new']:>10} "
+                f"{c['existing']:>10} {c['repeated']:>10}"
+            )
+        lines += [
+            "",
+            f"{'relationships (type)':<32} {'merges':>10} {'new':>10} "
+            f"{'repeated':>10} {'unmatched':>10}",
+        ]
+        for rel_type, c in sorted(self.relationships.items()):
+            merges = c["new"] + c["repeated"] + c["unmatched"]
+            lines.append(
+                f"{rel_type:<32} {merges:>10} {c['new']:>10} "
+                f"{c['repeated']:>10} {c['unmatched']:>10}"
+            )
+        if self.queries:
+            lines += [
+                "",
+                f"{'other queries (not simulated)':<54} {'calls':>10} {'rows':>10}",
+            ]
+        for shape, c in sorted(self.queries.items(), key=lambda i: -i[1]["rows"]):
+            shape = shape if len(shape) <= 54 else shape[:51] + "..."
+            lines.append(f"{shape:<54} {c['calls']:>10} {c['rows']:>10}")
+        lines += [
+            "",
+            f"Estimated write transactions: {self.transactions} "
+            f"(batch size {self.batch_size}, {self.writers} writers).",
+        ]
+        return "\n".join(lines)
+
+
+class MemorySink(SinkNeo4j):
+    """In-memory graph with the interface of ``SinkNeo4j``.
+
+    Nodes are merged on their lower-case label and key and relationships
+    on their endpoints and type, like the Cypher ``MERGE`` of the Neo4j
+    sinks; lookups go through per label and property indexes built on
+    first use. Nothing is sent anywhere: every write is counted in a
+    ``WritePlan`` instead, to size a load or run the extractors offline
+    (``python -m src.main --dry-run``, or ``SINK_BACKEND=memory``).
+
+    An optional key snapshot (a key index file, see ``KeyIndex``) tells
+    the nodes already in the graph from the new ones.
+    """
+
+    persistent = False
+
+    def __init__(self, snapshot: str | None = None) -> None:
+        """Create an empty graph.
+
+        Args:
+        ----
+            snapshot (str): Key index file of the target graph (optional).
+
+        """
+        load_dotenv()
+        self.queries = get_query_log()
+        self.changes = Counter()
+        self.people = PersonIndex()
+        self._changes_lock = threading.Lock()
+        self.keys = KeyIndex(enabled=False)  # Every lookup must see this graph
+        self.snapshot = KeyIndex(path=snapshot, enabled=True) if snapshot else None
+        self.batch_size = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
+        self.writers = max(1, int(os.getenv("NEO4J_WRITERS", "1")))
+        self.relationship_writers = int(os.getenv("NEO4J_RELATIONSHIP_WRITERS", "1"))
+        self.writes = WritePlan(snapshot is not None, self.batch_size, self.writers)
+        self.properties: dict[str, dict[str, Any]] = {}  # Element id -> props
+        self.labels: dict[str, set[str]] = {}  # Element id -> labels
+        self.members: defaultdict[str, list[str]] = defaultdict(list)
+        self.relationships: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._indexes: dict[tuple[str, str], defaultdict[Any, list[str]]] = {}
+        self._placeholders: set[str] = set()  # Snapshot nodes not written
+        self._lock = threading.RLock()
+
+    def _index(self, label: str, property: str) -> defaultdict[Any, list[str]]:
+        """Return the index of a label and property, built on first use."""
+        index = self._indexes.get((label, property))
+        if index is None:
+            index = self._indexes[(label, property)] = defaultdict(list)
+            for element_id in self.members[label]:
+                value = self.properties[element_id].get(property)
+                if isinstance(value, Hashable) and value is not None:
+                    index[value].append(element_id)
+        return index
+
+    def _merge(
+        self,
+        label: str,
+        key: str,
+        value: Any,
+        properties: dict[str, Any],
+        labels: list[str],
+    ) -> str:
+        """MERGE a node on its label and key; return its element id."""
+        with self._lock:
+            found = self._index(label, key).get(value)
+            stats = self.writes.nodes[label]
+            if found and found[0] in self._placeholders:
+                element_id = found[0]
+                self._placeholders.discard(element_id)
+                stats["existing"] += 1
+            elif found:
+                element_id = found[0]
+                stats["repeated"] += 1
+            else:
+                existing = (
+                    self.snapshot is not None
+                    and self.snapshot.get(label, key, value) is not None
+                )
+                stats["existing" if existing else "new"] += 1
+                element_id = self._add(label, {key: value})
+            before = dict(self.properties[element_id])
+            self.properties[element_id].update(properties)
+            self.labels[element_id].update(labels)
+            self._reindex(label, element_id, before)
+            return element_id
+
+    def _add(self, label: str, properties: dict[str, Any]) -> str:
+        """Create a node and index it."""
+        element_id = f"memory:{len(self.properties)}"
+        self.properties[element_id] = properties
+        self.labels[element_id] = {label}
+        self.members[label].append(element_id)
+        self._reindex(label, element_id, {})
+        return element_id
+
+    def _reindex(self, label: str, element_id: str, before: dict[str, Any]) -> None:
+        """Update the indexes of a label after a write to one of its nodes."""
+        properties = self.properties[element_id]
+        for (indexed, property), index in self._indexes.items():
+            if indexed != label:
+                continue
+            old, new = before.get(property), properties.get(property)
+            if old == new and old is not None:
+                continue
+            if isinstance(old, Hashable) and element_id in index.get(old, ()):
+                index[old].remove(element_id)
+            if isinstance(new, Hashable) and new is not None:
+                index[new].append(element_id)
+
+    def _resolve(self, label: str, key: str, value: Any) -> str | None:
+        """Element id of a node by key: written by the run, or in the snapshot."""
+        with self._lock:
+            found = self._index(label, key).get(value)
+            if found:
+                return found[0]
+            if self.snapshot is None or self.snapshot.get(label, key, value) is None:
+                return None
+            # Known to exist in the graph: a placeholder endpoint, not a write.
+            element_id = self._add(label, {key: value})
+            self._placeholders.add(element_id)
+            return element_id
+
+    def _relate(
+        self,
+        start: str | None,
+        rel_type: str,
+        end: str | None,
+        properties: dict[str, Any] | None = None,
+    ) -> None:
+        """MERGE a relationship between two element ids."""
+        with self._lock:
+            stats = self.writes.relationships[rel_type]
+            if start is None or end is None:
+                stats["unmatched"] += 1
+                return
+            key = (start, rel_type, end)
+            if key in self.relationships:
+                stats["repeated"] += 1
+            else:
+                stats["new"] += 1
+                self.relationships[key] = {}
+            self.relationships[key].update(properties or {})
+
+    def _transactions(
+        self,
+        rows: Sequence[dict[str, Any]],
+        key: Callable[[dict[str, Any]], Any],
+        writers: int | None = None,
+    ) -> int:
+        """Transactions the parallel writers would commit for a batch write."""
+        writers = max(1, writers or self.writers)
+        sizes = Counter()
+        for row in rows:
+            lock_key = key(row)
+            head = lock_key[0] if isinstance(lock_key, tuple) else lock_key
+            sizes[partition_of(head, writers)] += 1
+        return sum(math.ceil(size / self.batch_size) for size in sizes.values())
+
+    def _endpoint_id(self, node: NodeRecord | Node) -> str | None:
+        """Element id of a relationship endpoint, or None when unknown."""
+        if isinstance(node, NodeRecord):
+            if node.element_id in self.properties:
+                return node.element_id
+            return self._resolve(node.label.strip().lower(), node.key, node.value)
+        label = getattr(node, "__primarylabel__", None)
+        key = getattr(node, "__primarykey__", None)
+        if not label or not key:
+            raise ValueError(f"Node is not persisted: {node}")
+        return self._resolve(label, key, node.get(key))
+
+    def run(self, query: str, **parameters: Any) -> list[dict[str, Any]]:
+        """Count a custom query; it is not simulated and returns no record."""
+        with self._lock:
+            stats = self.writes.queries[shape_of(query)]
+            stats["calls"] += 1
+            stats["rows"] += size_of(parameters)
+            self.writes.transactions += 1
+        return []
+
+    def save_node(self, element: Any, type_elment: str, id_element: str) -> None:
+        """Merge a node record or a py2neo Node into the graph."""
+        merge_label = type_elment.strip().lower()
+        if isinstance(element, NodeRecord):
+            labels, properties = [element.label.strip()], element.properties
+        else:
+            labels, properties = list(element.labels), dict(element)
+            element.__primarylabel__ = merge_label
+            element.__primarykey__ = id_element
+        element_id = self._merge(
+            merge_label,
+            id_element,
+            properties.get(id_element),
+            properties,
+            labels,
+        )
+        if isinstance(element, NodeRecord):
+            element.element_id = element_id
+        with self._lock:
+            self.writes.transactions += 1
+        self._touch([type_elment])
+
+    def save_relationship(self, element: Relationship) -> None:
+        """Merge a py2neo Relationship between persisted nodes."""
+        self.save_relationship_between(
+            element.start_node, type(element).__name__, element.end_node
+        )
+
+    def save_relationship_between(
+        self, start: NodeRecord | Node, rel_type: str, end: NodeRecord | Node
+    ) -> None:
+        """Merge a relationship between two persisted nodes."""
+        self._relate(self._endpoint_id(start), rel_type, self._endpoint_id(end))
+        with self._lock:
+            self.writes.transactions += 1
+        self._touch(
+            [
+                label
+                for node in (start, end)
+                for label in (
+                    [node.label] if isinstance(node, NodeRecord) else node.labels
+                )
+            ]
+        )
+
+    def get_node(self, type: str, **properties: Any) -> NodeRecord | None:
+        """Return the first node of a label matching the properties."""
+        label = type.strip().lower()
+        with self._lock:
+            if properties:
+                name, value = next(iter(properties.items()))
+                candidates = list(self._index(label, name).get(value, ()))
+            else:
+                candidates = list(self.members[label])
+            for element_id in candidates:
+                if element_id in self._placeholders:
+                    continue  # Only known by key: not readable
+                stored = self.properties[element_id]
+                if all(stored.get(k) == v for k, v in properties.items()):
+                    key = "id" if "id" in properties or not properties else name
+                    record = make_record(type.strip(), key, dict(stored))
+                    record.element_id = element_id
+                    return record
+        return None
+
+    def save_nodes(
+        self, type_element: str, id_element: str, rows: list[dict[str, Any]]
+    ) -> None:
+        """Merge many nodes of the same label."""
+        label = type_element.strip()
+        for row in rows:
+            self._merge(label.lower(), id_element, row[id_element], row, [label])
+        with self._lock:
+            self.writes.transactions += self._transactions(
+                rows, lambda row: row[id_element]
+            )
+        self._touch([label], len(rows))
+
+    def save_relationships(
+        self,
+        rel_type: str,
+        start: tuple[str, str],
+        end: tuple[str, str],
+        rows: list[dict[str, Any]],
+    ) -> None:
+        """Merge many relationships between existing nodes."""
+        start_label, start_key = start[0].strip().lower(), start[1]
+        end_label, end_key = end[0].strip().lower(), end[1]
+        for row in rows:
+            self._relate(
+                self._resolve(start_label, start_key, row["start"]),
+                rel_type,
+                self._resolve(end_label, end_key, row["end"]),
+                row.get("properties"),
+            )
+        with self._lock:
+            self.writes.transactions += self._transactions(
+                rows,
+                lambda row: (row["start"], row["end"]),
+                self.relationship_writers,
+            )
+        self._touch([start[0], end[0]], len(rows))
+
+    def run_batch(
+        self,
+        query: str,
+        rows: list[dict[str, Any]],
+        key: Any,
+        labels: list[str],
+    ) -> None:
+        """Count a custom batch write; it is not simulated."""
+        with self._lock:
+            stats = self.writes.queries[shape_of(query)]
+            stats["calls"] += 1
+            stats["rows"] += len(rows)
+            self.writes.transactions += self._transactions(rows, key)
+        self._touch(labels, len(rows))
@@ -1,7 +1,20 @@
 import os  # noqa: I001
+import threading  # noqa: I001
+import time  # noqa: I001
+from collections import Counter  # noqa: I001
 from typing import Any  # noqa: I001
 from dotenv import load_dotenv  # noqa: I001
 from py2neo import Graph, Node, Relationship  # noqa: I001
+from src.sink.key_index import GENERATION_QUERY, KeyIndex  # noqa: I001
+from src.sink.parallel_writer import ParallelWriter  # noqa: I001
+from src.sink.person_index import PersonIndex  # noqa: I001
+from src.sink.query_log import get_query_log, normalize_plan  # noqa: I001
+from src.sink.records import NodeRecord, make_record  # noqa: I001
+from src.sink.schema import ensure_constraints  # noqa: I001
+from src.config.logging_config import LoggerFactory  # noqa: I001
+
+
+logger = LoggerFactory.get_logger("sink")
 
 
 class SinkNeo4j:
@@ -12,6 +25,13 @@ class SinkNeo4j:
     """
 
     graph: Any = None  # Py2neo Graph instance
+    writer: Any = None  # ParallelWriter used by the batch methods
+    changes: Any = None  # Writes per label since the last watermark flush
+    people: Any = None  # Person nodes known to exist, shared by its users
+    keys: Any = None  # Persistent (label, key) -> element id index
+    queries: Any = None  # Timings and plans of the queries, per shape
+    persistent = True  # Whether writes reach a graph kept after the run
+    generation: str | None = None  # GraphGeneration marker of the graph
 
     def __init__(self) -> None:
         """Initializes the connection to the Neo4j database using environment variables.
@@ -20,12 +40,107 @@ class SinkNeo4j:
             - NEO4J_URI: URI of the Neo4j instance (e.g., bolt://localhost:7687)
             - NEO4J_USERNAME: Username for authentication
             - NEO4J_PASSWORD: Password for authentication
+
+        Optional environment variables for the batch methods:
+            - NEO4J_WRITERS: Number of parallel writer threads (default 1)
+            - NEO4J_RELATIONSHIP_WRITERS: Writer threads of the relationship
+              batches, whose end nodes are shared (default 1)
+            - NEO4J_BATCH_SIZE: Rows per write transaction (default 1000)
+            - NEO4J_MAX_RETRIES: Attempts for batches failing transiently
         """  # noqa: D401
         load_dotenv()
         self.graph = Graph(
             os.getenv("NEO4J_URI", ""),
             auth=(os.getenv("NEO4J_USERNAME", ""), os.getenv("NEO4J_PASSWORD", "")),
         )
+        self.queries = get_query_log()
+        self.writer = ParallelWriter(
+            self.graph,
+            writers=int(os.getenv("NEO4J_WRITERS", "1")),
+            batch_size=int(os.getenv("NEO4J_BATCH_SIZE", "1000")),
+            max_retries=int(os.getenv("NEO4J_MAX_RETRIES", "5")),
+            on_batch=self.record,
+        )
+        self.relationship_writers = int(os.getenv("NEO4J_RELATIONSHIP_WRITERS", "1"))
+        self.changes = Counter()
+        self.people = PersonIndex()
+        self._changes_lock = threading.Lock()
+        ensure_constraints(self)
+        self.keys = self._open_key_index()
+
+    def _open_key_index(self) -> KeyIndex:
+        """Open the key index and bind it to the graph's generation.
+
+        The generation is read even without the index: the stream snapshots
+        are bound to it too (see ``SnapshotStore``).
+        """
+        self.generation = self.run(GENERATION_QUERY)[0]["generation"]
+        keys = KeyIndex()
+        keys.attach(self.generation)
+        return keys
+
+    def _touch(self, labels: Any, count: int = 1) -> None:
+        """Count writes affecting nodes of the given labels."""
+        with self._changes_lock:
+            for label in labels:
+                self.changes[str(label).strip().lower()] += count
+
+    def run(self, query: str, **parameters: Any) -> list[dict[str, Any]]:
+        """Runs a Cypher query and returns its records as dictionaries.
+
+        Args:
+        ----
+            query (str): Cypher query.
+            **parameters (Any): Query parameters.
+
+        Returns:
+        -------
+            list[dict]: One dictionary per record.
+
+        """  # noqa: D401
+        started = time.perf_counter()
+        data = self.graph.run(query, **parameters).data()
+        self.record(query, parameters, time.perf_counter() - started)
+        return data
+
+    def record(self, query: str, parameters: dict[str, Any], seconds: float) -> None:
+        """Add one execution of a query to the query log."""
+        self.queries.record(query, parameters, seconds, self.plan)
+
+    def plan(self, query: str, parameters: dict[str, Any], mode: str) -> dict[str, Any]:
+        """Return the EXPLAIN or PROFILE plan of a query, normalized.
+
+        PROFILE executes the query: it runs in a transaction that is
+        always rolled back.
+        """
+        tx = self.graph.begin()
+        try:
+            cursor = tx.run(f"{mode.upper()} {query}", parameters)
+            cursor.data()
+            return normalize_plan(cursor.plan())
+        finally:
+            self.graph.rollback(tx)
+
+    def flush_watermarks(self) -> None:
+        """Persist the per-label change counters as Watermark nodes.
+
+        Each ``Watermark`` node holds a ``version`` that grows with every
+        write to its label, so readers (e.g., the report cache) can tell
+        cheaply whether anything they depend on changed.
+        """
+        with self._changes_lock:
+            rows = [{"label": k, "count": v} for k, v in self.changes.items()]
+            self.changes.clear()
+        if not rows:
+            return
+        self.run(
+            "UNWIND $rows AS row "
+            "MERGE (w:watermark {label: row.label}) "
+            "SET w:Watermark, "
+            "w.version = coalesce(w.version, 0) + row.count, "
+            "w.updated_at = datetime()",
+            rows=rows,
+        )
 
     def save_node(self, element: Any, type_elment: str, id_element: str) -> None:
         """Saves or updates a node in the Neo4j graph.
@@ -33,14 +148,45 @@ class SinkNeo4j:
         If a node with the specified label (`type`) and unique ID (`id_element`)
         already exists, it will be updated; otherwise, it will be created.
 
+        Node records are merged with a single parameterized query and get
+        their ``element_id`` set; py2neo Nodes are merged by py2neo. Every
+        write sets ``updated_node_at`` (server epoch milliseconds), which
+        incremental exports filter on.
+
         Args:
         ----
-            element (Any): The py2neo Node object to save.
+            element (Any): The NodeRecord or py2neo Node object to save.
             type_elment (str): The label of the node (e.g., "User", "Repository").
             id_element (str): key that identify a node
 
         """  # noqa: D401
-        self.graph.merge(element, type_elment.strip().lower(), id_element)
+        started = time.perf_counter()
+        if isinstance(element, NodeRecord):
+            label = element.label.strip()
+            query = (
+                f"MERGE (n:`{type_elment.strip().lower()}` "
+                f"{{`{id_element}`: $value}}) "
+                "SET n += $properties, n.updated_node_at = timestamp() "
+                f"SET n:`{label}` RETURN elementId(n)"
+            )
+            parameters = {
+                "value": element.properties.get(id_element),
+                "properties": element.properties,
+            }
+            element.element_id = self.graph.evaluate(query, **parameters)
+            self.record(query, parameters, time.perf_counter() - started)
+        else:
+            self.graph.merge(element, type_elment.strip().lower(), id_element)
+            self.graph.run(
+                "MATCH (n) WHERE id(n) = $id SET n.updated_node_at = timestamp()",
+                id=element.identity,
+            )
+            self.queries.record(
+                f"py2neo merge (:`{type_elment.strip().lower()}` {{`{id_element}`}})",
+                {},
+                time.perf_counter() - started,
+            )
+        self._touch([type_elment])
 
     def save_relationship(self, element: Relationship) -> None:
         """Saves or updates a relationship in the Neo4j graph.
@@ -53,9 +199,100 @@ class SinkNeo4j:
             element (Relationship): The py2neo Relationship object to save.
 
         """  # noqa: D401
+        started = time.perf_counter()
         self.graph.merge(element)
+        self.graph.run(
+            "MATCH ()-[r]->() WHERE id(r) = $id SET r.updated_node_at = timestamp()",
+            id=element.identity,
+        )
+        self.queries.record(
+            f"py2neo merge ()-[:`{type(element).__name__}`]->()",
+            {},
+            time.perf_counter() - started,
+        )
+        self._touch([*element.start_node.labels, *element.end_node.labels])
+
+    def save_relationship_between(
+        self, start: NodeRecord | Node, rel_type: str, end: NodeRecord | Node
+    ) -> None:
+        """Saves or updates a relationship between two persisted nodes.
+
+        Unlike ``save_relationship`` no py2neo subgraph is built or merged:
+        the endpoints are matched by element id (or by label and key for
+        records not saved by this sink) and only the relationship is merged.
+
+        Element ids come from the key index and may be stale: Neo4j reuses
+        the ids of deleted nodes. The match also checks the label and key,
+        and when an endpoint matched by element id is not found, its index
+        entry is dropped and the write retried by label and key. A
+        relationship whose endpoints are still not found is not written,
+        with a warning.
+
+        Args:
+        ----
+            start (NodeRecord | Node): Start node.
+            rel_type (str): The relationship type (e.g., "has").
+            end (NodeRecord | Node): End node.
 
-    def get_node(self, type: str, **properties: Any) -> Node:
+        """  # noqa: D401
+        match_start, start_parameters, start_labels = self._endpoint(start, "a")
+        match_end, end_parameters, end_labels = self._endpoint(end, "b")
+        rows = self.run(
+            f"{match_start} {match_end} MERGE (a)-[r:`{rel_type}`]->(b) "
+            "SET r.updated_node_at = timestamp() RETURN count(r) AS written",
+            **start_parameters,
+            **end_parameters,
+        )
+        if rows and not rows[0]["written"]:
+            if self._forget_element_ids(start, end):
+                self.save_relationship_between(start, rel_type, end)
+            else:
+                logger.warning(
+                    f"Relationship {rel_type} not written, endpoint not found: "
+                    f"{self._describe(start)} -> {self._describe(end)}"
+                )
+            return
+        self._touch([*start_labels, *end_labels])
+
+    @staticmethod
+    def _describe(node: NodeRecord | Node) -> str:
+        """Label and key of a relationship endpoint, for the logs."""
+        if isinstance(node, NodeRecord):
+            return f"(:{node.label} {{{node.key}: {node.value!r}}})"
+        return f"({':'.join(['', *node.labels])} id {node.identity})"
+
+    def _forget_element_ids(self, *nodes: NodeRecord | Node) -> bool:
+        """Drop the element ids of records from them and from the key index."""
+        forgotten = False
+        for node in nodes:
+            if isinstance(node, NodeRecord) and node.element_id is not None:
+                self.keys.discard(node.label, node.key, [node.value])
+                node.element_id = None
+                forgotten = True
+        return forgotten
+
+    @staticmethod
+    def _endpoint(
+        node: NodeRecord | Node, name: str
+    ) -> tuple[str, dict[str, Any], list[str]]:
+        """Return the MATCH clause, its parameters and the labels of a node."""
+        if isinstance(node, NodeRecord):
+            label = node.label.strip().lower()
+            if node.element_id is not None:
+                clause = f"MATCH ({name}:`{label}`) WHERE elementId({name}) = ${name}"
+                if node.value is None:
+                    return clause, {name: node.element_id}, [node.label]
+                clause += f" AND {name}.`{node.key}` = ${name}_key"
+                parameters = {name: node.element_id, f"{name}_key": node.value}
+                return clause, parameters, [node.label]
+            clause = f"MATCH ({name}:`{label}` {{`{node.key}`: ${name}}})"
+            return clause, {name: node.value}, [node.label]
+        if node.identity is None:
+            raise ValueError(f"Node is not persisted: {node}")
+        clause = f"MATCH ({name}) WHERE id({name}) = ${name}"
+        return clause, {name: node.identity}, list(node.labels)
+
+    def get_node(self, type: str, **properties: Any) -> NodeRecord | None:
         """Retrieves the first node from Neo4j that matches the given label
         and properties.
 
@@ -66,8 +303,102 @@ class SinkNeo4j:
 
         Returns:
         -------
-            Node: The first matching node, or None if no node matches.
+            NodeRecord: The first matching node with its element id, or None
+            if no node matches.
 
         """  # noqa: D205, D401
-        matcher = self.graph.nodes.match(type.strip().lower(), **properties)
-        return matcher.first()
+        names = {name: f"p{i}" for i, name in enumerate(properties)}
+        condition = ", ".join(f"`{name}`: ${param}" for name, param in names.items())
+        rows = self.run(
+            f"MATCH (n:`{type.strip().lower()}` {{{condition}}}) "
+            "RETURN elementId(n) AS element_id, properties(n) AS properties LIMIT 1",
+            **{param: properties[name] for name, param in names.items()},
+        )
+        if not rows:
+            return None
+        key = "id" if "id" in properties or not properties else next(iter(properties))
+        record = make_record(type.strip(), key, rows[0]["properties"])
+        record.element_id = rows[0]["element_id"]
+        return record
+
+    def save_nodes(
+        self, type_element: str, id_element: str, rows: list[dict[str, Any]]
+    ) -> None:
+        """Saves or updates many nodes of the same label in batches.
+
+        Nodes are merged on the lower-case label and ``id_element`` like
+        ``save_node`` does, and also get the label as given.
+
+        Args:
+        ----
+            type_element (str): The label of the nodes (e.g., "Commit").
+            id_element (str): key that identify a node
+            rows (list[dict]): Node properties, each including the key.
+
+        """  # noqa: D401
+        label = type_element.strip()
+        query = (
+            "UNWIND $rows AS row "
+            f"MERGE (n:`{label.lower()}` {{`{id_element}`: row.`{id_element}`}}) "
+            f"SET n += row, n.updated_node_at = timestamp() SET n:`{label}`"
+        )
+        self.writer.write(query, rows, key=lambda row: row[id_element])
+        self._touch([label], len(rows))
+
+    def save_relationships(
+        self,
+        rel_type: str,
+        start: tuple[str, str],
+        end: tuple[str, str],
+        rows: list[dict[str, Any]],
+    ) -> None:
+        """Saves or updates many relationships between existing nodes.
+
+        Each row holds the ``start`` and ``end`` key values and optional
+        ``properties``. Rows whose endpoints do not exist are skipped.
+
+        Args:
+        ----
+            rel_type (str): The relationship type (e.g., "has").
+            start (tuple[str, str]): Label and key property of the start nodes.
+            end (tuple[str, str]): Label and key property of the end nodes.
+            rows (list[dict]): ``{"start": ..., "end": ..., "properties": {...}}``.
+
+        """  # noqa: D401
+        start_label, start_key = start
+        end_label, end_key = end
+        query = (
+            "UNWIND $rows AS row "
+            f"MATCH (a:`{start_label.strip().lower()}` {{`{start_key}`: row.start}}) "
+            f"MATCH (b:`{end_label.strip().lower()}` {{`{end_key}`: row.end}}) "
+            f"MERGE (a)-[r:`{rel_type}`]->(b) "
+            "SET r += coalesce(row.properties, {}), r.updated_node_at = timestamp()"
+        )
+        self.writer.write(
+            query,
+            rows,
+            key=lambda row: (row["start"], row["end"]),
+            writers=self.relationship_writers,
+        )
+        self._touch([start_label, end_label], len(rows))
+
+    def run_batch(
+        self,
+        query: str,
+        rows: list[dict[str, Any]],
+        key: Any,
+        labels: list[str],
+    ) -> None:
+        """Runs a custom ``UNWIND $rows AS row`` write query in batches.
+
+        Args:
+        ----
+            query (str): Cypher query reading ``row`` from ``$rows``.
+            rows (list[dict]): Parameters of each row.
+            key (Callable): Returns the lock key of a row, used to partition
+                the rows between the parallel writers.
+            labels (list[str]): Labels written by the query (watermarks).
+
+        """  # noqa: D401
+        self.writer.write(query, rows, key=key)
+        self._touch(labels, len(rows))
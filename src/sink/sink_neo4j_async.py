@@ -0,0 +1,250 @@
+import asyncio  # noqa: I001
+import os  # noqa: I001
+import threading  # noqa: I001
+import time  # noqa: I001
+from collections import Counter  # noqa: I001
+from collections.abc import Callable, Coroutine, Sequence  # noqa: I001
+from typing import Any  # noqa: I001
+from dotenv import load_dotenv  # noqa: I001
+from py2neo import Node, Relationship  # noqa: I001
+from src.sink.parallel_writer import chunks, partition_of  # noqa: I001
+from src.sink.person_index import PersonIndex  # noqa: I001
+from src.sink.query_log import get_query_log, normalize_plan  # noqa: I001
+from src.sink.records import NodeRecord  # noqa: I001
+from src.sink.schema import ensure_constraints  # noqa: I001
+from sink.sink_neo4j import SinkNeo4j  # noqa: I001
+
+
+class AsyncWriter:
+    """Batched writes pipelined over the async driver.
+
+    Same contract as ``ParallelWriter``: rows are partitioned by lock key
+    and sorted within a partition. Instead of one thread per partition,
+    every partition is a coroutine with its own session, so the batches
+    of all partitions are in flight on the driver's connection pool at
+    once. Managed transactions retry transient errors themselves.
+    """
+
+    def __init__(
+        self, sink: "AsyncSinkNeo4j", writers: int = 4, batch_size: int = 1000
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+        ----
+            sink (AsyncSinkNeo4j): Sink owning the driver and event loop.
+            writers (int): Partitions written concurrently.
+            batch_size (int): Rows per transaction.
+
+        """
+        self.sink = sink
+        self.writers = max(1, writers)
+        self.batch_size = batch_size
+
+    def write(
+        self,
+        query: str,
+        rows: Sequence[dict[str, Any]],
+        key: Callable[[dict[str, Any]], Any],
+        writers: int | None = None,
+    ) -> None:
+        """Write rows with ``query`` (which must ``UNWIND $rows AS row``)."""
+        if not rows:
+            return
+
+        writers = max(1, writers or self.writers)
+        partitions: list[list[dict[str, Any]]] = [[] for _ in range(writers)]
+        for row in rows:
+            lock_key = key(row)
+            head = lock_key[0] if isinstance(lock_key, tuple) else lock_key
+            partitions[partition_of(head, writers)].append(row)
+
+        def ordering(row: dict[str, Any]) -> tuple[str, ...]:
+            lock_key = key(row)
+            values = lock_key if isinstance(lock_key, tuple) else (lock_key,)
+            return tuple(str(v) for v in values)
+
+        for partition in partitions:
+            partition.sort(key=ordering)
+        timings: list[tuple[dict[str, Any], float]] = []
+        self.sink.call(
+            self._write_all(query, [p for p in partitions if p], timings)
+        )
+        # Recorded from the caller's thread: a slow batch may need its plan.
+        for parameters, seconds in timings:
+            self.sink.record(query, parameters, seconds)
+
+    async def _write_all(
+        self,
+        query: str,
+        partitions: list[list[dict[str, Any]]],
+        timings: list[tuple[dict[str, Any], float]],
+    ) -> None:
+        await asyncio.gather(
+            *(self._write_partition(query, p, timings) for p in partitions)
+        )
+
+    async def _write_partition(
+        self,
+        query: str,
+        rows: Sequence[dict[str, Any]],
+        timings: list[tuple[dict[str, Any], float]],
+    ) -> None:
+        for batch in chunks(rows, self.batch_size):
+            parameters = {"rows": list(batch)}
+            started = time.perf_counter()
+            await self.sink.write(query, **parameters)
+            timings.append((parameters, time.perf_counter() - started))
+
+
+class AsyncSinkNeo4j(SinkNeo4j):
+    """Neo4j sink on the official driver's asyncio API.
+
+    A drop-in replacement of ``SinkNeo4j`` (selected with
+    ``SINK_BACKEND=neo4j-async``): the extractors keep calling the same
+    blocking methods, which submit coroutines to an event loop running in
+    a thread of its own. Every write is a managed write transaction
+    (``execute_write``), retried by the driver on transient errors, and
+    the batch methods pipeline their partitions over concurrent sessions.
+
+    py2neo Nodes are never bound to this driver; relationships to them
+    are matched by their merge label and key.
+    """
+
+    def __init__(self) -> None:
+        """Open the async driver using the same environment as SinkNeo4j.
+
+        Optional environment variables:
+            - NEO4J_DATABASE: Database name (default: the server default)
+            - NEO4J_FETCH_SIZE: Records fetched per pull (default 1000)
+            - NEO4J_WRITERS: Partitions written concurrently (default 1)
+            - NEO4J_RELATIONSHIP_WRITERS: Same for relationships (default 1)
+            - NEO4J_BATCH_SIZE: Rows per write transaction (default 1000)
+        """
+        load_dotenv()
+        self.database = os.getenv("NEO4J_DATABASE") or None
+        self.fetch_size = int(os.getenv("NEO4J_FETCH_SIZE", "1000"))
+        self.queries = get_query_log()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="neo4j-async", daemon=True
+        )
+        self._thread.start()
+        self.driver = self.call(
+            self._open(
+                os.getenv("NEO4J_URI", ""),
+                (os.getenv("NEO4J_USERNAME", ""), os.getenv("NEO4J_PASSWORD", "")),
+            )
+        )
+        self.writer = AsyncWriter(
+            self,
+            writers=int(os.getenv("NEO4J_WRITERS", "1")),
+            batch_size=int(os.getenv("NEO4J_BATCH_SIZE", "1000")),
+        )
+        self.relationship_writers = int(os.getenv("NEO4J_RELATIONSHIP_WRITERS", "1"))
+        self.changes = Counter()
+        self.people = PersonIndex()
+        self._changes_lock = threading.Lock()
+        ensure_constraints(self)
+        self.keys = self._open_key_index()
+
+    @staticmethod
+    async def _open(uri: str, auth: tuple[str, str]) -> Any:
+        """Create the driver inside the event loop it will run on."""
+        from neo4j import AsyncGraphDatabase
+
+        driver = AsyncGraphDatabase.driver(uri, auth=auth)
+        await driver.verify_connectivity()
+        return driver
+
+    def call(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the sink's event loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def write(self, query: str, **parameters: Any) -> list[dict[str, Any]]:
+        """Run a query in a managed write transaction."""
+        async with self.driver.session(
+            database=self.database, fetch_size=self.fetch_size
+        ) as session:
+            return await session.execute_write(self._work, query, parameters)
+
+    @staticmethod
+    async def _work(
+        tx: Any, query: str, parameters: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        result = await tx.run(query, parameters)
+        return await result.data()
+
+    def run(self, query: str, **parameters: Any) -> list[dict[str, Any]]:
+        """Runs a Cypher query and returns its records as dictionaries."""  # noqa: D401
+        started = time.perf_counter()
+        data = self.call(self.write(query, **parameters))
+        self.record(query, parameters, time.perf_counter() - started)
+        return data
+
+    def plan(self, query: str, parameters: dict[str, Any], mode: str) -> dict[str, Any]:
+        """Return the EXPLAIN or PROFILE plan of a query (rolled back)."""
+        return self.call(self._plan(query, parameters, mode))
+
+    async def _plan(
+        self, query: str, parameters: dict[str, Any], mode: str
+    ) -> dict[str, Any]:
+        async with self.driver.session(database=self.database) as session:
+            tx = await session.begin_transaction()
+            try:
+                result = await tx.run(f"{mode.upper()} {query}", parameters)
+                summary = await result.consume()
+                return normalize_plan(summary.profile or summary.plan)
+            finally:
+                await tx.rollback()
+
+    def close(self) -> None:
+        """Close the driver and stop the event loop."""
+        self.call(self.driver.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def save_node(self, element: Any, type_elment: str, id_element: str) -> None:
+        """Saves or updates a node record or a py2neo Node.
+
+        py2neo Nodes are never bound to this driver: they get their merge
+        label and key set instead, so relationships can match them later.
+        """  # noqa: D401
+        merge_label = type_elment.strip().lower()
+        if isinstance(element, NodeRecord):
+            labels, properties = [element.label.strip()], element.properties
+        else:
+            labels, properties = list(element.labels), dict(element)
+            element.__primarylabel__ = merge_label
+            element.__primarykey__ = id_element
+        rows = self.run(
+            f"MERGE (n:`{merge_label}` {{`{id_element}`: $value}}) "
+            "SET n += $properties, n.updated_node_at = timestamp() "
+            + "".join(f"SET n:`{label}` " for label in labels)
+            + "RETURN elementId(n) AS element_id",
+            value=properties.get(id_element),
+            properties=properties,
+        )
+        if isinstance(element, NodeRecord):
+            element.element_id = rows[0]["element_id"]
+        self._touch([type_elment])
+
+    def save_relationship(self, element: Relationship) -> None:
+        """Saves or updates a py2neo Relationship between persisted nodes."""  # noqa: D401
+        self.save_relationship_between(
+            element.start_node, type(element).__name__, element.end_node
+        )
+
+    @staticmethod
+    def _endpoint(
+        node: NodeRecord | Node, name: str
+    ) -> tuple[str, dict[str, Any], list[str]]:
+        """Return the MATCH clause, its parameters and the labels of a node."""
+        if isinstance(node, NodeRecord):
+            return SinkNeo4j._endpoint(node, name)
+        label = getattr(node, "__primarylabel__", None)
+        key = getattr(node, "__primarykey__", None)
+        if not label or not key or node.get(key) is None:
+            raise ValueError(f"Node is not persisted: {node}")
+        clause = f"MATCH ({name}:`{label}` {{`{key}`: ${name}}})"
+        return clause, {name: node[key]}, list(node.labels)
@@ -0,0 +1,102 @@
+import os  # noqa: I001
+import tempfile  # noqa: I001
+from typing import Any  # noqa: I001
+
+import pytest  # noqa: I001
+
+# The loggers open their files when the modules are imported: keep the
+# logs of the test runs out of the repository's logs/ directory.
+os.environ["LOG_DIR"] = tempfile.mkdtemp(prefix="pytest-logs-")
+
+from src.extract.checkpoint import CheckpointStore  # noqa: E402, I001
+from src.extract.dead_letter import POLICY_DEAD_LETTER, DeadLetterStore  # noqa: E402, I001
+from src.extract.extract_base import ExtractBase  # noqa: E402, I001
+from src.extract.projection import Projector  # noqa: E402, I001
+
+
+class FakeKeys:
+    """Key index recording the discarded keys."""
+
+    def __init__(self) -> None:
+        """Start with nothing discarded."""
+        self.discarded: list[tuple[str, str, list[Any]]] = []
+
+    def discard(self, label: str, property: str, values: Any) -> None:
+        """Record the keys of deleted nodes."""
+        self.discarded.append((label, property, list(values)))
+
+
+class FakeSink:
+    """Sink serving the stored keys of one label and recording the writes.
+
+    ``stored`` maps a key to whether its node is marked deleted; ``run``
+    answers the paged ``STORED_KEYS`` query of the reconciler from it.
+    """
+
+    def __init__(self, stored: dict[Any, bool] | None = None) -> None:
+        """Initialize the sink with the stored keys of the label."""
+        self.stored = stored or {}
+        self.keys = FakeKeys()
+        self.pages: list[dict[str, Any]] = []
+        self.batches: list[tuple[str, list[Any]]] = []
+
+    def run(self, query: str, **parameters: Any) -> list[dict[str, Any]]:
+        """Return a page of the stored keys after ``after``."""
+        self.pages.append(parameters)
+        keys = sorted(k for k in self.stored if k > parameters["after"])
+        return [
+            {"key": k, "deleted": self.stored[k]} for k in keys[: parameters["limit"]]
+        ]
+
+    def run_batch(
+        self, query: str, rows: list[dict[str, Any]], key: Any, labels: list[str]
+    ) -> None:
+        """Record the keys a reconciler batch query marks, deletes or restores."""
+        if "DETACH DELETE" in query:
+            kind = "delete"
+        elif "REMOVE n.deleted_at" in query:
+            kind = "restore"
+        else:
+            kind = "mark"
+        self.batches.append((kind, [row["key"] for row in rows]))
+
+
+class Extract(ExtractBase):
+    """Extractor without source or sink, for the stage helpers."""
+
+    def fetch_data(self) -> None:
+        """Nothing to fetch."""
+
+    def load_issue(self, row: Any) -> None:
+        """Fail on the issues marked broken."""
+        if row.title == "broken":
+            raise ValueError(f"Issue {row.id} is broken")
+        self.loaded.append(row.id)
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Keep the state files of every test in its own directory."""
+    monkeypatch.setenv("STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setenv("DEAD_LETTER_DIR", str(tmp_path / "dead_letter"))
+    monkeypatch.delenv("SNAPSHOT_DIR", raising=False)
+    monkeypatch.delenv("SNAPSHOT_DELTA", raising=False)
+    return tmp_path / "state"
+
+
+@pytest.fixture
+def make_sink() -> type[FakeSink]:
+    """Build fake sinks from their stored keys."""
+    return FakeSink
+
+
+@pytest.fixture
+def extractor(tmp_path: Any) -> Extract:
+    """Build an extractor with a checkpoint and a dead-letter store only."""
+    extractor = Extract.__new__(Extract)
+    extractor.checkpoint = CheckpointStore(str(tmp_path / "checkpoint.json"))
+    extractor.dead_letters = DeadLetterStore(str(tmp_path / "dead_letters.jsonl"))
+    extractor.error_policy = POLICY_DEAD_LETTER
+    extractor.projector = Projector()
+    extractor.loaded = []
+    return extractor
@@ -0,0 +1,63 @@
+import pytest  # noqa: I001
+
+from src.extract.aggregates import ActivityAggregator  # noqa: I001
+from src.extract.memory import MemoryBudget  # noqa: I001
+from src.extract.profiling import StageProfiler  # noqa: I001
+
+
+class FlakySink:
+    """Sink whose first ``failures`` batch writes raise."""
+
+    def __init__(self, failures: int = 0) -> None:
+        """Initialize the sink with the number of writes to fail."""
+        self.failures = failures
+        self.batches: list[list[dict]] = []
+        self.keys = self
+
+    def run_batch(self, query: str, rows: list, key: object, labels: list) -> None:
+        """Fail, or record the rows of a batch."""
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Neo4j unavailable")
+        self.batches.append(rows)
+
+    def run(self, query: str, **parameters: object) -> list:
+        """Accept the link query."""
+        return []
+
+    def flush_watermarks(self) -> None:
+        """Nothing to flush."""
+
+    def flush(self) -> None:
+        """Nothing to flush (key index)."""
+
+
+def test_failed_batches_are_sent_again():
+    sink = FlakySink(failures=1)
+    aggregates = ActivityAggregator(sink, batch_size=10)
+    aggregates.add("commits", "sha1", "ana", "org/a", "2024-01-01")
+
+    with pytest.raises(ConnectionError):
+        aggregates.flush()
+    aggregates.add("commits", "sha2", "ana", "org/a", "2024-01-02")
+    aggregates.flush()
+
+    [rows] = sink.batches
+    assert sorted(row["key"] for row in rows) == ["sha1", "sha2"]
+    assert aggregates.buffers["commits"] == {}
+
+
+def test_stage_error_is_not_hidden_by_the_flush(extractor, tmp_path):
+    extractor.scope = None
+    extractor.memory = MemoryBudget("run")
+    extractor.profiler = StageProfiler("run", mode="off")
+    extractor.sink = FlakySink(failures=1)
+    extractor.aggregates = ActivityAggregator(extractor.sink)
+    extractor.aggregates.add("issues", 1, "ana", "org/a", "2024-01-01")
+
+    def load() -> None:
+        raise ValueError("stage failed")
+
+    with pytest.raises(ValueError, match="stage failed"):
+        extractor.run_stage("issues", load)
+    assert not extractor.checkpoint.is_done("issues")
@@ -0,0 +1,60 @@
+import pandas as pd  # noqa: I001
+
+from src.extract.checkpoint import CheckpointStore  # noqa: I001
+from src.extract.memory import SpilledFrame  # noqa: I001
+
+
+def issues(count: int) -> pd.DataFrame:
+    """Build an issues frame, in reverse id order."""
+    return pd.DataFrame(
+        {"id": range(count, 0, -1), "title": [f"issue {i}" for i in range(count)]}
+    )
+
+
+def test_commits_offsets_per_batch(extractor, monkeypatch):
+    monkeypatch.setenv("CHECKPOINT_BATCH_SIZE", "2")
+    seen = []
+    for row in extractor.iter_records("issues", issues(5), key="id"):
+        seen.append(row.id)
+        if row.id == 3:
+            break  # The run dies while processing the third record
+
+    assert seen == [1, 2, 3]
+    stored = CheckpointStore(extractor.checkpoint.path)
+    assert stored.offset("issues") == 2
+    assert stored.state["stages"]["issues"]["key"] == "2"
+
+
+def test_resumes_after_the_last_committed_batch(extractor, monkeypatch):
+    monkeypatch.setenv("CHECKPOINT_BATCH_SIZE", "2")
+    extractor.checkpoint.commit("issues", 2, 2)
+    extractor.checkpoint = CheckpointStore(extractor.checkpoint.path)
+
+    rows = list(extractor.iter_records("issues", issues(5), key="id"))
+
+    assert [row.id for row in rows] == [3, 4, 5]
+    assert extractor.checkpoint.offset("issues") == 5
+
+
+def test_resumes_spilled_records_across_partitions(extractor, tmp_path):
+    path = str(tmp_path / "issues.parquet")
+    issues(7).sort_values("id").to_parquet(path, index=False)
+    frame = SpilledFrame(path, 7, order=("id",), partition_rows=3)
+    extractor.checkpoint.commit("issues", 4)
+
+    rows = list(extractor.iter_records("issues", frame, key="id", index=True))
+
+    assert [row.id for row in rows] == [5, 6, 7]
+    assert [row.Index for row in rows] == [4, 5, 6]
+
+
+def test_completed_stages_survive_a_restart(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = CheckpointStore(path)
+    checkpoint.complete("repositories")
+
+    resumed = CheckpointStore(path)
+    assert resumed.run_id == checkpoint.run_id
+    assert resumed.is_done("repositories")
+    resumed.finish()
+    assert not CheckpointStore(path).is_done("repositories")
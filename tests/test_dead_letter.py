@@ -0,0 +1,64 @@
+import pandas as pd  # noqa: I001
+import pytest  # noqa: I001
+
+from src.extract.dead_letter import POLICY_RAISE  # noqa: I001
+
+
+def issues(*titles: str) -> pd.DataFrame:
+    """Build an issues frame with one record per title."""
+    return pd.DataFrame(
+        {"id": range(1, len(titles) + 1), "title": titles, "closed_at": float("nan")}
+    )
+
+
+def test_failed_records_are_dead_lettered(extractor):
+    extractor.load_records(
+        "issues", issues("ok", "broken", "ok"), extractor.load_issue, key="id"
+    )
+
+    assert extractor.loaded == [1, 3]
+    [entry] = extractor.dead_letters.read()
+    assert entry["stage"] == "issues"
+    assert entry["handler"] == "load_issue"
+    assert entry["error_type"] == "ValueError"
+    assert entry["record"] == {"id": 2, "title": "broken", "closed_at": None}
+
+
+def test_raise_policy_stops_the_stage(extractor):
+    extractor.error_policy = POLICY_RAISE
+    with pytest.raises(ValueError, match="broken"):
+        extractor.load_records("issues", issues("broken"), extractor.load_issue)
+    assert extractor.dead_letters.read() == []
+
+
+def test_consecutive_failures_abort_the_stage(extractor, monkeypatch):
+    monkeypatch.setenv("DEAD_LETTER_MAX_CONSECUTIVE", "2")
+    frame = issues("broken", "broken", "ok")
+    with pytest.raises(ValueError):
+        extractor.load_records("issues", frame, extractor.load_issue)
+    assert extractor.loaded == []
+    assert len(extractor.dead_letters.read()) == 2
+
+
+def test_replay_keeps_only_the_records_failing_again(extractor):
+    extractor.load_records(
+        "issues", issues("broken", "broken"), extractor.load_issue, key="id"
+    )
+    entries = extractor.dead_letters.read()
+    entries[0]["record"]["title"] = "fixed"
+    extractor.dead_letters.replace(entries)
+
+    assert extractor.replay_dead_letters() == (1, 1)
+    assert extractor.loaded == [1]
+    [entry] = extractor.dead_letters.read()
+    assert entry["record"]["id"] == 2
+    assert "replayed_at" in entry
+
+
+def test_replay_keeps_records_of_unknown_handlers(extractor):
+    extractor.load_records("issues", issues("broken"), extractor.load_issue)
+    entries = extractor.dead_letters.read()
+    entries[0]["handler"] = "load_removed_stage"
+    extractor.dead_letters.replace(entries)
+
+    assert extractor.replay_dead_letters() == (0, 1)
@@ -0,0 +1,89 @@
+import logging  # noqa: I001
+from collections import namedtuple  # noqa: I001
+from typing import Any  # noqa: I001
+
+import pytest  # noqa: I001
+
+from src.extract.extract_cmpo import ExtractCMPO  # noqa: I001
+from src.extract.projection import PROJECTION_FULL, Projector  # noqa: I001
+
+
+Commit = namedtuple(
+    "Commit",
+    ["sha", "url", "repository", "author", "committer", "commit"],
+)
+
+
+class Recorder:
+    """Keep the nodes and activity the loader writes."""
+
+    def __init__(self) -> None:
+        self.nodes: list[tuple[str, dict[str, Any]]] = []
+        self.activity: list[tuple[Any, ...]] = []
+
+    def add(self, *args: Any) -> None:
+        self.activity.append(args)
+
+
+def commit() -> Commit:
+    """Build a commit record with its GitHub users and git signature."""
+    return Commit(
+        sha="abc",
+        url="https://api.github.com/repos/org/repo/commits/abc",
+        repository="org/repo",
+        author={"login": "ana", "id": 7, "avatar_url": "https://avatars/7"},
+        committer={"login": "web-flow", "id": 9},
+        commit={
+            "author": {"name": "Ana", "date": "2024-01-02T00:00:00Z"},
+            "committer": {"name": "GitHub", "date": "2024-01-02T00:00:00Z"},
+            "message": "Fix the parser",
+            "url": "https://api.github.com/repos/org/repo/git/commits/abc",
+        },
+    )
+
+
+@pytest.fixture
+def loader() -> Any:
+    """Build a CMPO extractor that records its nodes instead of storing them."""
+    recorder = Recorder()
+    extractor = ExtractCMPO.__new__(ExtractCMPO)
+    extractor.logger = logging.getLogger(__name__)
+    extractor.projector = Projector()
+    extractor.aggregates = recorder
+    extractor.organization_node = object()
+    extractor.get_node = lambda label, **kwargs: object()
+    extractor.create_relationship = lambda *args: None
+
+    def create_node(data: dict[str, Any], label: str, key: str) -> dict[str, Any]:
+        recorder.nodes.append((label, data))
+        return data
+
+    extractor.create_node = create_node
+    extractor.recorder = recorder
+    return extractor
+
+
+def test_commit_keeps_the_user_logins(loader):
+    loader._load_commits_record(commit())
+
+    label, data = loader.recorder.nodes[0]
+    assert label == "Commit"
+    assert data["id"] == "abc"
+    assert data["author.login"] == "ana"
+    assert data["committer.login"] == "web-flow"
+    assert "author.id" not in data
+    assert data["author_name"] == "Ana"
+    assert data["message"] == "Fix the parser"
+    assert not any(k.startswith("commit.") for k in data)
+    assert loader.recorder.activity[0][:3] == ("commits", "abc", "ana")
+
+
+def test_commit_full_mode_is_unchanged(loader):
+    loader.projector = Projector(mode=PROJECTION_FULL)
+    loader._load_commits_record(commit())
+
+    _, data = loader.recorder.nodes[0]
+    assert data["authorlogin"] == "ana"
+    assert data["authorid"] == 7
+    assert data["author_name"] == "Ana"
+    assert data["url"] == commit().commit["url"]  # The signature url, as before
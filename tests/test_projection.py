@@ -0,0 +1,73 @@
+import json  # noqa: I001
+
+import pytest  # noqa: I001
+
+from src.extract.projection import (  # noqa: I001
+    PROJECTION_FULL,
+    LabelProjection,
+    Projector,
+)
+
+
+def issue() -> dict:
+    """Build an issues record with nested objects and lists."""
+    return {
+        "id": 1,
+        "html_url": "https://github.com/org/repo/issues/1",
+        "url": "https://api.github.com/repos/org/repo/issues/1",
+        "comments_url": "https://api.github.com/repos/org/repo/issues/1/comments",
+        "node_id": "I_1",
+        "title": "x" * 5000,
+        "user": {"login": "ana", "id": 7, "avatar_url": "https://avatars/7"},
+        "labels": [{"id": 2, "name": "bug"}],
+        "closed_at": None,
+    }
+
+
+def test_projects_the_issue_properties():
+    data = Projector().project("Issue", issue())
+
+    assert data["id"] == 1
+    assert data["html_url"] == issue()["html_url"]
+    assert data["user.login"] == "ana"
+    assert "user.id" not in data
+    assert "comments_url" not in data
+    assert data["url"] == issue()["url"]
+    assert "node_id" not in data
+    assert len(data["title"]) == 4096
+    assert json.loads(data["labels"]) == [{"id": 2, "name": "bug"}]
+    assert data["closed_at"] is None
+
+
+def test_counts_the_bytes_saved():
+    projector = Projector()
+    projector.project("Issue", issue())
+    stats = projector.report()["Issue"]
+    assert stats.records == 1
+    assert stats.dropped_fields == 4  # comments_url, node_id, user.id and avatar
+    assert 0 < stats.bytes_after < stats.bytes_before
+
+
+def test_renames_and_list_modes():
+    projections = {
+        "Team": LabelProjection(rename={"name": "team_name"}, list_mode="keep"),
+        "Label": LabelProjection(list_mode="drop"),
+    }
+    projector = Projector(projections=projections)
+
+    team = projector.project("Team", {"name": "core", "tags": ["a", "b"]})
+    assert team == {"team_name": "core", "tags": ["a", "b"]}
+    assert projector.project("Label", {"id": 1, "tags": ["a"]}) == {"id": 1}
+
+
+def test_full_mode_stores_every_property(extractor):
+    extractor.projector = Projector(mode=PROJECTION_FULL)
+    data = extractor.project(issue(), "Issue")
+    assert data["userid"] == 7  # Flattened the way data_clean always did
+    assert len(data["title"]) == 5000
+    assert data["comments_url"] == issue()["comments_url"]
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="projection mode"):
+        Projector(mode="partial")
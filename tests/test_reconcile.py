@@ -0,0 +1,82 @@
+import pytest  # noqa: I001
+
+from src.extract.reconcile import Reconciler  # noqa: I001
+
+
+def test_marks_missing_and_restores_seen_keys(make_sink):
+    sink = make_sink({"a": False, "b": False, "c": True, "d": True})
+    reconciler = Reconciler(sink, mode="mark", batch_size=10)
+
+    assert reconciler.reconcile("Branch", "id", ["a", "c"]) == 1
+    assert sink.batches == [("mark", ["b"]), ("restore", ["c"])]
+    assert sink.keys.discarded == []
+
+
+def test_pages_through_a_full_last_page(make_sink):
+    # Stored keys fill the pages exactly: one more (empty) page is read.
+    sink = make_sink({k: False for k in range(1, 10)})
+    reconciler = Reconciler(sink, mode="mark", batch_size=3)
+
+    assert reconciler.reconcile("Label", "id", [1, 2]) == 7
+    assert [page["after"] for page in sink.pages] == [float("-inf"), 3, 6, 9]
+    assert sink.batches == [("mark", [3, 4, 5, 6]), ("mark", [7, 8, 9])]
+
+
+def test_string_keys_start_below_every_string(make_sink):
+    sink = make_sink({"": False, "x": False})
+    Reconciler(sink, mode="mark", batch_size=10).reconcile("Team", "id", ["x"])
+    assert sink.pages[0]["after"] == ""
+
+
+def test_scope_is_passed_as_sorted_strings(make_sink):
+    sink = make_sink({"a": False})
+    reconciler = Reconciler(sink, mode="mark", batch_size=10)
+    reconciler.reconcile(
+        "Branch", "id", ["a"], scope_property="repository", scope=["org/b", "org/a"]
+    )
+    assert sink.pages[0]["scope"] == ["org/a", "org/b"]
+
+
+def test_delete_mode_forgets_the_deleted_keys(make_sink):
+    sink = make_sink({"a": False, "b": False})
+    Reconciler(sink, mode="delete", batch_size=10).reconcile("Branch", "id", ["a"])
+    assert sink.batches == [("delete", ["b"])]
+    assert sink.keys.discarded == [("Branch", "id", ["b"])]
+
+
+def test_empty_snapshot_is_not_reconciled(make_sink):
+    sink = make_sink({"a": False})
+    assert Reconciler(sink, mode="delete").reconcile("Branch", "id", []) == 0
+    assert sink.pages == []
+    assert sink.batches == []
+
+
+def test_off_mode_writes_nothing(make_sink):
+    sink = make_sink({"a": False})
+    reconciler = Reconciler(sink, mode="off")
+    assert reconciler.reconcile("Branch", "id", ["b"]) == 0
+    assert reconciler.reconcile_delta("Branch", "id", ["a"]) == 0
+    assert sink.batches == []
+
+
+def test_unknown_mode_is_rejected(make_sink):
+    with pytest.raises(ValueError, match="RECONCILE"):
+        Reconciler(make_sink(), mode="purge")
+
+
+def test_delta_marks_removed_and_restores_inserted_keys(make_sink):
+    sink = make_sink()
+    reconciler = Reconciler(sink, mode="mark", batch_size=2)
+
+    assert reconciler.reconcile_delta("Team", "id", ["a", "b", "c"], ["d"]) == 3
+    assert sink.batches == [("mark", ["a", "b"]), ("mark", ["c"]), ("restore", ["d"])]
+    assert sink.pages == []  # The stored keys are never read
+
+
+def test_delta_never_deletes_an_inserted_key(make_sink):
+    sink = make_sink()
+    reconciler = Reconciler(sink, mode="delete", batch_size=10)
+
+    assert reconciler.reconcile_delta("Team", "id", ["a", "b"], ["b"]) == 1
+    assert sink.batches == [("delete", ["a"]), ("restore", ["b"])]
+    assert sink.keys.discarded == [("Team", "id", ["a"])]
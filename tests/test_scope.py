@@ -0,0 +1,72 @@
+from datetime import date, timedelta  # noqa: I001
+
+import pandas as pd  # noqa: I001
+
+from src.extract.scope import Scope  # noqa: I001
+
+
+def test_split_into_windows():
+    scope = Scope(repositories=("org/a",), since="2024-01-01", until="2024-01-20")
+
+    windows = scope.split(7)
+
+    assert [(w.since, w.until) for w in windows] == [
+        ("2024-01-01", "2024-01-08"),
+        ("2024-01-08", "2024-01-15"),
+        ("2024-01-15", "2024-01-20"),
+    ]
+    assert [w.part for w in windows] == [0, 1, 2]
+    assert {w.parent for w in windows} == {scope.name}
+    assert {w.cache_schema for w in windows} == {scope.cache_schema}
+    assert len({w.name for w in windows}) == 3
+
+
+def test_open_ended_split_keeps_the_last_window_open():
+    since = (date.today() - timedelta(10)).isoformat()
+    windows = Scope(since=since).split(7)
+    assert len(windows) == 2
+    assert windows[0].until is not None
+    assert windows[-1].until is None
+
+
+def test_scopes_without_dates_are_not_split():
+    scope = Scope(repositories=("org/a",))
+    assert scope.split(7) == [scope]
+    assert Scope(since="2024-01-01").split(0) == [Scope(since="2024-01-01")]
+
+
+def test_name_ignores_the_order_of_repositories():
+    assert Scope(("org/a", "org/b")).name == Scope(("org/b", "org/a")).name
+    assert Scope(("org/a",)).name != Scope(("org/a",), since="2024-01-01").name
+
+
+def test_filter_by_repository_and_window():
+    frame = pd.DataFrame(
+        {
+            "repository": ["org/a", "org/a", "org/b", "org/a"],
+            "created_at": [
+                "2023-12-31T23:59:59Z",
+                "2024-01-01T00:00:00Z",
+                "2024-01-02T00:00:00Z",
+                "2024-01-08T00:00:00Z",
+            ],
+            "sha": ["1", "2", "3", "4"],
+        }
+    )
+    scope = Scope(repositories=("org/a",), since="2024-01-01", until="2024-01-08")
+
+    assert scope.filter("commits", frame)["sha"].tolist() == ["2"]
+
+
+def test_undated_streams_belong_to_the_first_window():
+    frame = pd.DataFrame({"repository": ["org/a", "org/b"], "name": ["x", "y"]})
+    first, second = Scope(("org/a",), since="2024-01-01", until="2024-01-03").split(1)
+
+    assert first.filter("branches", frame)["name"].tolist() == ["x"]
+    assert second.filter("branches", frame).empty
+
+
+def test_includes_streams():
+    assert Scope().includes("commits")
+    assert Scope(streams=("issues",)).includes("issues")
+    assert not Scope(streams=("issues",)).includes("commits")
@@ -0,0 +1,61 @@
+from src.sink.key_index import KeyIndex  # noqa: I001
+from src.sink.records import make_record  # noqa: I001
+from src.sink.sink_memory import MemorySink  # noqa: I001
+
+
+def test_merges_nodes_on_label_and_key():
+    sink = MemorySink()
+    sink.save_node(make_record("Issue", "id", {"id": 1, "title": "a"}), "Issue", "id")
+    sink.save_node(make_record("Issue", "id", {"id": 1, "state": "x"}), "Issue", "id")
+    sink.save_nodes("Issue", "id", [{"id": 1}, {"id": 2}])
+
+    assert sink.writes.nodes["issue"] == {"new": 2, "repeated": 2}
+    node = sink.get_node("Issue", id=1)
+    assert node.properties == {"id": 1, "title": "a", "state": "x"}
+    assert sink.get_node("Issue", id=3) is None
+
+
+def test_merges_relationships_and_counts_unmatched_ones():
+    sink = MemorySink()
+    issue = make_record("Issue", "id", {"id": 1})
+    label = make_record("Label", "id", {"id": 2})
+    sink.save_node(issue, "Issue", "id")
+    sink.save_node(label, "Label", "id")
+
+    sink.save_relationship_between(issue, "labeled", label)
+    sink.save_relationships(
+        "labeled", ("Issue", "id"), ("Label", "id"), [{"start": 1, "end": 2}]
+    )
+    sink.save_relationships(
+        "labeled", ("Issue", "id"), ("Label", "id"), [{"start": 1, "end": 3}]
+    )
+
+    assert sink.writes.relationships["labeled"] == {
+        "new": 1,
+        "repeated": 1,
+        "unmatched": 1,
+    }
+
+
+def test_snapshot_tells_existing_nodes_from_new_ones(tmp_path):
+    path = str(tmp_path / "keys.sqlite")
+    snapshot = KeyIndex(path=path, enabled=True)
+    snapshot.add("Issue", "id", 1, "4:abc:1")
+    snapshot.flush()
+    sink = MemorySink(snapshot=path)
+
+    sink.save_nodes("Issue", "id", [{"id": 1}, {"id": 2}])
+    sink.save_relationships(
+        "labeled", ("Issue", "id"), ("Issue", "id"), [{"start": 2, "end": 1}]
+    )
+
+    assert sink.writes.nodes["issue"] == {"existing": 1, "new": 1}
+    assert sink.writes.relationships["labeled"] == {"new": 1}
+
+
+def test_custom_queries_are_only_counted():
+    sink = MemorySink()
+    assert sink.run("MATCH (n) RETURN n") == []
+    sink.run_batch("UNWIND $rows AS row SET x", [{"a": 1}], key=id, labels=["X"])
+    assert sum(c["calls"] for c in sink.writes.queries.values()) == 2
+    assert not sink.persistent
@@ -0,0 +1,89 @@
+from src.sink import sink_neo4j  # noqa: I001
+from src.sink.records import make_record  # noqa: I001
+from src.sink.sink_neo4j import SinkNeo4j  # noqa: I001
+
+
+class Keys:
+    """Key index recording the discarded keys."""
+
+    def __init__(self) -> None:
+        """Start with nothing discarded."""
+        self.discarded = []
+
+    def discard(self, label: str, property: str, values: list) -> None:
+        """Record the discarded keys."""
+        self.discarded.append((label, property, list(values)))
+
+
+class Warnings:
+    """Logger recording the warnings."""
+
+    def __init__(self) -> None:
+        """Start with no warning."""
+        self.messages = []
+
+    def warning(self, message: str) -> None:
+        """Record a warning."""
+        self.messages.append(message)
+
+
+def make_sink(written: list[int]) -> SinkNeo4j:
+    """Build a sink whose relationship writes report ``written`` in turn."""
+    sink = SinkNeo4j.__new__(SinkNeo4j)
+    sink.keys = Keys()
+    sink.queries_run = []
+    sink.touched = []
+
+    def run(query: str, **parameters: object) -> list[dict]:
+        sink.queries_run.append((query, parameters))
+        return [{"written": written.pop(0)}]
+
+    sink.run = run
+    sink._touch = lambda labels, count=1: sink.touched.extend(labels)
+    return sink
+
+
+def records() -> tuple:
+    """Build an issue known by element id and a label known by key."""
+    issue = make_record("Issue", "id", {"id": 1})
+    issue.element_id = "4:graph:7"
+    return issue, make_record("Label", "id", {"id": 2})
+
+
+def test_element_id_match_checks_label_and_key():
+    sink = make_sink([1])
+    issue, label = records()
+
+    sink.save_relationship_between(issue, "labeled", label)
+
+    [(query, parameters)] = sink.queries_run
+    assert "MATCH (a:`issue`) WHERE elementId(a) = $a AND a.`id` = $a_key" in query
+    assert parameters == {"a": "4:graph:7", "a_key": 1, "b": 2}
+    assert sink.touched == ["Issue", "Label"]
+
+
+def test_stale_element_id_is_dropped_and_retried_by_key():
+    sink = make_sink([0, 1])
+    issue, label = records()
+
+    sink.save_relationship_between(issue, "labeled", label)
+
+    assert sink.keys.discarded == [("Issue", "id", [1])]
+    assert issue.element_id is None
+    assert "MATCH (a:`issue` {`id`: $a})" in sink.queries_run[1][0]
+    assert sink.touched == ["Issue", "Label"]
+
+
+def test_missing_endpoint_is_logged(monkeypatch):
+    warnings = Warnings()
+    monkeypatch.setattr(sink_neo4j, "logger", warnings)
+    sink = make_sink([0, 0])
+    issue, label = records()
+
+    sink.save_relationship_between(issue, "labeled", label)
+
+    assert len(sink.queries_run) == 2
+    assert sink.touched == []
+    [message] = warnings.messages
+    assert "labeled" in message
+    assert "(:Label {id: 2})" in message
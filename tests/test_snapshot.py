@@ -0,0 +1,112 @@
+from types import SimpleNamespace  # noqa: I001
+
+import pandas as pd  # noqa: I001
+
+from src.extract.snapshot import SnapshotStore  # noqa: I001
+
+
+def branches(*rows: tuple[str, str, str]) -> pd.DataFrame:
+    """Build a branches frame of (repository, name, commit sha) rows."""
+    return pd.DataFrame(
+        [
+            {
+                "repository": repository,
+                "name": name,
+                "commit": {"sha": sha},
+                "_airbyte_raw_id": f"{repository}/{name}/{sha}",
+            }
+            for repository, name, sha in rows
+        ]
+    )
+
+
+def keys(frame: pd.DataFrame) -> list[tuple[str, str]]:
+    """Return the sorted (repository, name) keys of a frame."""
+    return sorted(zip(frame["repository"], frame["name"], strict=True))
+
+
+def test_first_run_loads_everything(tmp_path):
+    store = SnapshotStore("run", directory=str(tmp_path))
+    frame = branches(("org/a", "main", "1"), ("org/a", "dev", "2"))
+
+    delta = store.diff("branches", frame)
+
+    assert not delta.incremental
+    assert len(delta.changed) == 2
+    assert keys(delta.inserted) == [("org/a", "dev"), ("org/a", "main")]
+    assert delta.removed.empty
+
+
+def test_diff_against_committed_snapshot(tmp_path):
+    first = SnapshotStore("run", directory=str(tmp_path))
+    first.diff(
+        "branches",
+        branches(("org/a", "main", "1"), ("org/a", "dev", "2"), ("org/b", "x", "3")),
+    )
+    first.commit()
+
+    store = SnapshotStore("run", directory=str(tmp_path))
+    delta = store.diff(
+        "branches",
+        branches(("org/a", "main", "1"), ("org/a", "dev", "9"), ("org/b", "y", "4")),
+    )
+
+    assert delta.incremental
+    assert keys(delta.changed) == [("org/a", "dev"), ("org/b", "y")]
+    assert keys(delta.inserted) == [("org/b", "y")]
+    assert keys(delta.removed) == [("org/b", "x")]
+
+
+def test_uncommitted_run_diffs_against_the_same_snapshot(tmp_path):
+    first = SnapshotStore("run", directory=str(tmp_path))
+    first.diff("branches", branches(("org/a", "main", "1")))
+    first.commit()
+
+    failed = SnapshotStore("run", directory=str(tmp_path))
+    failed.diff("branches", branches(("org/a", "main", "2")))  # Never committed
+
+    store = SnapshotStore("run", directory=str(tmp_path))
+    delta = store.diff("branches", branches(("org/a", "main", "2")))
+    assert keys(delta.changed) == [("org/a", "main")]
+
+
+def test_snapshot_of_another_generation_is_ignored(tmp_path):
+    first = SnapshotStore("run", directory=str(tmp_path))
+    first.diff("branches", branches(("org/a", "main", "1")), generation="g1")
+    first.commit()
+
+    same = SnapshotStore("run", directory=str(tmp_path))
+    assert same.diff("branches", branches(("org/a", "main", "1")), "g1").incremental
+    other = SnapshotStore("run", directory=str(tmp_path))
+    delta = other.diff("branches", branches(("org/a", "main", "1")), "g2")
+    assert not delta.incremental
+    assert len(delta.changed) == 1
+
+
+def test_snapshot_keyed_on_other_columns_is_ignored(tmp_path):
+    members = pd.DataFrame([{"login": "ana", "team_slug": "core"}])
+    first = SnapshotStore("run", directory=str(tmp_path))
+    first.diff("team_members", members)
+    first.commit()
+
+    store = SnapshotStore("run", directory=str(tmp_path))
+    delta = store.diff("team_members", members.assign(organization="org"))
+    assert not delta.incremental
+
+
+def test_disabled_store_is_flagged(tmp_path):
+    assert not SnapshotStore("run", directory=str(tmp_path), enabled=False).enabled
+
+
+def test_read_snapshot_diffs_on_the_sink_generation(extractor, tmp_path):
+    frame = branches(("org/a", "main", "1"))
+    first = SnapshotStore("run", directory=str(tmp_path))
+    first.diff("branches", frame, generation="g1")
+    first.commit()
+
+    extractor.scope = None
+    extractor.snapshots = SnapshotStore("run", directory=str(tmp_path))
+    extractor.sink = SimpleNamespace(generation="g2", keys=SimpleNamespace())
+    extractor.read_frame = lambda stream: frame
+
+    assert len(extractor.read_snapshot("branches")) == 1  # Wiped graph: reload
@@ -0,0 +1,56 @@
+from typing import Any  # noqa: I001
+
+from src.report.team_report import TeamReport  # noqa: I001
+
+
+class FakeGraph:
+    """Serve the rows of every query and count the queries run."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.queries: list[str] = []
+
+    def run(self, query: str, **parameters: Any) -> list[dict[str, Any]]:
+        self.queries.append(query)
+        return self.rows
+
+
+def report(rows: list[dict[str, Any]]) -> TeamReport:
+    """Build a team report reading the given rows."""
+    team_report = TeamReport.__new__(TeamReport)
+    team_report.graph = FakeGraph(rows)
+    return team_report
+
+
+def test_team_markdown_groups_members_in_one_query():
+    team_report = report(
+        [
+            {"team": "core", "name": "Ana ", "login": "Ana"},
+            {"team": "core", "name": "Bia", "login": "bia"},
+            {"team": "web", "name": "Caio", "login": "caio"},
+        ]
+    )
+
+    assert list(team_report.iter_team_markdown()) == [
+        "## core",
+        "| Name | Login |",
+        "|------|-------|",
+        "| Ana | ana |",
+        "| Bia | bia |",
+        "",
+        "## web",
+        "| Name | Login |",
+        "|------|-------|",
+        "| Caio | caio |",
+        "",
+    ]
+    assert len(team_report.graph.queries) == 1
+
+
+def test_people_markdown_streams_the_rendered_columns():
+    team_report = report([{"name": "Ana", "login": "ANA", "organization": "org"}])
+
+    lines = list(team_report.iter_people_markdown())
+
+    assert lines[-1] == "| Ana | ana | org |"
+    assert len(team_report.graph.queries) == 1